@@ -1,5 +1,6 @@
 """Agent orchestration utilities."""
 
 from .pipeline import MultiAgentPipeline, run_pipeline
+from .streaming import PipelineEvent
 
-__all__ = ["MultiAgentPipeline", "run_pipeline"]
+__all__ = ["MultiAgentPipeline", "PipelineEvent", "run_pipeline"]
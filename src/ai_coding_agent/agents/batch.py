@@ -0,0 +1,204 @@
+"""Run many project plans concurrently in one event loop."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from openai import AsyncOpenAI
+
+from ..config import AgentRuntimeSettings, ModelBackend
+from ..context import AgentRunState
+from ..plan import AgentProjectPlan
+from ..providers.ratelimit import RequestScheduler
+from .pipeline import MultiAgentPipeline
+
+
+class BatchManifestError(ValueError):
+    """Raised when a batch source cannot be turned into a list of jobs."""
+
+
+@dataclass(slots=True)
+class BatchJob:
+    """One plan to run, with the workspace it writes into."""
+
+    name: str
+    plan_path: Path
+    workspace: Path
+    prompt: str | None = None
+    settings: dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass(slots=True)
+class BatchResult:
+    """Outcome of a :class:`BatchJob`; ``state`` is ``None`` if the pipeline never started."""
+
+    job: BatchJob
+    status: str
+    seconds: float
+    state: AgentRunState | None = None
+    error: str | None = None
+
+    def as_dict(self) -> dict[str, Any]:
+        totals = self.state.metrics()["totals"] if self.state is not None else None
+        return {
+            "name": self.job.name,
+            "plan": str(self.job.plan_path),
+            "workspace": str(self.job.workspace),
+            "status": self.status,
+            "seconds": self.seconds,
+            "run_id": self.state.run_id if self.state is not None else None,
+            "error": self.error,
+            "totals": totals,
+        }
+
+
+def _job_from_entry(entry: Any, *, base: Path, output_root: Path, index: int) -> BatchJob:
+    if isinstance(entry, str):
+        entry = {"plan": entry}
+    if not isinstance(entry, dict) or "plan" not in entry:
+        raise BatchManifestError(f"Manifest entry {index} must be a plan path or an object with a 'plan' key")
+    plan_path = (base / entry["plan"]).resolve()
+    name = entry.get("name") or plan_path.stem
+    workspace = output_root / entry.get("workspace", name)
+    return BatchJob(
+        name=name,
+        plan_path=plan_path,
+        workspace=workspace,
+        prompt=entry.get("prompt"),
+        settings=dict(entry.get("settings", {})),
+    )
+
+
+def load_jobs(source: Path, *, output_root: Path) -> list[BatchJob]:
+    """Build jobs from a directory of plan JSON files or a manifest.
+
+    A directory yields one job per ``*.json`` file, each writing into
+    ``output_root/<plan stem>``. A manifest is a JSON list (or an object with
+    a ``runs`` list) or a JSON Lines file whose entries are plan paths or
+    objects with ``plan`` and optional ``name``, ``workspace``, ``prompt`` and
+    ``settings`` keys. Plan paths are relative to the manifest and workspaces
+    to ``output_root``.
+    """
+
+    if source.is_dir():
+        entries: list[Any] = [path.name for path in sorted(source.glob("*.json"))]
+        base = source
+    else:
+        text = source.read_text(encoding="utf-8")
+        base = source.parent
+        if source.suffix == ".jsonl":
+            entries = [json.loads(line) for line in text.splitlines() if line.strip()]
+        else:
+            data = json.loads(text)
+            entries = data.get("runs", []) if isinstance(data, dict) else data
+        if not isinstance(entries, list):
+            raise BatchManifestError(f"{source} does not contain a list of runs")
+
+    jobs = [_job_from_entry(entry, base=base, output_root=output_root, index=index) for index, entry in enumerate(entries)]
+    if not jobs:
+        raise BatchManifestError(f"No plans found in {source}")
+
+    seen: dict[Path, str] = {}
+    for job in jobs:
+        workspace = job.workspace.resolve()
+        if workspace in seen:
+            raise BatchManifestError(f"Runs {seen[workspace]!r} and {job.name!r} share workspace {job.workspace}")
+        seen[workspace] = job.name
+    return jobs
+
+
+class BatchRunner:
+    """Runs one :class:`MultiAgentPipeline` per job with bounded concurrency.
+
+    Every pipeline gets its own workspace and :class:`AgentRunState`, while
+    all of them share one ``AsyncOpenAI`` client and therefore one HTTP
+    connection pool, plus one :class:`RequestScheduler` so rate limits are
+    enforced across the whole batch (per-job settings cannot change them). A
+    failing job is recorded and does not cancel the rest.
+    """
+
+    def __init__(
+        self,
+        jobs: list[BatchJob],
+        *,
+        settings: AgentRuntimeSettings | None = None,
+        max_concurrency: int = 4,
+        openai_client: AsyncOpenAI | None = None,
+        prompt_override: str | None = None,
+        request_scheduler: RequestScheduler | None = None,
+    ) -> None:
+        self.jobs = jobs
+        self.settings = settings or AgentRuntimeSettings()
+        self.max_concurrency = max(1, max_concurrency)
+        self.prompt_override = prompt_override
+        self._client = openai_client
+        self.request_scheduler = request_scheduler
+        if request_scheduler is None and self.settings.request_scheduler:
+            self.request_scheduler = RequestScheduler.from_settings(self.settings)
+
+    def _job_settings(self, job: BatchJob) -> AgentRuntimeSettings:
+        if not job.settings:
+            return self.settings
+        return AgentRuntimeSettings.model_validate({**self.settings.model_dump(), **job.settings})
+
+    async def _run_job(
+        self,
+        job: BatchJob,
+        semaphore: asyncio.Semaphore,
+        client: AsyncOpenAI | None,
+    ) -> BatchResult:
+        async with semaphore:
+            started = time.perf_counter()
+            pipeline: MultiAgentPipeline | None = None
+            try:
+                plan = await asyncio.to_thread(AgentProjectPlan.load, job.plan_path)
+                job.workspace.mkdir(parents=True, exist_ok=True)
+                pipeline = MultiAgentPipeline(
+                    workspace=job.workspace,
+                    plan=plan,
+                    settings=self._job_settings(job),
+                    openai_client=client,
+                    request_scheduler=self.request_scheduler,
+                )
+                prompt = job.prompt or plan.initial_prompt(prompt_override=self.prompt_override)
+                state = await pipeline.run(prompt)
+            except Exception as exc:  # noqa: BLE001 - one failed run must not stop the batch
+                return BatchResult(
+                    job=job,
+                    status="failed",
+                    seconds=time.perf_counter() - started,
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+            finally:
+                if pipeline is not None:
+                    await pipeline.aclose()
+            return BatchResult(job=job, status="completed", seconds=time.perf_counter() - started, state=state)
+
+    async def run(self, on_result: Callable[[BatchResult], None] | None = None) -> list[BatchResult]:
+        """Run every job and return results in job order."""
+
+        client = self._client
+        owns_client = False
+        if client is None and self.settings.model_backend in {ModelBackend.OPENAI, ModelBackend.RECORD}:
+            client = AsyncOpenAI()
+            owns_client = True
+
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        async def run_and_report(job: BatchJob) -> BatchResult:
+            result = await self._run_job(job, semaphore, client)
+            if on_result is not None:
+                on_result(result)
+            return result
+
+        try:
+            async with asyncio.TaskGroup() as group:
+                tasks = [group.create_task(run_and_report(job)) for job in self.jobs]
+        finally:
+            if owns_client and client is not None:
+                await client.close()
+        return [task.result() for task in tasks]
@@ -0,0 +1,37 @@
+"""Run hooks that feed per-stage usage and tool timing into :class:`StageMetrics`."""
+from __future__ import annotations
+
+import time
+from typing import Any
+
+from agents.items import ModelResponse
+from agents.lifecycle import RunHooks
+from agents.run_context import RunContextWrapper
+from agents.tool import Tool
+
+from ..metrics import StageMetrics
+
+
+class StageMetricsHooks(RunHooks[Any]):
+    """Records model usage per response and wall time per tool call for one stage."""
+
+    def __init__(self, metrics: StageMetrics) -> None:
+        self.metrics = metrics
+        self._tool_started: dict[str, float] = {}
+
+    @staticmethod
+    def _call_key(context: RunContextWrapper[Any], tool: Tool) -> str:
+        call_id = getattr(context, "tool_call_id", None)
+        return call_id or f"{tool.name}:{id(context)}"
+
+    async def on_llm_end(self, context: RunContextWrapper[Any], agent: Any, response: ModelResponse) -> None:
+        self.metrics.record_usage(response.usage)
+
+    async def on_tool_start(self, context: RunContextWrapper[Any], agent: Any, tool: Tool) -> None:
+        self.metrics.tool_started(tool.name)
+        self._tool_started[self._call_key(context, tool)] = time.perf_counter()
+
+    async def on_tool_end(self, context: RunContextWrapper[Any], agent: Any, tool: Tool, result: object) -> None:
+        started = self._tool_started.pop(self._call_key(context, tool), None)
+        if started is not None:
+            self.metrics.tool_finished(tool.name, time.perf_counter() - started)
@@ -2,30 +2,72 @@
 from __future__ import annotations
 
 import asyncio
+import contextlib
+import time
+import uuid
 from dataclasses import dataclass
 from pathlib import Path
+from typing import AsyncIterator
 
 from agents import Agent, set_default_openai_key
 from agents.model_settings import ModelSettings
-from agents.run import Runner
+from agents.models.interface import ModelProvider
+from agents.models.openai_provider import OpenAIProvider
+from agents.retry import ModelRetrySettings
+from agents.run import RunConfig, Runner
 from openai import AsyncOpenAI
 
-from ..config import AgentRuntimeSettings
-from ..context import AgentRunState
-from ..plan import AgentProjectPlan
+from ..config import (
+    FINGERPRINTS_FILE_NAME,
+    METRICS_FILE_NAME,
+    RUN_STORE_NAME,
+    STATE_DIR_NAME,
+    SUMMARY_CACHE_FILE_NAME,
+    AgentRuntimeSettings,
+    CacheMode,
+    ModelBackend,
+)
+from ..context import AgentRunState, current_stage
+from ..events import EventLog, EventSink, JsonlEventSink, RunStoreEventSink
+from ..handoff import HandoffCompactor
+from ..incremental import FingerprintStore, StageRecord, digest_value
+from ..metrics import StageMetrics, write_metrics
+from ..plan import AgentProjectPlan, estimate_tokens
+from ..providers.cache import CachingModelProvider, ResponseCache
+from ..providers.ratelimit import RequestScheduler, SchedulingModelProvider
+from ..providers.recording import RecordingModelProvider
+from ..providers.stub import StubModelProvider
+from ..snapshot import Snapshot, SnapshotError, SnapshotStore
+from ..store import RunStore
+from ..summaries import SummaryCache
 from ..tools.filesystem import TOOLS as FILESYSTEM_TOOLS
+from .hooks import StageMetricsHooks
+from .scheduler import StageScheduler
+from .streaming import EventStream, PipelineEvent
 
 
 @dataclass(slots=True)
 class AgentSpec:
-    """Declarative specification for an agent participating in the workflow."""
+    """Declarative specification for an agent participating in the workflow.
+
+    ``inputs`` and ``outputs`` name the artifacts a stage consumes and produces;
+    the scheduler uses them to run independent stages concurrently. Stages
+    without inputs receive the run prompt and the plan prompt block.
+    ``plan_sections`` lists requirement keys a stage depends on beyond its
+    prompt; incremental runs re-execute it when any of them change.
+    """
 
     name: str
     instructions: str
+    prompt: str = ""
+    brief: str | None = None
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+    plan_sections: tuple[str, ...] = ()
 
 
 class MultiAgentPipeline:
-    """Coordinates Requirements → Coding → Testing → Documentation agents."""
+    """Coordinates Requirements → (Coding | Testing | Documentation) agents."""
 
     def __init__(
         self,
@@ -34,22 +76,83 @@ class MultiAgentPipeline:
         plan: AgentProjectPlan,
         settings: AgentRuntimeSettings | None = None,
         openai_client: AsyncOpenAI | None = None,
+        request_scheduler: RequestScheduler | None = None,
     ) -> None:
         self.workspace = workspace
         self.plan = plan
         self.settings = settings or AgentRuntimeSettings()
-        self._client = openai_client or AsyncOpenAI()
+        # OpenAIProvider creates a client lazily, so offline backends never need credentials.
+        self._client = openai_client
+        # Pass a scheduler to share rate limits with other pipelines in the same event loop.
+        if request_scheduler is None and self.settings.request_scheduler:
+            request_scheduler = RequestScheduler.from_settings(self.settings)
+        self.request_scheduler = request_scheduler
+        self.response_cache: ResponseCache | None = None
+        self.recording_path: Path | None = None
+        self.model_provider = self._build_model_provider()
+        self.run_store: RunStore | None = None
+        if self.settings.run_store:
+            store_path = self.settings.run_store_path or workspace / STATE_DIR_NAME / RUN_STORE_NAME
+            self.run_store = RunStore(store_path)
+        self.snapshots: SnapshotStore | None = None
+        if self.settings.snapshots:
+            self.snapshots = SnapshotStore(workspace, link_mode=self.settings.snapshot_link_mode)
+        fingerprints_path = self.settings.fingerprints_path or workspace / STATE_DIR_NAME / FINGERPRINTS_FILE_NAME
+        self.fingerprints = FingerprintStore(fingerprints_path)
+        self.summary_cache = SummaryCache(workspace / STATE_DIR_NAME / SUMMARY_CACHE_FILE_NAME)
         self.runner = Runner()
         self.agents = self._build_agents()
 
+    def _build_model_provider(self) -> ModelProvider:
+        backend = self.settings.model_backend
+        script = self.settings.model_script
+        provider: ModelProvider
+        if backend == ModelBackend.STUB:
+            provider = StubModelProvider(script, latency=self.settings.stub_latency_seconds)
+        elif backend == ModelBackend.REPLAY:
+            if script is None:
+                raise ValueError("Replaying requires model_script to point at a recorded session.")
+            provider = StubModelProvider(script, latency=self.settings.stub_latency_seconds)
+        else:
+            provider = OpenAIProvider(openai_client=self._client)
+            if backend == ModelBackend.RECORD:
+                path = script or self.workspace / STATE_DIR_NAME / "recordings" / f"{int(time.time())}.json"
+                recording = RecordingModelProvider(provider, path)
+                self.recording_path = recording.recorder.path
+                provider = recording
+        if self.request_scheduler is not None:
+            provider = SchedulingModelProvider(provider, self.request_scheduler, self.settings.request_priority)
+        if self.settings.cache_mode == CacheMode.OFF:
+            return provider
+        self.response_cache = ResponseCache(
+            self.settings.cache_dir,
+            ttl_seconds=self.settings.cache_ttl_seconds,
+            max_bytes=self.settings.cache_max_bytes,
+        )
+        return CachingModelProvider(provider, self.response_cache, self.settings.cache_mode)
+
+    @property
+    def _offline(self) -> bool:
+        return self.settings.model_backend in {ModelBackend.STUB, ModelBackend.REPLAY}
+
+    def _plan_block(self) -> str:
+        return self.plan.to_prompt_block(
+            max_tokens=self.settings.plan_prompt_max_tokens,
+            json_mode=self.settings.plan_prompt_json,
+        )
+
     def _build_agents(self) -> list[AgentSpec]:
-        prompt_block = self.plan.to_prompt_block()
+        prompt_block = self._plan_block()
 
         def base_instructions(role: str, focus: str) -> str:
             return (
                 f"You are the {role} agent in a coordinated GPT-5 workflow. "
                 f"Focus on {focus}. Always use tools for filesystem or logging operations. "
-                "You share a workspace with other agents; prefer incremental updates via write_many."
+                "You share a workspace with other agents; create files with write_many and change existing ones "
+                "with apply_patch instead of rewriting them. "
+                "Use search_workspace to locate existing code before reading whole files. "
+                "When your input includes a handoff summary of upstream work, rely on it and read only the files "
+                "you need to change."
             )
 
         requirements = AgentSpec(
@@ -58,6 +161,7 @@ class MultiAgentPipeline:
                 "Requirements",
                 "extracting structured requirements, clarifying ambiguities, and preparing downstream context",
             ),
+            outputs=("requirements_summary",),
         )
         coding = AgentSpec(
             name="coding",
@@ -65,6 +169,11 @@ class MultiAgentPipeline:
                 "Coding",
                 "producing code scaffolds, dependency manifests, and automation scripts based on requirements context",
             ),
+            prompt="Leverage the requirements_summary artifact to scaffold the repository.",
+            brief="Coding agent must transform requirements into code plans using write_many and record_event.",
+            inputs=("requirements_summary",),
+            outputs=("code",),
+            plan_sections=("project", "specifications", "file_structure", "dependencies", "configuration"),
         )
         testing = AgentSpec(
             name="testing",
@@ -72,6 +181,11 @@ class MultiAgentPipeline:
                 "Testing",
                 "designing and executing automated tests, recording outcomes, and suggesting fixes",
             ),
+            prompt="Design pytest or smoke test coverage for the requirements_summary artifact and add it to the workspace.",
+            brief="Ensure tests exist for generated components and capture results to the log via record_event.",
+            inputs=("requirements_summary",),
+            outputs=("tests",),
+            plan_sections=("specifications", "user_stories", "flows", "output_example"),
         )
         documentation = AgentSpec(
             name="documentation",
@@ -79,36 +193,24 @@ class MultiAgentPipeline:
                 "Documentation",
                 "writing concise READMEs, runbooks, and provenance logs",
             ),
+            prompt="Draft README content and runbooks from the requirements_summary artifact, referencing recorded events.",
+            inputs=("requirements_summary",),
+            outputs=("docs",),
+            plan_sections=("overview", "goals", "project", "execution_flow", "output_example"),
         )
         return [requirements, coding, testing, documentation]
 
     def _instantiate_agent(self, spec: AgentSpec) -> Agent[AgentRunState]:
-        agent_kwargs = {
-            "name": spec.name,
-            "instructions": spec.instructions,
-            "tools": FILESYSTEM_TOOLS,
-            "model": self.settings.model,
-        }
-        if self.settings.temperature is not None:
-            agent_kwargs["model_settings"] = ModelSettings(temperature=self.settings.temperature)
-
-        return Agent(**agent_kwargs)
-
-    @staticmethod
-    def _summarize_markdown(text: str, limit: int = 400) -> str:
-        segments = []
-        for line in text.splitlines():
-            stripped = line.strip()
-            if not stripped:
-                continue
-            segments.append(stripped)
-            snippet = " ".join(segments)
-            if len(snippet) >= limit:
-                break
-        summary = " ".join(segments)
-        if len(summary) > limit:
-            summary = summary[:limit].rstrip() + "..."
-        return summary or "_No content available._"
+        # The request scheduler owns retries; keep the runner and the OpenAI client from retrying underneath it.
+        retry = ModelRetrySettings(max_retries=0) if self.request_scheduler is not None else None
+        model_settings = ModelSettings(temperature=self.settings.temperature, retry=retry)
+        return Agent(
+            name=spec.name,
+            instructions=spec.instructions,
+            tools=FILESYSTEM_TOOLS,
+            model=self.settings.model,
+            model_settings=model_settings,
+        )
 
     def _emit_requirements_summary(self, state: AgentRunState) -> str | None:
         requirements_dir = self.workspace / "requirements"
@@ -132,86 +234,352 @@ class MultiAgentPipeline:
             "",
         ]
 
-        for md_file in md_files:
-            try:
-                content = md_file.read_text(encoding="utf-8")
-            except OSError as exc:
-                state.log(f"Failed to read {md_file}: {exc}")
+        state.record_reads(md_files)
+        hits = self.summary_cache.hits
+        for result in self.summary_cache.summarize(md_files, root=self.workspace):
+            if result.error is not None:
+                state.log(f"Failed to read {result.path}: {result.error}")
                 continue
 
-            relative = md_file.relative_to(self.workspace)
+            relative = result.path.relative_to(self.workspace)
             lines.append(f"## {relative}")
             lines.append("")
-            lines.append(self._summarize_markdown(content))
+            lines.append(result.summary)
             lines.append("")
 
-        summary_path.write_text("\n".join(lines).strip() + "\n", encoding="utf-8")
+        text = "\n".join(lines).strip() + "\n"
+        summary_path.write_text(text, encoding="utf-8")
+        state.record_writes([summary_path])
         state.add_artifact("requirements_summary_path", str(summary_path))
-        state.log(f"Requirements summary written to {summary_path}")
-        try:
-            return summary_path.read_text(encoding="utf-8")
-        except OSError as exc:
-            state.log(f"Failed to read generated summary {summary_path}: {exc}")
-            return None
+        state.log(
+            f"Requirements summary written to {summary_path} "
+            f"({self.summary_cache.hits - hits} of {len(md_files)} files unchanged)"
+        )
+        return text
 
     async def _run_agent(
         self,
         spec: AgentSpec,
         state: AgentRunState,
         input_text: str,
+        events: EventStream | None = None,
     ) -> None:
         agent = self._instantiate_agent(spec)
-        await self.runner.run(
-            agent,
-            input_text,
-            context=state,
-            max_turns=self.settings.max_turns,
-        )
+        metrics = state.stage_metrics[spec.name]
+        run_kwargs = {
+            "context": state,
+            "max_turns": self.settings.max_turns,
+            "hooks": StageMetricsHooks(metrics),
+            "run_config": RunConfig(model_provider=self.model_provider, tracing_disabled=self._offline),
+        }
+        if events is None:
+            await self.runner.run(agent, input_text, **run_kwargs)
+            return
 
-    async def run(self, prompt: str) -> AgentRunState:
-        """Run the end-to-end pipeline and return the final run state."""
+        result = self.runner.run_streamed(agent, input_text, **run_kwargs)
+        async for event in result.stream_events():
+            events.forward(event, metrics)
 
-        state = AgentRunState(workspace=self.workspace, plan=self.plan)
-        state.log("Pipeline start")
-        plan_summary = self.plan.to_prompt_block()
-        state.add_artifact("requirements_summary", plan_summary)
-
-        # Sequence through each agent, feeding forward summaries.
-        plan_prompt_block = self.plan.to_prompt_block()
-        await self._run_agent(
-            self.agents[0],
-            state,
-            f"{prompt}\n\n{plan_prompt_block}",
+    def _stage_input(self, spec: AgentSpec, prompt: str) -> str:
+        if not spec.inputs:
+            return f"{prompt}\n\n{self._plan_block()}"
+        return spec.prompt
+
+    def _upstream_stages(self, spec: AgentSpec) -> list[str]:
+        return [other.name for other in self.agents if set(other.outputs) & set(spec.inputs)]
+
+    async def _with_handoff(self, spec: AgentSpec, state: AgentRunState, input_text: str) -> str:
+        """Append a compact summary of what the stages ``spec`` depends on wrote and recorded."""
+
+        if state.handoff is None or self.settings.handoff_max_tokens is None:
+            return input_text
+        upstream = self._upstream_stages(spec)
+        if not upstream:
+            return input_text
+        # Once the buffer has spilled, the query reads the sink (a file or the run
+        # store), so it runs in a thread while sibling stages keep the loop busy.
+        events = await asyncio.to_thread(
+            lambda: [event for stage in upstream for event in state.events.query(stage=stage, kind="event")]
         )
-        summary_text = self._emit_requirements_summary(state)
-        if summary_text:
-            state.add_artifact("requirements_summary", summary_text)
-        state.add_artifact(
-            "coding_summary",
-            "Coding agent must transform requirements into code plans using write_many and record_event.",
+        packet = state.handoff.packet(upstream, events=events, max_tokens=self.settings.handoff_max_tokens)
+        if not packet:
+            return input_text
+        files = len(state.handoff.files(upstream))
+        state.log(
+            f"Handoff for {spec.name}: {files} files from {', '.join(upstream)} (~{estimate_tokens(packet)} tokens)",
+            payload={"upstream": upstream, "files": files, "tokens": estimate_tokens(packet)},
         )
-        await self._run_agent(
-            self.agents[1],
-            state,
-            "Leverage the requirements_summary artifact to scaffold the repository.",
+        return f"{input_text}\n\n{packet}"
+
+    def _stage_fingerprint(self, spec: AgentSpec, state: AgentRunState, input_text: str) -> str:
+        # Until the requirements stage emits a summary, requirements_summary holds
+        # the whole plan block. Hashing it would rerun every stage on any plan
+        # edit; the plan sections each stage declares already cover the plan.
+        plan_block = self._plan_block()
+        artifacts = {
+            name: "<plan>" if state.artifacts.get(name) == plan_block else state.artifacts.get(name)
+            for name in spec.inputs
+        }
+        return digest_value(
+            {
+                "stage": spec.name,
+                "instructions": spec.instructions,
+                "input": input_text,
+                "brief": spec.brief,
+                "model": self.settings.model,
+                "temperature": self.settings.temperature,
+                "max_turns": self.settings.max_turns,
+                "plan": {key: self.plan.requirements.get(key) for key in spec.plan_sections},
+                "artifacts": artifacts,
+            }
         )
-        state.add_artifact(
-            "testing_summary",
-            "Ensure tests exist for generated components and capture results to the log via record_event.",
+
+    def _stage_record(self, spec: AgentSpec, state: AgentRunState, fingerprint: str) -> StageRecord:
+        io = state.stage_io.get(spec.name)
+        if io is None:
+            return StageRecord(fingerprint=fingerprint)
+        # Snapshot ids belong to the run that took them, not to the stage's result.
+        produced = sorted(io.artifacts - {f"{spec.name}_snapshot"})
+        return StageRecord.capture(
+            self.workspace,
+            fingerprint,
+            reads=io.reads,
+            outputs=io.writes,
+            artifacts={name: state.artifacts[name] for name in produced if name in state.artifacts},
         )
-        await self._run_agent(
-            self.agents[2],
-            state,
-            "Review code artifacts and contribute pytest or smoke test coverage.",
+
+    async def _skip_if_current(
+        self,
+        spec: AgentSpec,
+        state: AgentRunState,
+        fingerprint: str,
+        events: EventStream | None,
+    ) -> bool:
+        """Restore ``spec``'s recorded artifacts and return ``True`` if it is up to date."""
+
+        record = self.fingerprints.get(spec.name)
+        if record is None:
+            state.log(f"Stage {spec.name} has no recorded run; executing", kind="stage")
+            return False
+        reason = await asyncio.to_thread(record.stale_reason, self.workspace, fingerprint)
+        if reason is not None:
+            state.log(
+                f"Stage {spec.name} is stale ({reason}); executing",
+                kind="stage",
+                payload={"status": "stale", "reason": reason},
+            )
+            return False
+
+        for name, payload in record.artifacts.items():
+            state.add_artifact(name, payload)
+        if state.handoff is not None:
+            # Downstream stages that do run still get a handoff of this stage's recorded outputs.
+            await asyncio.to_thread(state.handoff.record_files, spec.name, self.workspace, record.outputs)
+        metrics = state.stage_metrics[spec.name]
+        metrics.skipped = True
+        metrics.finish()
+        self._record_stage(state, spec, "skipped", metrics)
+        state.log(
+            f"Stage {spec.name} is up to date; skipped "
+            f"({len(record.outputs)} outputs, {len(record.artifacts)} artifacts restored)",
+            kind="stage",
+            payload={"status": "skipped", "outputs": len(record.outputs), "artifacts": sorted(record.artifacts)},
         )
-        await self._run_agent(
-            self.agents[3],
-            state,
-            "Summarize the run, produce README content, and reference recorded events.",
+        if events is not None:
+            events.emit("stage_completed", **metrics.as_dict())
+        return True
+
+    async def _execute_stage(
+        self,
+        spec: AgentSpec,
+        state: AgentRunState,
+        prompt: str,
+        events: EventStream | None = None,
+    ) -> None:
+        token = current_stage.set(spec.name)
+        try:
+            metrics = state.stage_metrics[spec.name] = StageMetrics(stage=spec.name)
+            self._record_stage(state, spec, "running")
+            if events is not None:
+                events.emit("stage_started")
+            state.log(f"Stage {spec.name} started", kind="stage", payload={"status": "running"})
+            if spec.brief:
+                state.add_artifact(f"{spec.name}_summary", spec.brief)
+            input_text = self._stage_input(spec, prompt)
+            fingerprint = self._stage_fingerprint(spec, state, input_text)
+            if self.settings.incremental and await self._skip_if_current(spec, state, fingerprint, events):
+                return
+            # Kept out of the fingerprint: a handoff rebuilt from disk after an upstream skip must not force a rerun.
+            input_text = await self._with_handoff(spec, state, input_text)
+            snapshot = await self._capture_snapshot(spec, state)
+            try:
+                await self._run_agent(spec, state, input_text, events)
+            except Exception:
+                if snapshot is not None:
+                    self._rollback(spec, state, snapshot)
+                metrics.finish()
+                self._record_stage(state, spec, "failed", metrics)
+                await asyncio.to_thread(self.fingerprints.discard, spec.name)
+                raise
+            if "requirements_summary" in spec.outputs:
+                summary_text = await asyncio.to_thread(self._emit_requirements_summary, state)
+                if summary_text:
+                    state.add_artifact("requirements_summary", summary_text)
+            metrics.finish()
+            self._record_stage(state, spec, "completed", metrics)
+            record = await asyncio.to_thread(self._stage_record, spec, state, fingerprint)
+            await asyncio.to_thread(self.fingerprints.put, spec.name, record)
+            state.log(
+                f"Stage {spec.name} complete in {metrics.latency:.2f}s "
+                f"({metrics.turns} turns, {metrics.total_tokens} tokens, {metrics.tool_calls} tool calls)",
+                kind="stage",
+                payload={"status": "completed", **metrics.as_dict()},
+            )
+            if events is not None:
+                events.emit("stage_completed", **metrics.as_dict())
+        finally:
+            current_stage.reset(token)
+
+    def _record_stage(
+        self,
+        state: AgentRunState,
+        spec: AgentSpec,
+        status: str,
+        metrics: StageMetrics | None = None,
+    ) -> None:
+        if state.store is None or state.run_id is None:
+            return
+        state.store.record_stage(
+            state.run_id,
+            spec.name,
+            status,
+            metrics=metrics.as_dict() if metrics is not None else None,
         )
-        state.log("Pipeline complete")
+
+    async def _capture_snapshot(self, spec: AgentSpec, state: AgentRunState) -> Snapshot | None:
+        if self.snapshots is None:
+            return None
+        snapshot = await asyncio.to_thread(self.snapshots.capture, f"before-{spec.name}")
+        state.add_artifact(f"{spec.name}_snapshot", snapshot.id)
+        state.log(f"Snapshot {snapshot.id} captured before {spec.name} ({len(snapshot.files)} files)")
+        return snapshot
+
+    def _rollback(self, spec: AgentSpec, state: AgentRunState, snapshot: Snapshot) -> None:
+        # Only the files this stage wrote are restored: sibling stages running
+        # concurrently may have changed others since the snapshot was taken.
+        io = state.stage_io.get(spec.name)
+        written = sorted(io.writes) if io is not None else []
+        try:
+            report = self.snapshots.restore(snapshot, paths=written)
+        except (OSError, SnapshotError) as exc:
+            state.log(f"Rollback of {spec.name} to snapshot {snapshot.id} failed: {exc}")
+            return
+        state.log(
+            f"Stage {spec.name} failed; restored snapshot {snapshot.id} "
+            f"({len(report.restored)} restored, {len(report.removed)} removed)",
+            kind="stage",
+            payload={"status": "failed", "snapshot": snapshot.id},
+        )
+
+    async def _run(self, prompt: str, events: EventStream | None = None) -> AgentRunState:
+        state = AgentRunState(workspace=self.workspace, plan=self.plan)
+        if self.run_store is not None:
+            state.store = self.run_store
+            state.run_id = self.run_store.start_run(
+                self.workspace,
+                prompt=prompt,
+                settings=self.settings.model_dump(mode="json"),
+            )
+            sink: EventSink = RunStoreEventSink(self.run_store, state.run_id)
+        else:
+            # One file per run: runs sharing a workspace must never read back each other's events.
+            spill_name = f"{int(time.time())}-{uuid.uuid4().hex}.jsonl"
+            sink = JsonlEventSink(self.workspace / STATE_DIR_NAME / "events" / spill_name)
+        state.events = EventLog(self.settings.event_buffer_size, sink=sink)
+        if self.settings.handoff_max_tokens is not None:
+            state.handoff = HandoffCompactor()
+        if events is not None:
+            state.subscribe(lambda message: events.emit("log", message))
+
+        status = "failed"
+        try:
+            state.log("Pipeline start")
+            if self.recording_path is not None:
+                state.add_artifact("recording_path", str(self.recording_path))
+            plan_summary = self._plan_block()
+            state.add_artifact("requirements_summary", plan_summary)
+
+            # Stages start as soon as the artifacts they consume are available.
+            scheduler = StageScheduler(self.agents, max_concurrency=self.settings.max_parallel_stages)
+            waves = " -> ".join(" | ".join(wave) for wave in scheduler.levels())
+            state.log(f"Stage schedule: {waves} (max {scheduler.max_concurrency} concurrent)")
+            await scheduler.run(lambda spec: self._execute_stage(spec, state, prompt, events))
+            if self.snapshots is not None:
+                await asyncio.to_thread(self.snapshots.prune, self.settings.snapshot_retention)
+            if self.response_cache is not None:
+                cache = self.response_cache
+                state.log(f"Response cache: {cache.hits} hits, {cache.misses} misses, {cache.writes} writes")
+            if self.request_scheduler is not None:
+                state.log(f"Request scheduler: {self.request_scheduler.summary()}")
+            state.log("Pipeline complete")
+            status = "completed"
+        finally:
+            await asyncio.to_thread(state.events.close)
+            self._export_metrics(state, status)
+            if self.run_store is not None and state.run_id is not None:
+                self.run_store.finish_run(state.run_id, status)
+                await asyncio.to_thread(self.run_store.flush)
         return state
 
+    def _export_metrics(self, state: AgentRunState, status: str) -> None:
+        path = self.settings.metrics_path or self.workspace / STATE_DIR_NAME / METRICS_FILE_NAME
+        payload = {"run_id": state.run_id, "status": status, "model": self.settings.model, **state.metrics()}
+        try:
+            write_metrics(path, payload)
+        except OSError as exc:
+            state.log(f"Failed to write metrics to {path}: {exc}")
+            return
+        state.add_artifact("metrics_path", str(path))
+
+    async def run(self, prompt: str) -> AgentRunState:
+        """Run the end-to-end pipeline and return the final run state."""
+
+        return await self._run(prompt)
+
+    async def aclose(self) -> None:
+        """Stop the run store writer. The OpenAI client is owned by the caller and left open."""
+
+        if self.run_store is not None:
+            await asyncio.to_thread(self.run_store.close)
+
+    async def stream(self, prompt: str) -> AsyncIterator[PipelineEvent]:
+        """Run the pipeline, yielding :class:`PipelineEvent` updates as they happen.
+
+        Stages use the streaming runner, so token deltas, tool calls and log
+        entries arrive incrementally. The final ``pipeline_completed`` event
+        carries the run state in ``data["state"]``.
+        """
+
+        events = EventStream()
+
+        async def drive() -> None:
+            try:
+                state = await self._run(prompt, events)
+                events.emit("pipeline_completed", state=state)
+            finally:
+                events.close()
+
+        task = asyncio.create_task(drive())
+        try:
+            async for event in events:
+                yield event
+            await task
+        finally:
+            if not task.done():
+                task.cancel()
+                with contextlib.suppress(asyncio.CancelledError):
+                    await task
+
 
 def run_pipeline(
     *,
@@ -226,4 +594,11 @@ def run_pipeline(
     if openai_key:
         set_default_openai_key(openai_key)
     pipeline = MultiAgentPipeline(workspace=workspace, plan=plan, settings=settings)
-    return asyncio.run(pipeline.run(prompt))
+
+    async def run() -> AgentRunState:
+        try:
+            return await pipeline.run(prompt)
+        finally:
+            await pipeline.aclose()
+
+    return asyncio.run(run())
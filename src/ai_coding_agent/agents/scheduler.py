@@ -0,0 +1,121 @@
+"""Dependency-aware scheduling for pipeline stages."""
+from __future__ import annotations
+
+import asyncio
+from typing import Awaitable, Callable, Iterable, Protocol, Sequence
+
+
+class StageNode(Protocol):
+    """Minimal view of a stage required by :class:`StageScheduler`."""
+
+    name: str
+    inputs: tuple[str, ...]
+    outputs: tuple[str, ...]
+
+
+class StageGraphError(ValueError):
+    """Raised when a declared stage graph cannot be executed."""
+
+
+class StageScheduler:
+    """Run stages as soon as their declared inputs are available.
+
+    Each stage lists the artifact names it consumes (``inputs``) and produces
+    (``outputs``). Stages whose inputs are satisfied are started concurrently
+    inside an :class:`asyncio.TaskGroup`, bounded by ``max_concurrency``. Ready
+    stages are started in declaration order.
+    """
+
+    def __init__(
+        self,
+        stages: Sequence[StageNode],
+        *,
+        max_concurrency: int = 1,
+        initial: Iterable[str] = (),
+    ) -> None:
+        if max_concurrency < 1:
+            raise ValueError("max_concurrency must be at least 1.")
+        self.stages = list(stages)
+        self.max_concurrency = max_concurrency
+        self.initial = frozenset(initial)
+        self.validate()
+
+    def validate(self) -> None:
+        """Ensure stage names are unique and every stage can eventually run."""
+
+        names = [stage.name for stage in self.stages]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise StageGraphError(f"Duplicate stage names: {', '.join(duplicates)}")
+
+        producers: dict[str, str] = {}
+        for stage in self.stages:
+            for output in stage.outputs:
+                if output in producers:
+                    raise StageGraphError(
+                        f"Output {output!r} is produced by both {producers[output]!r} and {stage.name!r}."
+                    )
+                producers[output] = stage.name
+
+        for stage in self.stages:
+            missing = [item for item in stage.inputs if item not in producers and item not in self.initial]
+            if missing:
+                raise StageGraphError(f"Stage {stage.name!r} depends on unknown inputs: {', '.join(missing)}")
+
+        # Simulate execution to detect cycles.
+        available = set(self.initial)
+        pending = list(self.stages)
+        while pending:
+            ready = [stage for stage in pending if set(stage.inputs) <= available]
+            if not ready:
+                blocked = ", ".join(stage.name for stage in pending)
+                raise StageGraphError(f"Dependency cycle between stages: {blocked}")
+            for stage in ready:
+                available.update(stage.outputs)
+                pending.remove(stage)
+
+    def levels(self) -> list[list[str]]:
+        """Return stage names grouped into waves that may run concurrently."""
+
+        available = set(self.initial)
+        pending = list(self.stages)
+        waves: list[list[str]] = []
+        while pending:
+            ready = [stage for stage in pending if set(stage.inputs) <= available]
+            waves.append([stage.name for stage in ready])
+            for stage in ready:
+                available.update(stage.outputs)
+                pending.remove(stage)
+        return waves
+
+    async def run(self, execute: Callable[[StageNode], Awaitable[None]]) -> None:
+        """Execute every stage via ``execute`` respecting dependencies.
+
+        If a stage fails, the remaining stages are cancelled and the original
+        exception is re-raised (unwrapped when it is the only failure).
+        """
+
+        available = set(self.initial)
+        pending = list(self.stages)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        try:
+            async with asyncio.TaskGroup() as group:
+
+                def launch_ready() -> None:
+                    for stage in list(pending):
+                        if set(stage.inputs) <= available:
+                            pending.remove(stage)
+                            group.create_task(run_stage(stage), name=f"stage:{stage.name}")
+
+                async def run_stage(stage: StageNode) -> None:
+                    async with semaphore:
+                        await execute(stage)
+                    available.update(stage.outputs)
+                    launch_ready()
+
+                launch_ready()
+        except ExceptionGroup as exc_group:
+            if len(exc_group.exceptions) == 1:
+                raise exc_group.exceptions[0] from None
+            raise
@@ -0,0 +1,83 @@
+"""Incremental event output for streaming pipeline runs."""
+from __future__ import annotations
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator
+
+from agents.items import ItemHelpers
+from agents.stream_events import RawResponsesStreamEvent, RunItemStreamEvent, StreamEvent
+
+from ..context import current_stage
+from ..metrics import StageMetrics
+
+PREVIEW_CHARS = 200
+
+
+@dataclass(slots=True)
+class PipelineEvent:
+    """A single incremental update emitted while the pipeline runs.
+
+    ``kind`` is one of ``stage_started``, ``stage_completed``, ``log``,
+    ``tool_called``, ``tool_output``, ``token``, ``message`` or
+    ``pipeline_completed``. ``elapsed`` is seconds since the run started.
+    """
+
+    kind: str
+    stage: str | None = None
+    text: str = ""
+    elapsed: float = 0.0
+    data: dict[str, Any] = field(default_factory=dict)
+
+
+def _preview(value: Any) -> str:
+    text = str(value)
+    if len(text) > PREVIEW_CHARS:
+        return text[:PREVIEW_CHARS].rstrip() + "..."
+    return text
+
+
+class EventStream:
+    """Queue-backed async iterator of :class:`PipelineEvent` objects."""
+
+    def __init__(self) -> None:
+        self._queue: asyncio.Queue[PipelineEvent | None] = asyncio.Queue()
+        self._started = time.perf_counter()
+
+    def emit(self, kind: str, text: str = "", *, stage: str | None = None, **data: Any) -> None:
+        self._queue.put_nowait(
+            PipelineEvent(
+                kind=kind,
+                stage=stage or current_stage.get(),
+                text=text,
+                elapsed=time.perf_counter() - self._started,
+                data=data,
+            )
+        )
+
+    def close(self) -> None:
+        self._queue.put_nowait(None)
+
+    async def __aiter__(self) -> AsyncIterator[PipelineEvent]:
+        while (event := await self._queue.get()) is not None:
+            yield event
+
+    def forward(self, event: StreamEvent, metrics: StageMetrics) -> None:
+        """Translate an Agents SDK stream event and record time to first token."""
+
+        if isinstance(event, RawResponsesStreamEvent):
+            event_type = getattr(event.data, "type", "")
+            if event_type.endswith(".delta"):
+                metrics.mark_first_token()
+            if event_type == "response.output_text.delta":
+                self.emit("token", event.data.delta)
+        elif isinstance(event, RunItemStreamEvent):
+            raw = getattr(event.item, "raw_item", None)
+            if event.name == "tool_called":
+                name = getattr(raw, "name", None) or getattr(raw, "type", "tool")
+                self.emit("tool_called", f"{name}({_preview(getattr(raw, 'arguments', ''))})", tool=name)
+            elif event.name == "tool_output":
+                self.emit("tool_output", _preview(getattr(event.item, "output", "")))
+            elif event.name == "message_output_created":
+                self.emit("message", ItemHelpers.text_message_output(event.item))
@@ -0,0 +1,6 @@
+"""Offline benchmarks for the pipeline, tools and plan rendering."""
+
+from .harness import BenchContext, Samples, compare
+from .pipeline import bench_pipeline
+
+__all__ = ["BenchContext", "Samples", "bench_pipeline", "compare"]
@@ -0,0 +1,167 @@
+"""Minimal benchmark registry, timer and JSON result format."""
+from __future__ import annotations
+
+import gc
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+RESULTS_VERSION = 1
+DEFAULT_RESULTS_DIR = Path(".benchmarks")
+
+
+@dataclass(slots=True)
+class Samples:
+    """Repeated timings of one measurement, in seconds."""
+
+    name: str
+    values: list[float] = field(default_factory=list)
+
+    def as_dict(self) -> dict[str, Any]:
+        values = sorted(self.values)
+        if not values:
+            return {"name": self.name, "samples": 0}
+        return {
+            "name": self.name,
+            "samples": len(values),
+            "min": values[0],
+            "median": statistics.median(values),
+            "mean": statistics.fmean(values),
+            "p95": values[min(len(values) - 1, round(0.95 * (len(values) - 1)))],
+            "max": values[-1],
+        }
+
+
+@dataclass(slots=True)
+class BenchContext:
+    """Options and scratch space shared by the cases of one suite run."""
+
+    scratch: Path
+    quick: bool = False
+    large_file_bytes: int = 2 * 1024**3
+
+    def directory(self, name: str) -> Path:
+        path = self.scratch / name
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+
+Setup = Callable[[BenchContext], Callable[[int], Any]]
+"""Prepares fixtures for a case and returns the timed callable.
+
+The callable receives the iteration number so cases that must not observe
+their own earlier iterations (for example writes into fresh paths) can vary
+their target.
+"""
+
+
+@dataclass(slots=True)
+class Benchmark:
+    """A registered benchmark case."""
+
+    name: str
+    group: str
+    setup: Setup
+    repeat: int = 5
+    warmup: int = 1
+    quick: bool = True
+    """Whether the case runs under ``--quick``."""
+
+
+REGISTRY: dict[str, Benchmark] = {}
+
+
+def benchmark(name: str, *, group: str, repeat: int = 5, warmup: int = 1, quick: bool = True):
+    """Register ``setup`` as the benchmark ``name``."""
+
+    def register(setup: Setup) -> Setup:
+        REGISTRY[name] = Benchmark(name=name, group=group, setup=setup, repeat=repeat, warmup=warmup, quick=quick)
+        return setup
+
+    return register
+
+
+def measure(case: Benchmark, context: BenchContext, *, repeat: int | None = None) -> Samples:
+    """Run ``case`` and return one timing per measured iteration."""
+
+    run = case.setup(context)
+    samples = Samples(case.name)
+    repeat = case.repeat if repeat is None else repeat
+    for iteration in range(case.warmup + repeat):
+        gc.collect()
+        started = time.perf_counter()
+        run(iteration)
+        elapsed = time.perf_counter() - started
+        if iteration >= case.warmup:
+            samples.values.append(elapsed)
+    return samples
+
+
+def _git_commit(cwd: Path) -> str | None:
+    try:
+        completed = subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=cwd,
+            capture_output=True,
+            text=True,
+            timeout=10,
+            check=True,
+        )
+    except (OSError, subprocess.SubprocessError):
+        return None
+    return completed.stdout.strip() or None
+
+
+def environment(cwd: Path | None = None) -> dict[str, Any]:
+    """Describe the machine and revision a result set was produced on."""
+
+    return {
+        "commit": _git_commit(cwd or Path.cwd()),
+        "python": sys.version.split()[0],
+        "implementation": platform.python_implementation(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpus": os.cpu_count(),
+    }
+
+
+def results_document(results: dict[str, dict[str, Any]], *, groups: dict[str, str]) -> dict[str, Any]:
+    return {
+        "version": RESULTS_VERSION,
+        "created_at": time.time(),
+        "environment": environment(),
+        "benchmarks": {name: {"group": groups[name], **stats} for name, stats in results.items()},
+    }
+
+
+def default_results_path(document: dict[str, Any]) -> Path:
+    commit = document["environment"].get("commit") or "unknown"
+    stamp = time.strftime("%Y%m%dT%H%M%S", time.localtime(document["created_at"]))
+    return DEFAULT_RESULTS_DIR / f"{stamp}-{commit}.json"
+
+
+def save_results(document: dict[str, Any], path: Path) -> Path:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(document, indent=2) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return path
+
+
+def compare(baseline: dict[str, Any], current: dict[str, Any], *, metric: str = "median") -> list[dict[str, Any]]:
+    """Return per-benchmark ratios of ``current`` over ``baseline`` for ``metric``."""
+
+    rows = []
+    for name, stats in current["benchmarks"].items():
+        before = baseline["benchmarks"].get(name, {}).get(metric)
+        after = stats.get(metric)
+        ratio = after / before if before and after is not None else None
+        rows.append({"name": name, "baseline": before, "current": after, "ratio": ratio})
+    return rows
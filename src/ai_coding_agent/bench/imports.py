@@ -0,0 +1,82 @@
+"""Import-time and CLI start-up measurements in fresh interpreters."""
+from __future__ import annotations
+
+import subprocess
+import sys
+import time
+from typing import Iterable
+
+from .harness import Samples
+
+DEFAULT_MODULES = (
+    "ai_coding_agent",
+    "ai_coding_agent.cli",
+    "ai_coding_agent.config",
+    "ai_coding_agent.context",
+    "ai_coding_agent.agents.pipeline",
+    "agents",
+    "openai",
+    "pydantic",
+    "rich.console",
+    "typer",
+)
+
+CLI_COMMANDS = (("--help",), ("run", "--help"), ("bench", "--help"))
+
+
+def _cumulative_import_seconds(stderr: str, module: str) -> float:
+    """Return the cumulative time ``-X importtime`` reported for ``module``."""
+
+    for line in reversed(stderr.splitlines()):
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if name.strip() == module:
+            return int(cumulative) / 1_000_000
+    # Already imported during interpreter start-up (for example by site).
+    return 0.0
+
+
+def import_time(module: str, *, repeat: int = 5) -> Samples:
+    """Time ``import module`` in ``repeat`` fresh interpreters."""
+
+    samples = Samples(f"import {module}")
+    for _ in range(repeat):
+        completed = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+            capture_output=True,
+            text=True,
+            check=False,
+        )
+        if completed.returncode != 0:
+            message = completed.stderr.strip().splitlines()[-1:] or ["unknown error"]
+            raise RuntimeError(f"import {module} failed: {message[0]}")
+        samples.values.append(_cumulative_import_seconds(completed.stderr, module))
+    return samples
+
+
+def process_time(name: str, argv: list[str], *, repeat: int = 5) -> Samples:
+    """Wall-clock time of running ``argv`` to completion ``repeat`` times."""
+
+    samples = Samples(name)
+    for _ in range(repeat):
+        started = time.perf_counter()
+        subprocess.run(argv, capture_output=True, check=False)
+        samples.values.append(time.perf_counter() - started)
+    return samples
+
+
+def measure_startup(modules: Iterable[str] = DEFAULT_MODULES, *, repeat: int = 5) -> list[tuple[str, Samples]]:
+    """Measure interpreter start-up, CLI invocations and module imports.
+
+    Returns ``(group, samples)`` pairs; the bare interpreter row is the floor
+    every CLI invocation pays regardless of what the package imports.
+    """
+
+    results = [("startup", process_time("python -c pass", [sys.executable, "-c", "pass"], repeat=repeat))]
+    for args in CLI_COMMANDS:
+        argv = [sys.executable, "-m", "ai_coding_agent.cli", *args]
+        results.append(("startup", process_time(f"ai-coding-agent {' '.join(args)}", argv, repeat=repeat)))
+    for module in modules:
+        results.append(("import", import_time(module, repeat=repeat)))
+    return results
@@ -0,0 +1,101 @@
+"""Offline benchmarks of pipeline orchestration overhead."""
+from __future__ import annotations
+
+import asyncio
+import tempfile
+import time
+from pathlib import Path
+from typing import Any
+
+from ..agents.pipeline import MultiAgentPipeline
+from ..config import AgentRuntimeSettings, CacheMode, ModelBackend
+from ..context import AgentRunState
+from ..plan import AgentProjectPlan
+from ..providers.stub import StubModelProvider
+from .harness import Samples
+
+
+async def _consume(pipeline: MultiAgentPipeline, prompt: str, stream: bool) -> AgentRunState:
+    if not stream:
+        return await pipeline.run(prompt)
+    state: AgentRunState | None = None
+    async for event in pipeline.stream(prompt):
+        if event.kind == "pipeline_completed":
+            state = event.data["state"]
+    assert state is not None
+    return state
+
+
+def _stub_provider(provider: Any) -> StubModelProvider | None:
+    """Find the stub under the scheduling and caching wrappers, which expose it as ``inner``."""
+
+    while not isinstance(provider, StubModelProvider):
+        provider = getattr(provider, "inner", None)
+        if provider is None:
+            return None
+    return provider
+
+
+def bench_pipeline(
+    plan: AgentProjectPlan,
+    *,
+    iterations: int = 5,
+    warmup: int = 1,
+    script: Path | None = None,
+    latency: float = 0.0,
+    stream: bool = False,
+    settings: AgentRuntimeSettings | None = None,
+) -> dict[str, Any]:
+    """Run the pipeline against :class:`StubModelProvider` in fresh temporary workspaces.
+
+    With ``latency`` at zero the measured wall time is pure orchestration:
+    scheduling, tool execution, snapshots, the run store and metrics export.
+    ``model_seconds`` reports the simulated model time so it can be
+    subtracted when a latency is configured.
+    """
+
+    base = settings or AgentRuntimeSettings()
+    overrides = {
+        "model_backend": ModelBackend.REPLAY if script else ModelBackend.STUB,
+        "model_script": script,
+        "stub_latency_seconds": latency,
+        "cache_mode": CacheMode.OFF,
+    }
+    wall = Samples("wall")
+    model = Samples("model")
+    stages: dict[str, Samples] = {}
+    tools: dict[str, Samples] = {}
+    for iteration in range(warmup + iterations):
+        with tempfile.TemporaryDirectory(prefix="ai-coding-agent-bench-") as tmp:
+            pipeline = MultiAgentPipeline(
+                workspace=Path(tmp),
+                plan=plan,
+                settings=base.model_copy(update=overrides),
+            )
+            started = time.perf_counter()
+            try:
+                state = asyncio.run(_consume(pipeline, "Benchmark run", stream))
+            finally:
+                if pipeline.run_store is not None:
+                    pipeline.run_store.close()
+            elapsed = time.perf_counter() - started
+        if iteration < warmup:
+            continue
+        wall.values.append(elapsed)
+        stub = _stub_provider(pipeline.model_provider)
+        model.values.append(stub.model_seconds if stub is not None else 0.0)
+        for metrics in state.stage_metrics.values():
+            stages.setdefault(metrics.stage, Samples(metrics.stage)).values.append(metrics.latency or 0.0)
+            for name, tool in metrics.tools.items():
+                tools.setdefault(name, Samples(name)).values.append(tool.seconds / max(tool.completed, 1))
+
+    return {
+        "iterations": iterations,
+        "latency": latency,
+        "stream": stream,
+        "script": str(script) if script else None,
+        "wall": wall.as_dict(),
+        "model": model.as_dict(),
+        "stages": {name: samples.as_dict() for name, samples in stages.items()},
+        "tools": {name: samples.as_dict() for name, samples in sorted(tools.items())},
+    }
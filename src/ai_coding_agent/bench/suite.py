@@ -0,0 +1,289 @@
+"""Benchmark cases for the filesystem tools, plan rendering and requirement summaries."""
+from __future__ import annotations
+
+import asyncio
+import itertools
+import json
+from pathlib import Path
+from typing import Any, Callable, Iterable
+
+from agents.tool import FunctionTool
+from agents.tool_context import ToolContext
+
+from .. import plan as plan_module
+from ..agents.pipeline import MultiAgentPipeline
+from ..config import AgentRuntimeSettings, ModelBackend
+from ..context import AgentRunState
+from ..plan import AgentProjectPlan
+from ..summaries import SummaryCache
+from ..tools.filesystem import apply_patch_tool, read_file_tool, write_many_tool
+from .harness import REGISTRY, BenchContext, Benchmark, Samples, benchmark, measure
+
+BUNDLED_PLAN = Path(__file__).resolve().parents[3] / "docs" / "agent_project_plan.json"
+
+_runner: asyncio.Runner | None = None
+
+
+class BenchmarkSkipped(Exception):
+    """Raised by a case whose fixtures are unavailable in this environment."""
+
+
+def _state(workspace: Path, plan: AgentProjectPlan | None = None) -> AgentRunState:
+    return AgentRunState(workspace=workspace, plan=plan or AgentProjectPlan(requirements={}))
+
+
+def _invoke(tool: FunctionTool, state: AgentRunState, payload: str) -> Any:
+    """Call ``tool`` exactly as the runner would, including argument parsing."""
+
+    assert _runner is not None, "benchmarks must run through run_suite()"
+    context = ToolContext(context=state, tool_name=tool.name, tool_call_id="bench", tool_arguments=payload)
+    result = _runner.run(tool.on_invoke_tool(context, payload))
+    if isinstance(result, str):
+        raise RuntimeError(f"{tool.name} failed: {result}")
+    return result
+
+
+def _load_bundled_plan() -> AgentProjectPlan:
+    if not BUNDLED_PLAN.exists():
+        raise BenchmarkSkipped(f"{BUNDLED_PLAN} not found")
+    return AgentProjectPlan.load(BUNDLED_PLAN)
+
+
+def scale_plan(plan: AgentProjectPlan, factor: int) -> AgentProjectPlan:
+    """Return a synthetic plan whose list and mapping sections are ``factor`` times larger."""
+
+    requirements: dict[str, Any] = {}
+    for key, value in plan.requirements.items():
+        if isinstance(value, list):
+            requirements[key] = [item for _ in range(factor) for item in value]
+        elif isinstance(value, dict):
+            requirements[key] = {
+                f"{inner}_{copy}" if copy else inner: item
+                for copy in range(factor)
+                for inner, item in value.items()
+            }
+        else:
+            requirements[key] = value
+    return AgentProjectPlan(requirements=requirements, raw=dict(plan.raw))
+
+
+# write_many -----------------------------------------------------------------
+
+
+def _file_batch(count: int) -> str:
+    files = [
+        {
+            "path": f"pkg{index // 100:03d}/module_{index:05d}.py",
+            "content": f'"""Module {index}."""\n\n' + "".join(f"VALUE_{line} = {index * line}\n" for line in range(32)),
+        }
+        for index in range(count)
+    ]
+    return json.dumps(files)
+
+
+def _write_many_case(count: int) -> Callable[[BenchContext], Callable[[int], Any]]:
+    def setup(context: BenchContext) -> Callable[[int], Any]:
+        state = _state(context.directory(f"write_many_{count}"))
+        files = _file_batch(count)
+        return lambda iteration: _invoke(
+            write_many_tool, state, f'{{"files": {files}, "base_path": "round-{iteration}"}}'
+        )
+
+    return setup
+
+
+for _count, _repeat in ((10, 20), (1_000, 5), (10_000, 3)):
+    benchmark(f"write_many[{_count}]", group="filesystem", repeat=_repeat, quick=_count <= 1_000)(
+        _write_many_case(_count)
+    )
+
+
+@benchmark("write_many[1000-unchanged]", group="filesystem")
+def _write_many_unchanged(context: BenchContext) -> Callable[[int], Any]:
+    state = _state(context.directory("write_many_unchanged"))
+    payload = f'{{"files": {_file_batch(1_000)}}}'
+    return lambda iteration: _invoke(write_many_tool, state, payload)
+
+
+# apply_patch ----------------------------------------------------------------
+
+
+@benchmark("apply_patch[3000-lines]", group="filesystem", repeat=20)
+def _apply_patch(context: BenchContext) -> Callable[[int], Any]:
+    workspace = context.directory("apply_patch")
+    (workspace / "large.py").write_text("".join(f"value_{index} = {index}\n" for index in range(3_000)))
+    state = _state(workspace)
+    edits = itertools.count()
+    current = "value_1500 = 1500"
+
+    def run(iteration: int) -> Any:
+        nonlocal current
+        replacement = f"value_1500 = {next(edits)}"
+        diff = f"@@ -1500,3 +1500,3 @@\n value_1499 = 1499\n-{current}\n+{replacement}\n value_1501 = 1501\n"
+        current = replacement
+        return _invoke(apply_patch_tool, state, json.dumps({"edits": [{"path": "large.py", "diff": diff}]}))
+
+    return run
+
+
+# read_file ------------------------------------------------------------------
+
+
+def _large_file(context: BenchContext) -> Path:
+    """Create (once per scratch directory) a log-like file of ``large_file_bytes``."""
+
+    path = context.scratch / "read_file" / "large.log"
+    if path.exists() and path.stat().st_size == context.large_file_bytes:
+        return path
+    path.parent.mkdir(parents=True, exist_ok=True)
+    line = "2024-01-01T00:00:00Z INFO worker-{:08d} processed request in 12.5ms ünïcödé\n"
+    block = "".join(line.format(index) for index in range(12_000)).encode("utf-8")
+    remaining = context.large_file_bytes
+    with open(path, "wb") as handle:
+        while remaining > 0:
+            chunk = block[:remaining]
+            handle.write(chunk)
+            remaining -= len(chunk)
+    return path
+
+
+@benchmark("read_file[small]", group="filesystem", repeat=50)
+def _read_small(context: BenchContext) -> Callable[[int], Any]:
+    workspace = context.directory("read_file")
+    (workspace / "small.py").write_text("".join(f"line_{index} = {index}\n" for index in range(200)))
+    state = _state(workspace)
+    return lambda iteration: _invoke(read_file_tool, state, '{"path": "small.py"}')
+
+
+def _read_large_case(arguments: dict[str, Any] | Callable[[int], dict[str, Any]]):
+    def setup(context: BenchContext) -> Callable[[int], Any]:
+        path = _large_file(context)
+        state = _state(path.parent)
+        build = arguments if callable(arguments) else (lambda size: arguments)
+        payload = json.dumps({"path": path.name, **build(path.stat().st_size)})
+        return lambda iteration: _invoke(read_file_tool, state, payload)
+
+    return setup
+
+
+for _name, _arguments in (
+    ("head", {}),
+    ("middle", lambda size: {"offset": size // 2}),
+    ("tail", {"tail_lines": 200}),
+    ("lines", {"start_line": 10_000, "end_line": 10_200}),
+):
+    benchmark(f"read_file[large-{_name}]", group="filesystem", repeat=20)(_read_large_case(_arguments))
+
+
+# to_prompt_block ------------------------------------------------------------
+
+
+def _prompt_case(factor: int, *, cached: bool, max_tokens: int | None = None):
+    def setup(context: BenchContext) -> Callable[[int], Any]:
+        plan = _load_bundled_plan()
+        if factor > 1:
+            plan = scale_plan(plan, factor)
+
+        def run(iteration: int) -> str:
+            if not cached:
+                plan_module._PROMPT_CACHE.clear()
+            return plan.to_prompt_block(max_tokens=max_tokens)
+
+        return run
+
+    return setup
+
+
+benchmark("to_prompt_block[bundled]", group="plan", repeat=50)(_prompt_case(1, cached=False))
+benchmark("to_prompt_block[bundled-memoized]", group="plan", repeat=50)(_prompt_case(1, cached=True))
+benchmark("to_prompt_block[10x]", group="plan", repeat=20)(_prompt_case(10, cached=False))
+benchmark("to_prompt_block[10x-memoized]", group="plan", repeat=20)(_prompt_case(10, cached=True))
+benchmark("to_prompt_block[10x-budget-8k]", group="plan", repeat=20)(
+    _prompt_case(10, cached=False, max_tokens=8_000)
+)
+
+
+# _emit_requirements_summary -------------------------------------------------
+
+
+def _summary_case(count: int, *, cold: bool = False):
+    def setup(context: BenchContext) -> Callable[[int], Any]:
+        workspace = context.directory(f"requirements_summary_{count}")
+        requirements = workspace / "requirements"
+        requirements.mkdir(exist_ok=True)
+        paragraph = "The system shall record every change to a task together with its author and timestamp. "
+        for index in range(count):
+            (requirements / f"req_{index:04d}.md").write_text(
+                f"# Requirement {index}\n\n" + (paragraph * 20 + "\n\n") * 3,
+                encoding="utf-8",
+            )
+        settings = AgentRuntimeSettings(model_backend=ModelBackend.STUB, snapshots=False, run_store=False)
+        pipeline = MultiAgentPipeline(workspace=workspace, plan=AgentProjectPlan(requirements={}), settings=settings)
+        state = _state(workspace)
+        if not cold:
+            return lambda iteration: pipeline._emit_requirements_summary(state)
+        cache_path = pipeline.summary_cache.path
+
+        def run(iteration: int) -> Any:
+            cache_path.unlink(missing_ok=True)
+            pipeline.summary_cache = SummaryCache(cache_path)
+            return pipeline._emit_requirements_summary(state)
+
+        return run
+
+    return setup
+
+
+for _count in (100, 500):
+    benchmark(f"requirements_summary[{_count}]", group="pipeline", repeat=10)(_summary_case(_count))
+    benchmark(f"requirements_summary[{_count}-cold]", group="pipeline", repeat=10)(_summary_case(_count, cold=True))
+
+
+# Runner ---------------------------------------------------------------------
+
+
+def select(patterns: Iterable[str] = (), *, quick: bool = False) -> list[Benchmark]:
+    """Return registered cases whose name contains any of ``patterns``."""
+
+    patterns = list(patterns)
+    return [
+        case
+        for name, case in REGISTRY.items()
+        if (not patterns or any(pattern in name for pattern in patterns)) and (case.quick or not quick)
+    ]
+
+
+def run_suite(
+    context: BenchContext,
+    cases: list[Benchmark],
+    *,
+    repeat: int | None = None,
+    on_result: Callable[[Benchmark, Samples | None, str | None], None] | None = None,
+) -> dict[str, dict[str, Any]]:
+    """Measure ``cases`` and return their statistics keyed by benchmark name.
+
+    Raw per-iteration timings are kept under ``values`` so later comparisons
+    can apply their own statistics.
+    """
+
+    global _runner
+    results: dict[str, dict[str, Any]] = {}
+    context.scratch.mkdir(parents=True, exist_ok=True)
+    _runner = asyncio.Runner()
+    try:
+        for case in cases:
+            try:
+                samples = measure(case, context, repeat=repeat)
+            except BenchmarkSkipped as exc:
+                results[case.name] = {"name": case.name, "samples": 0, "skipped": str(exc)}
+                if on_result is not None:
+                    on_result(case, None, str(exc))
+                continue
+            results[case.name] = {**samples.as_dict(), "values": samples.values}
+            if on_result is not None:
+                on_result(case, samples, None)
+    finally:
+        _runner.close()
+        _runner = None
+    return results
+
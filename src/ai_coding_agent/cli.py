@@ -1,20 +1,41 @@
 """Command line interface for the AI Coding Agent."""
 from __future__ import annotations
 
-import asyncio
+import functools
 from pathlib import Path
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
 import typer
-from rich.console import Console
-from rich.table import Table
 
-from .config import AgentRuntimeSettings, WorkspaceConfig
-from .plan import AgentProjectPlan
-from .agents.pipeline import MultiAgentPipeline
+# Only lightweight modules are imported here so ``--help`` and argument
+# errors stay fast; Rich, pydantic and the Agents SDK load inside commands.
+from .constants import (
+    DEFAULT_CACHE_DIR,
+    RUN_STORE_NAME,
+    STATE_DIR_NAME,
+    CacheMode,
+    ModelBackend,
+    PromptJsonMode,
+    RequestPriority,
+)
+
+if TYPE_CHECKING:
+    from rich.console import Console
+    from rich.table import Table
+
+    from .agents.pipeline import MultiAgentPipeline
+    from .context import AgentRunState
 
-console = Console()
 app = typer.Typer(help="AI Coding Agent CLI using OpenAI Agents SDK")
+bench_app = typer.Typer(help="Offline benchmarks that need no network or credentials")
+app.add_typer(bench_app, name="bench")
+
+
+@functools.cache
+def _console() -> Console:
+    from rich.console import Console
+
+    return Console()
 
 
 def _resolve_docs(doc_path: Optional[Path]) -> list[Path]:
@@ -30,6 +51,107 @@ def _resolve_docs(doc_path: Optional[Path]) -> list[Path]:
     return docs
 
 
+def _format_seconds(value: float | None) -> str:
+    return "-" if value is None else f"{value:.2f}s"
+
+
+def _stage_table(stages: dict[str, dict[str, str]]) -> Table:
+    from rich.table import Table
+
+    table = Table(title="Stages")
+    table.add_column("Stage")
+    table.add_column("Status")
+    table.add_column("TTFT")
+    table.add_column("Latency")
+    table.add_column("Latest output", overflow="ellipsis", no_wrap=True, max_width=60)
+    for name, row in stages.items():
+        table.add_row(name, row["status"], row["ttft"], row["latency"], row["output"])
+    return table
+
+
+def _metrics_table(state: AgentRunState) -> Table:
+    from rich.table import Table
+
+    summary = state.metrics()
+    table = Table(title="Stage Metrics")
+    for column in ("Stage", "Latency", "TTFT", "Turns", "Input tok", "Cached", "Output tok", "Tool calls"):
+        if column == "Stage":
+            table.add_column(column, no_wrap=True)
+        else:
+            table.add_column(column, justify="right")
+    for row in summary["stages"]:
+        table.add_row(
+            f"{row['stage']} (skipped)" if row["skipped"] else row["stage"],
+            _format_seconds(row["latency"]),
+            _format_seconds(row["time_to_first_token"]),
+            str(row["turns"]),
+            str(row["input_tokens"]),
+            str(row["cached_input_tokens"]),
+            str(row["output_tokens"]),
+            str(row["tool_calls"]),
+        )
+    totals = summary["totals"]
+    table.add_section()
+    table.add_row(
+        "total",
+        _format_seconds(totals["stage_seconds"]),
+        "-",
+        str(totals["turns"]),
+        str(totals["input_tokens"]),
+        str(totals["cached_input_tokens"]),
+        str(totals["output_tokens"]),
+        str(totals["tool_calls"]),
+    )
+    return table
+
+
+def _tools_table(state: AgentRunState) -> Table:
+    from rich.table import Table
+
+    table = Table(title="Tool Calls")
+    for column in ("Stage", "Tool", "Calls", "Seconds"):
+        table.add_column(column)
+    for metrics in state.stage_metrics.values():
+        for name, tool in sorted(metrics.tools.items()):
+            table.add_row(metrics.stage, name, str(tool.calls), f"{tool.seconds:.3f}")
+    return table
+
+
+async def _stream_pipeline(pipeline: MultiAgentPipeline, prompt: str) -> AgentRunState:
+    """Render pipeline events live and return the final run state."""
+
+    from rich.live import Live
+    from rich.markup import escape
+
+    console = _console()
+
+    stages = {
+        spec.name: {"status": "pending", "ttft": "-", "latency": "-", "output": ""} for spec in pipeline.agents
+    }
+    state: AgentRunState | None = None
+    with Live(_stage_table(stages), console=console, refresh_per_second=8) as live:
+        async for event in pipeline.stream(prompt):
+            row = stages.get(event.stage or "")
+            prefix = f"[dim]{event.elapsed:7.2f}s[/dim] [bold]{event.stage or 'pipeline'}[/bold]"
+            if event.kind == "stage_started" and row:
+                row["status"] = "running"
+            elif event.kind == "stage_completed" and row:
+                row["status"] = "skipped" if event.data.get("skipped") else "done"
+                row["ttft"] = _format_seconds(event.data.get("time_to_first_token"))
+                row["latency"] = _format_seconds(event.data.get("latency"))
+            elif event.kind == "token" and row:
+                row["output"] = (row["output"] + event.text).replace("\n", " ")[-200:]
+            elif event.kind == "tool_called":
+                live.console.print(f"{prefix} → {escape(event.text)}", highlight=False)
+            elif event.kind == "log":
+                live.console.print(f"{prefix} {escape(event.text)}", highlight=False)
+            elif event.kind == "pipeline_completed":
+                state = event.data["state"]
+            live.update(_stage_table(stages))
+    assert state is not None
+    return state
+
+
 @app.command()
 def run(
     target_path: Path = typer.Argument(..., help="Workspace directory for generated code"),
@@ -51,6 +173,17 @@ def run(
         resolve_path=True,
     ),
     model: str = typer.Option("gpt-5", help="Model identifier to use for agents"),
+    model_backend: ModelBackend = typer.Option(
+        ModelBackend.OPENAI,
+        "--model-backend",
+        help="openai, stub (offline scripted model), record (openai, saving the session) or replay.",
+        case_sensitive=False,
+    ),
+    model_script: Optional[Path] = typer.Option(
+        None,
+        "--model-script",
+        help="Stub script or recorded session to replay, or where to save a recording.",
+    ),
     max_turns: int = typer.Option(8, help="Maximum turns per agent"),
     temperature: Optional[float] = typer.Option(
         None,
@@ -58,40 +191,637 @@ def run(
         min=0.0,
         max=2.0,
     ),
+    max_parallel_stages: int = typer.Option(
+        3,
+        "--max-parallel-stages",
+        help="Maximum number of independent agent stages to run concurrently.",
+        min=1,
+        max=8,
+    ),
+    cache_mode: CacheMode = typer.Option(
+        CacheMode.OFF,
+        "--cache-mode",
+        help="Model response cache: off, read (serve hits only), or readwrite.",
+        case_sensitive=False,
+    ),
+    cache_dir: Path = typer.Option(
+        DEFAULT_CACHE_DIR,
+        "--cache-dir",
+        help="Directory holding cached model responses.",
+    ),
+    snapshots: bool = typer.Option(
+        True,
+        "--snapshots/--no-snapshots",
+        help="Snapshot the workspace before each stage and roll back when a stage fails.",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Skip stages whose inputs, files read and outputs are unchanged since their last successful run.",
+    ),
+    plan_json: PromptJsonMode = typer.Option(
+        PromptJsonMode.PRETTY,
+        "--plan-json",
+        help="How to embed the full plan JSON in prompts: pretty, minified, or none.",
+        case_sensitive=False,
+    ),
+    plan_max_tokens: Optional[int] = typer.Option(
+        None,
+        "--plan-max-tokens",
+        help="Approximate token budget for the plan prompt block; sections are compacted to fit.",
+        min=1,
+    ),
+    handoff_max_tokens: int = typer.Option(
+        2000,
+        "--handoff-max-tokens",
+        help="Approximate token budget for the summary of upstream work given to each downstream stage (0 disables).",
+        min=0,
+    ),
+    requests_per_minute: Optional[int] = typer.Option(
+        None,
+        "--requests-per-minute",
+        help="Request budget per minute across all concurrent model calls (default: unlimited).",
+        min=1,
+    ),
+    tokens_per_minute: Optional[int] = typer.Option(
+        None,
+        "--tokens-per-minute",
+        help="Token budget per minute across all concurrent model calls (default: unlimited).",
+        min=1,
+    ),
+    max_concurrent_requests: int = typer.Option(
+        16,
+        "--max-concurrent-requests",
+        help="Upper bound for the adaptive number of in-flight model requests.",
+        min=1,
+    ),
+    metrics_file: Optional[Path] = typer.Option(
+        None,
+        "--metrics-file",
+        help=f"Where to write run metrics as JSON (default: <workspace>/{STATE_DIR_NAME}/metrics.json).",
+    ),
+    stream: bool = typer.Option(
+        True,
+        "--stream/--no-stream",
+        help="Render tool calls, log entries and model output live while the run progresses.",
+    ),
 ) -> None:
     """Execute the multi-agent coding workflow."""
 
+    import asyncio
+
+    from openai import AsyncOpenAI
+    from rich.table import Table
+
+    from .agents.pipeline import MultiAgentPipeline
+    from .config import AgentRuntimeSettings, WorkspaceConfig
+    from .plan import AgentProjectPlan
+
+    console = _console()
+
     target_path.mkdir(parents=True, exist_ok=True)
     plan = AgentProjectPlan.load(input_plan)
     docs = _resolve_docs(input_docs)
     workspace = WorkspaceConfig.from_cli(target_path, docs, prompt)
-    settings = AgentRuntimeSettings(model=model, max_turns=max_turns, temperature=temperature)
+    settings = AgentRuntimeSettings(
+        model=model,
+        model_backend=model_backend,
+        model_script=model_script,
+        max_turns=max_turns,
+        temperature=temperature,
+        max_parallel_stages=max_parallel_stages,
+        cache_mode=cache_mode,
+        cache_dir=cache_dir,
+        snapshots=snapshots,
+        incremental=incremental,
+        plan_prompt_json=plan_json,
+        plan_prompt_max_tokens=plan_max_tokens,
+        handoff_max_tokens=handoff_max_tokens or None,
+        metrics_path=metrics_file,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_concurrent_requests=max_concurrent_requests,
+    )
 
+    # Owned here, like BatchRunner's, so it is closed with the pipeline below.
+    client = AsyncOpenAI() if settings.model_backend in {ModelBackend.OPENAI, ModelBackend.RECORD} else None
     pipeline = MultiAgentPipeline(
         workspace=workspace.root,
         plan=plan,
         settings=settings,
+        openai_client=client,
     )
 
     console.rule("AI Coding Agent")
     console.print(f"Workspace: {workspace.root}")
-    console.print(f"Model: {settings.model}")
+    console.print(f"Model: {settings.model} ({settings.model_backend.value})")
+    if settings.cache_mode != CacheMode.OFF:
+        console.print(f"Response cache: {settings.cache_mode.value} ({settings.cache_dir})")
     console.print(f"Prompt override: {workspace.prompt_override!r}")
 
     initial_prompt = plan.initial_prompt(prompt_override=workspace.prompt_override)
 
-    state = asyncio.run(pipeline.run(initial_prompt))
+    async def execute() -> AgentRunState:
+        try:
+            if stream:
+                return await _stream_pipeline(pipeline, initial_prompt)
+            return await pipeline.run(initial_prompt)
+        finally:
+            await pipeline.aclose()
+            if client is not None:
+                await client.close()
 
-    table = Table(title="Run Summary")
-    table.add_column("Event")
-    for event in state.events:
-        table.add_row(event)
-    console.print(table)
+    state = asyncio.run(execute())
+    if not stream:
+        table = Table(title="Run Summary")
+        table.add_column("Stage")
+        table.add_column("Event")
+        for event in state.events.query():
+            table.add_row(event.stage or "-", event.message)
+        console.print(table)
+        if state.events.dropped:
+            console.print(f"{state.events.dropped} older events were dropped from the in-memory log")
+
+    console.print(_metrics_table(state))
+    tools = _tools_table(state)
+    if tools.row_count:
+        console.print(tools)
+    if "metrics_path" in state.artifacts:
+        console.print(f"Metrics written to {state.artifacts['metrics_path']}")
 
     console.print("Artifacts recorded:")
     for key in state.artifacts:
         console.print(f"- {key}")
 
 
+@app.command("run-batch")
+def run_batch(
+    source: Path = typer.Argument(
+        ...,
+        help="Directory of plan JSON files, or a JSON/JSON Lines manifest of runs",
+        exists=True,
+        resolve_path=True,
+    ),
+    output_dir: Path = typer.Option(
+        ...,
+        "--output-dir",
+        "-o",
+        help="Directory under which each run gets its own workspace",
+    ),
+    prompt: Optional[str] = typer.Option(None, help="Override prompt for runs whose manifest entry has none"),
+    max_concurrent_runs: int = typer.Option(
+        4,
+        "--max-concurrent-runs",
+        help="Maximum number of pipelines running at once across the batch.",
+        min=1,
+    ),
+    model: str = typer.Option("gpt-5", help="Model identifier to use for agents"),
+    model_backend: ModelBackend = typer.Option(
+        ModelBackend.OPENAI,
+        "--model-backend",
+        help="openai, stub (offline scripted model), record (openai, saving each session) or replay.",
+        case_sensitive=False,
+    ),
+    model_script: Optional[Path] = typer.Option(
+        None,
+        "--model-script",
+        help="Stub script or recorded session shared by every run.",
+    ),
+    max_turns: int = typer.Option(8, help="Maximum turns per agent"),
+    max_parallel_stages: int = typer.Option(
+        3,
+        "--max-parallel-stages",
+        help="Maximum number of independent agent stages to run concurrently within each run.",
+        min=1,
+        max=8,
+    ),
+    cache_mode: CacheMode = typer.Option(
+        CacheMode.OFF,
+        "--cache-mode",
+        help="Model response cache: off, read (serve hits only), or readwrite.",
+        case_sensitive=False,
+    ),
+    cache_dir: Path = typer.Option(
+        DEFAULT_CACHE_DIR,
+        "--cache-dir",
+        help="Directory holding cached model responses.",
+    ),
+    snapshots: bool = typer.Option(
+        True,
+        "--snapshots/--no-snapshots",
+        help="Snapshot each workspace before each stage and roll back when a stage fails.",
+    ),
+    incremental: bool = typer.Option(
+        False,
+        "--incremental",
+        help="Skip stages whose inputs, files read and outputs are unchanged since their last successful run.",
+    ),
+    plan_json: PromptJsonMode = typer.Option(
+        PromptJsonMode.PRETTY,
+        "--plan-json",
+        help="How to embed the full plan JSON in prompts: pretty, minified, or none.",
+        case_sensitive=False,
+    ),
+    plan_max_tokens: Optional[int] = typer.Option(
+        None,
+        "--plan-max-tokens",
+        help="Approximate token budget for the plan prompt block; sections are compacted to fit.",
+        min=1,
+    ),
+    handoff_max_tokens: int = typer.Option(
+        2000,
+        "--handoff-max-tokens",
+        help="Approximate token budget for the summary of upstream work given to each downstream stage (0 disables).",
+        min=0,
+    ),
+    requests_per_minute: Optional[int] = typer.Option(
+        None,
+        "--requests-per-minute",
+        help="Request budget per minute across all concurrent model calls (default: unlimited).",
+        min=1,
+    ),
+    tokens_per_minute: Optional[int] = typer.Option(
+        None,
+        "--tokens-per-minute",
+        help="Token budget per minute across all concurrent model calls (default: unlimited).",
+        min=1,
+    ),
+    max_concurrent_requests: int = typer.Option(
+        16,
+        "--max-concurrent-requests",
+        help="Upper bound for the adaptive number of in-flight model requests.",
+        min=1,
+    ),
+    priority: RequestPriority = typer.Option(
+        RequestPriority.BATCH,
+        "--priority",
+        help="Request lane for the batch's model calls: interactive or batch.",
+        case_sensitive=False,
+    ),
+    report: Optional[Path] = typer.Option(
+        None,
+        "--report",
+        help="Where to write the batch summary as JSON (default: <output-dir>/batch-report.json).",
+    ),
+) -> None:
+    """Run every plan in a directory or manifest concurrently in one process."""
+
+    import asyncio
+    import time
+
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .agents.batch import BatchManifestError, BatchResult, BatchRunner, load_jobs
+    from .config import AgentRuntimeSettings
+    from .metrics import write_metrics
+
+    console = _console()
+
+    output_dir = output_dir.expanduser().resolve()
+    try:
+        jobs = load_jobs(source, output_root=output_dir)
+    except (BatchManifestError, OSError, ValueError) as exc:
+        console.print(f"[red]{escape(str(exc))}[/red]")
+        raise typer.Exit(code=1)
+
+    settings = AgentRuntimeSettings(
+        model=model,
+        model_backend=model_backend,
+        model_script=model_script,
+        max_turns=max_turns,
+        max_parallel_stages=max_parallel_stages,
+        cache_mode=cache_mode,
+        cache_dir=cache_dir,
+        snapshots=snapshots,
+        incremental=incremental,
+        plan_prompt_json=plan_json,
+        plan_prompt_max_tokens=plan_max_tokens,
+        handoff_max_tokens=handoff_max_tokens or None,
+        requests_per_minute=requests_per_minute,
+        tokens_per_minute=tokens_per_minute,
+        max_concurrent_requests=max_concurrent_requests,
+        request_priority=priority,
+    )
+    runner = BatchRunner(
+        jobs,
+        settings=settings,
+        max_concurrency=max_concurrent_runs,
+        prompt_override=prompt,
+    )
+
+    console.rule("AI Coding Agent batch")
+    console.print(f"Runs: {len(jobs)} (up to {runner.max_concurrency} at once)")
+    console.print(f"Output: {output_dir}")
+    console.print(f"Model: {settings.model} ({settings.model_backend.value})")
+
+    def report_progress(result: BatchResult) -> None:
+        colour = "green" if result.status == "completed" else "red"
+        line = f"[{colour}]{result.status}[/{colour}] {escape(result.job.name)} in {result.seconds:.2f}s"
+        if result.error:
+            line += f" — {escape(result.error)}"
+        console.print(line)
+
+    started = time.perf_counter()
+    results = asyncio.run(runner.run(on_result=report_progress))
+    elapsed = time.perf_counter() - started
+
+    table = Table(title="Batch Summary")
+    for column in ("Run", "Status", "Duration", "Tokens", "Tool calls", "Workspace"):
+        table.add_column(column)
+    for result in results:
+        totals = result.state.metrics()["totals"] if result.state is not None else {}
+        table.add_row(
+            escape(result.job.name),
+            result.status,
+            _format_seconds(result.seconds),
+            str(totals.get("total_tokens", "-")),
+            str(totals.get("tool_calls", "-")),
+            str(result.job.workspace),
+        )
+    console.print(table)
+    if runner.request_scheduler is not None:
+        console.print(f"Request scheduler: {runner.request_scheduler.summary()}")
+
+    failed = sum(result.status != "completed" for result in results)
+    report_path = report or output_dir / "batch-report.json"
+    write_metrics(
+        report_path,
+        {
+            "source": str(source),
+            "seconds": elapsed,
+            "max_concurrent_runs": runner.max_concurrency,
+            "completed": len(results) - failed,
+            "failed": failed,
+            "runs": [result.as_dict() for result in results],
+        },
+    )
+    console.print(f"{len(results) - failed}/{len(results)} runs completed in {elapsed:.2f}s")
+    console.print(f"Report written to {report_path}")
+    if failed:
+        raise typer.Exit(code=1)
+
+
+@app.command()
+def history(
+    target_path: Path = typer.Argument(..., help="Workspace directory whose run history to show"),
+    run_id: Optional[str] = typer.Option(None, "--run", help="Show stages and events for a single run"),
+    limit: int = typer.Option(20, help="Maximum number of runs or events to list", min=1),
+    stage: Optional[str] = typer.Option(None, help="Only show events from this stage"),
+    kind: Optional[str] = typer.Option(None, help="Only show events of this kind (log, stage, tool or event)"),
+) -> None:
+    """Show runs recorded in a workspace's run store."""
+
+    from datetime import datetime
+
+    from rich.table import Table
+
+    from .store import RunStore
+
+    console = _console()
+
+    store_path = target_path / STATE_DIR_NAME / RUN_STORE_NAME
+    if not store_path.exists():
+        console.print(f"No run history found at {store_path}")
+        raise typer.Exit(code=1)
+    store = RunStore(store_path)
+    try:
+        if run_id is None:
+            table = Table(title="Runs")
+            for column in ("Run", "Started", "Status", "Duration", "Events"):
+                table.add_column(column)
+            for row in store.runs(limit=limit):
+                duration = row["finished_at"] - row["started_at"] if row["finished_at"] else None
+                started = datetime.fromtimestamp(row["started_at"]).isoformat(timespec="seconds")
+                table.add_row(row["id"], started, row["status"], _format_seconds(duration), str(row["event_count"]))
+            console.print(table)
+            return
+
+        stages = Table(title=f"Stages for {run_id}")
+        for column in ("Stage", "Status", "Latency"):
+            stages.add_column(column)
+        for row in store.stages(run_id):
+            latency = (row["metrics"] or {}).get("latency")
+            stages.add_row(row["name"], row["status"], _format_seconds(latency))
+        console.print(stages)
+
+        events = Table(title="Events")
+        events.add_column("Stage")
+        events.add_column("Kind")
+        events.add_column("Event")
+        for row in store.events(run_id, stage=stage, kind=kind, limit=limit):
+            events.add_row(row["stage"] or "-", row["kind"], row["message"])
+        console.print(events)
+    finally:
+        store.close()
+
+
+@bench_app.command("pipeline")
+def bench_pipeline_command(
+    input_plan: Path = typer.Option(
+        Path("docs/agent_project_plan.json"),
+        "--input-plan",
+        help="Path to an agent project plan JSON file",
+    ),
+    iterations: int = typer.Option(5, help="Measured pipeline runs", min=1),
+    warmup: int = typer.Option(1, help="Unmeasured runs before measuring", min=0),
+    model_script: Optional[Path] = typer.Option(
+        None,
+        "--model-script",
+        help="Stub script or recorded session to replay (default: built-in script).",
+    ),
+    latency: float = typer.Option(0.0, help="Simulated model latency per call, in seconds", min=0.0),
+    stream: bool = typer.Option(False, "--stream/--no-stream", help="Benchmark the streaming path."),
+    snapshots: bool = typer.Option(True, "--snapshots/--no-snapshots", help="Snapshot before each stage."),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write results as JSON to this file."),
+) -> None:
+    """Measure orchestration overhead with a stub model and no network."""
+
+    import json
+
+    from rich.table import Table
+
+    from .bench import bench_pipeline
+    from .config import AgentRuntimeSettings
+    from .plan import AgentProjectPlan
+
+    console = _console()
+
+    results = bench_pipeline(
+        AgentProjectPlan.load(input_plan),
+        iterations=iterations,
+        warmup=warmup,
+        script=model_script,
+        latency=latency,
+        stream=stream,
+        settings=AgentRuntimeSettings(snapshots=snapshots),
+    )
+
+    table = Table(title=f"Pipeline overhead ({iterations} runs)")
+    for column in ("Measure", "Median", "Mean", "p95", "Max"):
+        table.add_column(column, justify="left" if column == "Measure" else "right")
+
+    def add(label: str, row: dict) -> None:
+        table.add_row(label, *(f"{row[key] * 1000:.2f}ms" for key in ("median", "mean", "p95", "max")))
+
+    add("pipeline wall", results["wall"])
+    add("simulated model", results["model"])
+    for name, row in results["stages"].items():
+        add(f"stage {name}", row)
+    for name, row in results["tools"].items():
+        add(f"tool {name} (per call)", row)
+    console.print(table)
+
+    if output is not None:
+        output.parent.mkdir(parents=True, exist_ok=True)
+        output.write_text(json.dumps(results, indent=2) + "\n", encoding="utf-8")
+        console.print(f"Results written to {output}")
+
+
+@bench_app.command("suite")
+def bench_suite_command(
+    patterns: Optional[list[str]] = typer.Argument(None, help="Only run benchmarks whose name contains one of these"),
+    quick: bool = typer.Option(False, "--quick", help="Skip the slowest cases and use a 64 MiB large file."),
+    repeat: Optional[int] = typer.Option(None, help="Override each case's number of measured iterations", min=1),
+    large_file_mb: Optional[int] = typer.Option(
+        None,
+        "--large-file-mb",
+        help="Size of the large read_file fixture (default 2048, or 64 with --quick).",
+        min=1,
+    ),
+    scratch: Optional[Path] = typer.Option(
+        None,
+        "--scratch",
+        help="Directory for fixtures; reusing one keeps the large file between runs.",
+    ),
+    output: Optional[Path] = typer.Option(
+        None,
+        "--output",
+        "-o",
+        help="Results JSON path (default: .benchmarks/<timestamp>-<commit>.json).",
+    ),
+) -> None:
+    """Time the filesystem tools, plan rendering and requirement summaries."""
+
+    import shutil
+    import tempfile
+
+    from rich.markup import escape
+
+    from .bench.harness import BenchContext, default_results_path, results_document, save_results
+    from .bench.suite import run_suite, select
+
+    console = _console()
+
+    cases = select(patterns or (), quick=quick)
+    if not cases:
+        console.print("No benchmarks match.")
+        raise typer.Exit(code=1)
+
+    size_mb = large_file_mb or (64 if quick else 2048)
+    scratch_dir = scratch or Path(tempfile.mkdtemp(prefix="ai-coding-agent-bench-"))
+    context = BenchContext(scratch=scratch_dir, quick=quick, large_file_bytes=size_mb * 1024 * 1024)
+
+    def report(case, samples, skipped) -> None:
+        if samples is None:
+            console.print(f"[yellow]skip[/yellow] {case.name}: {escape(skipped or '')}")
+            return
+        stats = samples.as_dict()
+        console.print(
+            f"{escape(f'{case.name:<40}')} median {stats['median'] * 1000:10.3f}ms  "
+            f"min {stats['min'] * 1000:10.3f}ms  ({stats['samples']} runs)",
+            highlight=False,
+        )
+
+    try:
+        results = run_suite(context, cases, repeat=repeat, on_result=report)
+    finally:
+        if scratch is None:
+            shutil.rmtree(scratch_dir, ignore_errors=True)
+
+    document = results_document(results, groups={case.name: case.group for case in cases})
+    path = save_results(document, output or default_results_path(document))
+    console.print(f"Results written to {path}")
+
+
+@bench_app.command("compare")
+def bench_compare_command(
+    baseline: Path = typer.Argument(..., help="Results JSON from the reference commit", exists=True),
+    current: Path = typer.Argument(..., help="Results JSON to compare against the baseline", exists=True),
+    threshold: float = typer.Option(0.10, help="Relative slowdown reported as a regression", min=0.0),
+    metric: str = typer.Option("median", help="Statistic to compare: min, median, mean or p95"),
+) -> None:
+    """Compare two benchmark result files and exit non-zero on regressions."""
+
+    import json
+
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .bench.harness import compare
+
+    console = _console()
+
+    rows = compare(
+        json.loads(baseline.read_text(encoding="utf-8")),
+        json.loads(current.read_text(encoding="utf-8")),
+        metric=metric,
+    )
+    table = Table(title=f"{metric}: {baseline.name} → {current.name}")
+    for column in ("Benchmark", "Baseline", "Current", "Change"):
+        table.add_column(column, justify="left" if column == "Benchmark" else "right")
+    regressions = 0
+    for row in rows:
+        if row["ratio"] is None:
+            table.add_row(escape(row["name"]), "-", "-", "n/a")
+            continue
+        change = row["ratio"] - 1.0
+        style = "red" if change > threshold else "green" if change < -threshold else ""
+        regressions += change > threshold
+        table.add_row(
+            escape(row["name"]),
+            f"{row['baseline'] * 1000:.3f}ms",
+            f"{row['current'] * 1000:.3f}ms",
+            f"[{style}]{change:+.1%}[/{style}]" if style else f"{change:+.1%}",
+        )
+    console.print(table)
+    if regressions:
+        console.print(f"{regressions} benchmark(s) regressed by more than {threshold:.0%}")
+        raise typer.Exit(code=1)
+
+
+@bench_app.command("import-time")
+def bench_import_time_command(
+    modules: Optional[list[str]] = typer.Argument(None, help="Modules to time (default: package and heavy deps)"),
+    repeat: int = typer.Option(5, help="Fresh interpreters per measurement", min=1),
+    output: Optional[Path] = typer.Option(None, "--output", "-o", help="Write results as JSON to this file."),
+) -> None:
+    """Measure CLI start-up and per-module import time in fresh interpreters."""
+
+    from rich.markup import escape
+    from rich.table import Table
+
+    from .bench.harness import results_document, save_results
+    from .bench.imports import DEFAULT_MODULES, measure_startup
+
+    console = _console()
+    results = measure_startup(modules or DEFAULT_MODULES, repeat=repeat)
+
+    table = Table(title=f"Start-up and import time ({repeat} runs)")
+    for column in ("Measure", "Median", "Min", "Max"):
+        table.add_column(column, justify="left" if column == "Measure" else "right")
+    for _, samples in results:
+        stats = samples.as_dict()
+        table.add_row(escape(samples.name), *(f"{stats[key] * 1000:.1f}ms" for key in ("median", "min", "max")))
+    console.print(table)
+
+    if output is not None:
+        document = results_document(
+            {samples.name: {**samples.as_dict(), "values": samples.values} for _, samples in results},
+            groups={samples.name: group for group, samples in results},
+        )
+        console.print(f"Results written to {save_results(document, output)}")
+
+
 if __name__ == "__main__":
     app()
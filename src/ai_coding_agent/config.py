@@ -7,6 +7,38 @@ from typing import Iterable, Optional
 
 from pydantic import BaseModel, Field
 
+from .constants import (
+    DEFAULT_CACHE_DIR,
+    FINGERPRINTS_FILE_NAME,
+    METRICS_FILE_NAME,
+    RUN_STORE_NAME,
+    STATE_DIR_NAME,
+    SUMMARY_CACHE_FILE_NAME,
+    CacheMode,
+    ModelBackend,
+    PromptJsonMode,
+    RequestPriority,
+    SnapshotLinkMode,
+)
+from .events import DEFAULT_EVENT_BUFFER
+from .handoff import DEFAULT_HANDOFF_TOKENS
+
+__all__ = [
+    "DEFAULT_CACHE_DIR",
+    "FINGERPRINTS_FILE_NAME",
+    "METRICS_FILE_NAME",
+    "RUN_STORE_NAME",
+    "STATE_DIR_NAME",
+    "SUMMARY_CACHE_FILE_NAME",
+    "AgentRuntimeSettings",
+    "CacheMode",
+    "ModelBackend",
+    "PromptJsonMode",
+    "RequestPriority",
+    "SnapshotLinkMode",
+    "WorkspaceConfig",
+]
+
 
 @dataclass(slots=True)
 class WorkspaceConfig:
@@ -28,12 +60,41 @@ class WorkspaceConfig:
 
 
 class AgentRuntimeSettings(BaseModel):
-    """Runtime knobs that can be serialized and stored in SQLite later."""
+    """Runtime knobs for a pipeline run; each run records them in the run store."""
 
     model: str = Field(default="gpt-5")
     max_turns: int = Field(default=8, ge=1, le=32)
     temperature: float | None = Field(default=None, ge=0.0, le=2.0)
     enable_web_search: bool = Field(default=False)
+    model_backend: ModelBackend = Field(default=ModelBackend.OPENAI)
+    model_script: Path | None = Field(default=None)
+    stub_latency_seconds: float = Field(default=0.0, ge=0.0)
+    max_parallel_stages: int = Field(default=3, ge=1, le=8)
+    cache_mode: CacheMode = Field(default=CacheMode.OFF)
+    cache_dir: Path = Field(default=DEFAULT_CACHE_DIR)
+    cache_ttl_seconds: float | None = Field(default=7 * 24 * 3600, gt=0)
+    cache_max_bytes: int | None = Field(default=512 * 1024 * 1024, gt=0)
+    snapshots: bool = Field(default=True)
+    snapshot_link_mode: SnapshotLinkMode = Field(default=SnapshotLinkMode.AUTO)
+    snapshot_retention: int = Field(default=10, ge=1)
+    run_store: bool = Field(default=True)
+    run_store_path: Path | None = Field(default=None)
+    metrics_path: Path | None = Field(default=None)
+    plan_prompt_json: PromptJsonMode = Field(default=PromptJsonMode.PRETTY)
+    plan_prompt_max_tokens: int | None = Field(default=None, gt=0)
+    request_scheduler: bool = Field(default=True)
+    requests_per_minute: int | None = Field(default=None, gt=0)
+    tokens_per_minute: int | None = Field(default=None, gt=0)
+    max_concurrent_requests: int = Field(default=16, ge=1)
+    min_concurrent_requests: int = Field(default=1, ge=1)
+    max_request_retries: int = Field(default=6, ge=0)
+    retry_base_delay: float = Field(default=0.5, gt=0)
+    retry_max_delay: float = Field(default=60.0, gt=0)
+    request_priority: RequestPriority = Field(default=RequestPriority.INTERACTIVE)
+    incremental: bool = Field(default=False)
+    fingerprints_path: Path | None = Field(default=None)
+    event_buffer_size: int = Field(default=DEFAULT_EVENT_BUFFER, ge=1)
+    handoff_max_tokens: int | None = Field(default=DEFAULT_HANDOFF_TOKENS, gt=0)
 
     class Config:
         extra = "allow"
@@ -0,0 +1,59 @@
+"""Enumerations and well-known names shared across the package.
+
+Kept free of third-party imports so the CLI can build its options without
+loading pydantic or the Agents SDK.
+"""
+from __future__ import annotations
+
+from enum import Enum
+from pathlib import Path
+
+
+class CacheMode(str, Enum):
+    """How the model response cache is consulted during a run."""
+
+    OFF = "off"
+    READ = "read"
+    READWRITE = "readwrite"
+
+
+class SnapshotLinkMode(str, Enum):
+    """How snapshot blobs are created from workspace files."""
+
+    AUTO = "auto"
+    REFLINK = "reflink"
+    HARDLINK = "hardlink"
+    COPY = "copy"
+
+
+class ModelBackend(str, Enum):
+    """Where model responses come from."""
+
+    OPENAI = "openai"
+    STUB = "stub"
+    RECORD = "record"
+    REPLAY = "replay"
+
+
+class PromptJsonMode(str, Enum):
+    """How the full requirements JSON is embedded in the plan prompt block."""
+
+    PRETTY = "pretty"
+    MINIFIED = "minified"
+    NONE = "none"
+
+
+class RequestPriority(str, Enum):
+    """Lane a run's model requests wait in; interactive requests are served first."""
+
+    INTERACTIVE = "interactive"
+    BATCH = "batch"
+
+
+DEFAULT_CACHE_DIR = Path("~/.cache/ai_coding_agent/responses")
+STATE_DIR_NAME = ".ai_coding_agent"
+"""Directory inside each workspace that holds agent bookkeeping."""
+RUN_STORE_NAME = "runs.sqlite3"
+METRICS_FILE_NAME = "metrics.json"
+FINGERPRINTS_FILE_NAME = "fingerprints.json"
+SUMMARY_CACHE_FILE_NAME = "requirements-summaries.json"
@@ -1,14 +1,35 @@
 """Shared context used across agent runs."""
 from __future__ import annotations
 
+import time
+from contextvars import ContextVar
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Any
-
-from agents.run_context import RunContextWrapper
+from typing import TYPE_CHECKING, Any, Callable, Iterable
 
+from .events import EventLog, EventRecord
+from .handoff import HandoffCompactor
+from .metrics import StageMetrics, summarize
 from .plan import AgentProjectPlan
 
+if TYPE_CHECKING:
+    from agents.run_context import RunContextWrapper
+
+    from .store import RunStore
+    from .tools.search_index import WorkspaceIndex
+
+current_stage: ContextVar[str | None] = ContextVar("current_stage", default=None)
+"""Name of the pipeline stage executing in the current task, if any."""
+
+
+@dataclass(slots=True)
+class StageIO:
+    """Workspace paths and artifact names touched by one stage, for incremental runs."""
+
+    reads: set[str] = field(default_factory=set)
+    writes: set[str] = field(default_factory=set)
+    artifacts: set[str] = field(default_factory=set)
+
 
 @dataclass
 class AgentRunState:
@@ -16,14 +37,79 @@ class AgentRunState:
 
     workspace: Path
     plan: AgentProjectPlan
-    events: list[str] = field(default_factory=list)
+    events: EventLog = field(default_factory=EventLog)
     artifacts: dict[str, Any] = field(default_factory=dict)
+    stage_metrics: dict[str, StageMetrics] = field(default_factory=dict)
+    listeners: list[Callable[[str], None]] = field(default_factory=list, repr=False)
+    store: RunStore | None = field(default=None, repr=False)
+    run_id: str | None = None
+    search_index: WorkspaceIndex | None = field(default=None, repr=False)
+    stage_io: dict[str, StageIO] = field(default_factory=dict, repr=False)
+    handoff: HandoffCompactor | None = field(default=None, repr=False)
 
-    def log(self, message: str) -> None:
-        self.events.append(message)
+    def log(self, message: str, *, kind: str = "log", payload: dict[str, Any] | None = None) -> None:
+        record = EventRecord(time.time(), current_stage.get(), kind, message, payload)
+        self.events.append(record)
+        if self.store is not None and self.run_id is not None:
+            self.store.record_event(
+                self.run_id,
+                record.stage,
+                message,
+                kind=kind,
+                payload=payload,
+                created_at=record.timestamp,
+            )
+        for listener in self.listeners:
+            listener(message)
 
     def add_artifact(self, name: str, payload: Any) -> None:
         self.artifacts[name] = payload
+        io = self._stage_io()
+        if io is not None:
+            io.artifacts.add(name)
+        if self.store is not None and self.run_id is not None:
+            self.store.record_artifact(self.run_id, name, payload)
+
+    def _stage_io(self) -> StageIO | None:
+        stage = current_stage.get()
+        if stage is None:
+            return None
+        return self.stage_io.setdefault(stage, StageIO())
+
+    def relative_path(self, path: Path | str) -> str | None:
+        """Return ``path`` relative to the workspace as a POSIX string, or ``None`` if it lies outside."""
+
+        candidate = Path(path).absolute()
+        for root in (self.workspace.absolute(), self.workspace.resolve()):
+            try:
+                return candidate.relative_to(root).as_posix()
+            except ValueError:
+                continue
+        return None
+
+    def record_reads(self, paths: Iterable[Path | str]) -> None:
+        """Note files under the workspace the current stage read, as inputs for incremental runs."""
+
+        io = self._stage_io()
+        if io is not None:
+            io.reads.update(relative for relative in map(self.relative_path, paths) if relative is not None)
+
+    def record_writes(self, paths: Iterable[Path | str]) -> None:
+        """Note workspace files the current stage produced."""
+
+        io = self._stage_io()
+        if io is not None:
+            io.writes.update(relative for relative in map(self.relative_path, paths) if relative is not None)
+
+    def metrics(self) -> dict[str, Any]:
+        """Return per-stage and total usage, timing and tool metrics."""
+
+        return summarize(self.stage_metrics.values())
+
+    def subscribe(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener`` with every message passed to :meth:`log`."""
+
+        self.listeners.append(listener)
 
 
 def unwrap_context(wrapper: RunContextWrapper[AgentRunState]) -> AgentRunState:
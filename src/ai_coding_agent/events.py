@@ -0,0 +1,298 @@
+"""Structured run events kept in a bounded ring buffer that spills to disk."""
+from __future__ import annotations
+
+import itertools
+import json
+import queue
+import threading
+from collections import deque
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Iterable, Iterator, Protocol
+
+if TYPE_CHECKING:
+    from .store import RunStore
+
+DEFAULT_EVENT_BUFFER = 1000
+"""Events kept in memory per run before older ones are handed to the sink."""
+
+_STOP = object()
+
+
+class EventRecord:
+    """One entry of the run log.
+
+    ``kind`` groups records (``log``, ``stage``, ``tool``, ``event``) and
+    ``payload`` carries the structured fields the human-readable ``message``
+    was built from.
+    """
+
+    __slots__ = ("timestamp", "stage", "kind", "message", "payload")
+
+    def __init__(
+        self,
+        timestamp: float,
+        stage: str | None,
+        kind: str,
+        message: str,
+        payload: dict[str, Any] | None = None,
+    ) -> None:
+        self.timestamp = timestamp
+        self.stage = stage
+        self.kind = kind
+        self.message = message
+        self.payload = payload
+
+    def __str__(self) -> str:
+        return self.message
+
+    def __repr__(self) -> str:
+        return f"EventRecord(stage={self.stage!r}, kind={self.kind!r}, message={self.message!r})"
+
+    def matches(
+        self,
+        *,
+        stage: str | None = None,
+        kind: str | None = None,
+        contains: str | None = None,
+        since: float | None = None,
+    ) -> bool:
+        return (
+            (stage is None or self.stage == stage)
+            and (kind is None or self.kind == kind)
+            and (not contains or contains in self.message)
+            and (since is None or self.timestamp >= since)
+        )
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "timestamp": self.timestamp,
+            "stage": self.stage,
+            "kind": self.kind,
+            "message": self.message,
+            "payload": self.payload,
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> EventRecord:
+        return cls(data["timestamp"], data.get("stage"), data.get("kind", "log"), data["message"], data.get("payload"))
+
+
+class EventSink(Protocol):
+    """Durable home for events evicted from an :class:`EventLog`.
+
+    ``complete`` sinks already hold every event, including those still in
+    memory, so queries read them alone instead of merging.
+    """
+
+    complete: bool
+
+    def write(self, records: Iterable[EventRecord]) -> None: ...
+
+    def read(
+        self,
+        *,
+        stage: str | None = None,
+        kind: str | None = None,
+        contains: str | None = None,
+        since: float | None = None,
+    ) -> Iterator[EventRecord]: ...
+
+    def close(self) -> None: ...
+
+
+class JsonlEventSink:
+    """Appends evicted events to a JSON Lines file from a background thread.
+
+    :meth:`write` only queues records, so logging on the event loop never
+    waits for encoding or disk I/O. The writer thread starts with the first
+    spilled record and joins each batch into a single ``write()``;
+    :meth:`read` waits for everything queued so far to reach the file.
+    """
+
+    complete = False
+
+    def __init__(self, path: Path) -> None:
+        self.path = path.expanduser()
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._thread: threading.Thread | None = None
+        self._error: OSError | None = None
+        self._lock = threading.Lock()
+
+    def write(self, records: Iterable[EventRecord]) -> None:
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._write_loop, name="event-sink-writer", daemon=True)
+                self._thread.start()
+        for record in records:
+            self._queue.put(record)
+
+    def _write_loop(self) -> None:
+        handle: Any = None
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                lines: list[str] = []
+                waiters: list[threading.Event] = []
+                for item in batch:
+                    if item is _STOP:
+                        stopping = True
+                    elif isinstance(item, threading.Event):
+                        waiters.append(item)
+                    else:
+                        lines.append(json.dumps(item.as_dict(), separators=(",", ":"), default=str) + "\n")
+                if lines and self._error is None:
+                    try:
+                        if handle is None:
+                            self.path.parent.mkdir(parents=True, exist_ok=True)
+                            handle = open(self.path, "a", encoding="utf-8")
+                        handle.write("".join(lines))
+                        handle.flush()
+                    except OSError as exc:
+                        self._error = exc
+                for done in waiters:
+                    done.set()
+        finally:
+            if handle is not None:
+                handle.close()
+
+    def flush(self) -> None:
+        """Block until every record queued so far has been written."""
+
+        with self._lock:
+            thread = self._thread
+        if thread is not None and thread.is_alive():
+            done = threading.Event()
+            self._queue.put(done)
+            done.wait()
+        if self._error is not None:
+            raise self._error
+
+    def read(self, **filters: Any) -> Iterator[EventRecord]:
+        self.flush()
+        try:
+            handle = open(self.path, encoding="utf-8")
+        except FileNotFoundError:
+            return
+        with handle:
+            for line in handle:
+                record = EventRecord.from_dict(json.loads(line))
+                if record.matches(**filters):
+                    yield record
+
+    def close(self) -> None:
+        with self._lock:
+            thread, self._thread = self._thread, None
+        if thread is not None and thread.is_alive():
+            self._queue.put(_STOP)
+            thread.join()
+
+
+class RunStoreEventSink:
+    """Reads evicted events back from the run store.
+
+    :meth:`AgentRunState.log` already records every event in the store as it
+    happens, so eviction has nothing left to write.
+    """
+
+    complete = True
+
+    def __init__(self, store: RunStore, run_id: str) -> None:
+        self.store = store
+        self.run_id = run_id
+
+    def write(self, records: Iterable[EventRecord]) -> None:
+        return None
+
+    def read(self, **filters: Any) -> Iterator[EventRecord]:
+        self.store.flush()
+        after_id = 0
+        while True:
+            rows = self.store.events(self.run_id, after_id=after_id, limit=1000, **filters)
+            for row in rows:
+                yield EventRecord(row["created_at"], row["stage"], row["kind"], row["message"], row["payload"])
+            if len(rows) < 1000:
+                return
+            after_id = rows[-1]["id"]
+
+    def close(self) -> None:
+        return None
+
+
+class EventLog:
+    """Bounded, thread-safe event buffer.
+
+    The newest ``capacity`` records stay in memory. Older ones are passed to
+    ``sink`` (or dropped when there is none), and :meth:`query` searches both
+    so callers see the whole run.
+    """
+
+    def __init__(self, capacity: int = DEFAULT_EVENT_BUFFER, sink: EventSink | None = None) -> None:
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1.")
+        self.capacity = capacity
+        self.sink = sink
+        self.spilled = 0
+        self.dropped = 0
+        self._records: deque[EventRecord] = deque()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def __iter__(self) -> Iterator[EventRecord]:
+        with self._lock:
+            return iter(list(self._records))
+
+    def append(self, record: EventRecord) -> None:
+        with self._lock:
+            self._records.append(record)
+            if len(self._records) <= self.capacity:
+                return
+            evicted = self._records.popleft()
+            if self.sink is None:
+                self.dropped += 1
+                return
+            self.sink.write((evicted,))
+            self.spilled += 1
+
+    @property
+    def total(self) -> int:
+        """Number of records ever appended, including spilled and dropped ones."""
+
+        return len(self._records) + self.spilled + self.dropped
+
+    def query(
+        self,
+        *,
+        stage: str | None = None,
+        kind: str | None = None,
+        contains: str | None = None,
+        since: float | None = None,
+        limit: int | None = None,
+    ) -> list[EventRecord]:
+        """Return matching records oldest first; ``limit`` keeps only the newest matches."""
+
+        filters = {"stage": stage, "kind": kind, "contains": contains, "since": since}
+        matches: deque[EventRecord] = deque(maxlen=limit)
+        if self.spilled and self.sink is not None and self.sink.complete:
+            matches.extend(self.sink.read(**filters))
+            return list(matches)
+        with self._lock:
+            recent = [record for record in self._records if record.matches(**filters)]
+            spilled = self.spilled
+        if spilled and self.sink is not None:
+            # Records evicted after the snapshot above are also in ``recent``; read only the earlier ones.
+            evicted = itertools.islice(self.sink.read(), spilled)
+            matches.extend(record for record in evicted if record.matches(**filters))
+        matches.extend(recent)
+        return list(matches)
+
+    def close(self) -> None:
+        if self.sink is not None:
+            self.sink.close()
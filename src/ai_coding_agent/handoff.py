@@ -0,0 +1,195 @@
+"""Compact summaries of upstream work handed to the stages that depend on it."""
+from __future__ import annotations
+
+import json
+import re
+import threading
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterable, Sequence
+
+from .events import EventRecord
+from .plan import estimate_tokens
+
+DEFAULT_HANDOFF_TOKENS = 2000
+"""Default token budget of a handoff packet."""
+
+MAX_OUTLINE_ENTRIES = 40
+_MAX_ENTRY_CHARS = 120
+_MAX_EVENT_CHARS = 240
+
+_CODE_OUTLINE = re.compile(
+    r"^\s*(?:export\s+)?(?:pub\s+)?(?:async\s+)?"
+    r"(?:def|class|function|interface|type|struct|enum|trait|impl|fn|func)\s+\w+"
+)
+_HEADING = re.compile(r"^#{1,6}\s+\S")
+_TOP_LEVEL_KEY = re.compile(r"^(?:\[[^\]]+\]|[\"']?[\w.-]+[\"']?\s*[:=])")
+_DOCUMENT_SUFFIXES = frozenset({".md", ".markdown", ".rst", ".txt"})
+_CONFIG_SUFFIXES = frozenset({".toml", ".yaml", ".yml", ".ini", ".cfg", ".env"})
+
+
+def outline(path: str, text: str, *, max_entries: int = MAX_OUTLINE_ENTRIES) -> tuple[str, ...]:
+    """Return the structural lines of ``text``: definitions, headings or top-level keys.
+
+    Files without recognisable structure are represented by their first
+    non-empty line.
+    """
+
+    suffix = Path(path).suffix.lower()
+    if suffix == ".json":
+        try:
+            data = json.loads(text)
+        except ValueError:
+            data = None
+        if isinstance(data, dict):
+            return tuple(str(key) for key in list(data)[:max_entries])
+    if suffix in _DOCUMENT_SUFFIXES:
+        pattern = _HEADING
+    elif suffix in _CONFIG_SUFFIXES:
+        pattern = _TOP_LEVEL_KEY
+    else:
+        pattern = _CODE_OUTLINE
+
+    entries: list[str] = []
+    first_line = None
+    for line in text.splitlines():
+        if first_line is None and line.strip():
+            first_line = line.strip()
+        if pattern.match(line):
+            entries.append(_clip(line.rstrip().rstrip(":{").rstrip(), _MAX_ENTRY_CHARS))
+            if len(entries) >= max_entries:
+                break
+    if not entries and first_line is not None:
+        entries.append(_clip(first_line, _MAX_ENTRY_CHARS))
+    return tuple(entries)
+
+
+def _clip(text: str, limit: int) -> str:
+    return text if len(text) <= limit else text[: limit - 3].rstrip() + "..."
+
+
+@dataclass(slots=True)
+class FileOutline:
+    """Latest known shape of a file written during the run."""
+
+    path: str
+    stage: str | None
+    size: int
+    lines: int
+    entries: tuple[str, ...]
+
+
+class HandoffCompactor:
+    """Tracks files written by each stage and renders token-budgeted handoff packets.
+
+    Outlines are computed once, from the bytes ``write_many`` already holds,
+    so building a packet never re-reads the workspace.
+    """
+
+    def __init__(self) -> None:
+        self._files: dict[str, FileOutline] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def record(self, stage: str | None, path: str, data: bytes, *, encoding: str = "utf-8") -> None:
+        text = data.decode(encoding, errors="replace")
+        entry = FileOutline(
+            path=path,
+            stage=stage,
+            size=len(data),
+            lines=text.count("\n") + (1 if text and not text.endswith("\n") else 0),
+            entries=outline(path, text),
+        )
+        with self._lock:
+            # Re-inserting keeps the most recently written files last.
+            self._files.pop(path, None)
+            self._files[path] = entry
+
+    def record_files(self, stage: str | None, workspace: Path, paths: Iterable[str]) -> None:
+        """Record workspace files from disk, for stages whose writes were not observed this run."""
+
+        for path in paths:
+            try:
+                data = (workspace / path).read_bytes()
+            except OSError:
+                continue
+            self.record(stage, path, data)
+
+    def files(self, stages: Sequence[str] | None = None) -> list[FileOutline]:
+        with self._lock:
+            entries = list(self._files.values())
+        if stages is None:
+            return entries
+        return [entry for entry in entries if entry.stage in stages]
+
+    def packet(
+        self,
+        stages: Sequence[str],
+        *,
+        events: Iterable[EventRecord] = (),
+        max_tokens: int = DEFAULT_HANDOFF_TOKENS,
+    ) -> str:
+        """Render what ``stages`` produced within ``max_tokens``.
+
+        The changed-file list comes first, then the events the stages
+        recorded, newest first, then per-file outlines. The list may use half
+        the budget and the events a further quarter, so a long list never
+        crowds out the outlines. Returns an empty string when the stages
+        produced nothing.
+        """
+
+        files = self.files(stages)
+        events = [event for event in events if event.stage in stages]
+        if not files and not events:
+            return ""
+
+        budget = _Budget(max_tokens)
+        budget.add(f"## Handoff from {', '.join(stages)}")
+        budget.add("Use this summary before reading files; read_file only what you need to change.")
+        if files:
+            budget.add("")
+            budget.add(f"### Changed files ({len(files)})")
+            listed = 0
+            for entry in files:
+                line = f"- {entry.path} ({entry.lines} lines, {entry.size} bytes, {entry.stage})"
+                if not budget.add(line, reserve=max_tokens // 2):
+                    break
+                listed += 1
+            if listed < len(files):
+                budget.force(f"- ... and {len(files) - listed} more")
+        if events and budget.add("") and budget.add("### Key events"):
+            for event in reversed(events):
+                if not budget.add(f"- {_clip(event.message, _MAX_EVENT_CHARS)}", reserve=max_tokens // 4):
+                    break
+        outlined = [entry for entry in files if entry.entries]
+        if outlined and budget.add("") and budget.add("### Outlines"):
+            for index, entry in enumerate(outlined):
+                block = [f"{entry.path}:", *(f"  {line}" for line in entry.entries)]
+                if not budget.add("\n".join(block)):
+                    budget.force(f"({len(outlined) - index} more outlines omitted)")
+                    break
+        return budget.text()
+
+
+class _Budget:
+    def __init__(self, max_tokens: int) -> None:
+        self.remaining = max_tokens
+        self.lines: list[str] = []
+
+    def add(self, line: str, *, reserve: int = 0) -> bool:
+        """Append ``line`` if it fits while leaving ``reserve`` tokens for later sections."""
+
+        cost = estimate_tokens(line + "\n")
+        if cost > self.remaining - reserve:
+            return False
+        self.force(line)
+        return True
+
+    def force(self, line: str) -> None:
+        self.remaining -= estimate_tokens(line + "\n")
+        self.lines.append(line)
+
+    def text(self) -> str:
+        return "\n".join(self.lines).strip() + "\n"
@@ -0,0 +1,130 @@
+"""Per-stage input fingerprints that let incremental runs skip up-to-date stages."""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+FINGERPRINTS_VERSION = 1
+_CHUNK_SIZE = 1024 * 1024
+
+
+def digest_value(value: Any) -> str:
+    """Return a SHA-256 digest of ``value`` serialized as canonical JSON."""
+
+    encoded = json.dumps(value, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+def file_digest(path: Path) -> str | None:
+    """Return the SHA-256 of ``path``'s content, or ``None`` if it is not a readable file."""
+
+    digest = hashlib.sha256()
+    try:
+        with open(path, "rb") as handle:
+            while chunk := handle.read(_CHUNK_SIZE):
+                digest.update(chunk)
+    except (FileNotFoundError, IsADirectoryError, NotADirectoryError, PermissionError):
+        return None
+    return digest.hexdigest()
+
+
+@dataclass(slots=True)
+class StageRecord:
+    """What a stage consumed and produced the last time it completed.
+
+    ``fingerprint`` covers the inputs known before the stage starts (its
+    prompt, relevant plan sections and upstream artifacts). ``reads`` and
+    ``outputs`` map workspace paths discovered while it ran to their content
+    digests, so edits to those files also make the stage stale.
+    """
+
+    fingerprint: str
+    reads: dict[str, str | None] = field(default_factory=dict)
+    outputs: dict[str, str | None] = field(default_factory=dict)
+    artifacts: dict[str, Any] = field(default_factory=dict)
+    completed_at: float = field(default_factory=time.time)
+
+    @classmethod
+    def capture(
+        cls,
+        workspace: Path,
+        fingerprint: str,
+        *,
+        reads: Iterable[str],
+        outputs: Iterable[str],
+        artifacts: dict[str, Any],
+    ) -> StageRecord:
+        outputs = sorted(set(outputs))
+        # Files a stage wrote are outputs, even if it also read them back.
+        reads = sorted(set(reads) - set(outputs))
+        return cls(
+            fingerprint=fingerprint,
+            reads={path: file_digest(workspace / path) for path in reads},
+            outputs={path: file_digest(workspace / path) for path in outputs},
+            artifacts=artifacts,
+        )
+
+    def stale_reason(self, workspace: Path, fingerprint: str) -> str | None:
+        """Return why the stage must run again, or ``None`` if it is up to date."""
+
+        if fingerprint != self.fingerprint:
+            return "inputs changed"
+        for path, digest in self.reads.items():
+            if file_digest(workspace / path) != digest:
+                return f"{path} changed since it was read"
+        for path, digest in self.outputs.items():
+            if file_digest(workspace / path) != digest:
+                return f"output {path} is missing or was modified"
+        return None
+
+
+class FingerprintStore:
+    """JSON file holding the latest :class:`StageRecord` of every stage.
+
+    The file is rewritten atomically after each change, so a run that is
+    interrupted keeps the records of the stages that already completed.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path.expanduser()
+        self._lock = threading.Lock()
+        self._records: dict[str, StageRecord] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == FINGERPRINTS_VERSION:
+            for stage, record in data.get("stages", {}).items():
+                try:
+                    self._records[stage] = StageRecord(**record)
+                except TypeError:
+                    continue
+
+    def get(self, stage: str) -> StageRecord | None:
+        return self._records.get(stage)
+
+    def put(self, stage: str, record: StageRecord) -> None:
+        with self._lock:
+            self._records[stage] = record
+            self._save()
+
+    def discard(self, stage: str) -> None:
+        with self._lock:
+            if self._records.pop(stage, None) is not None:
+                self._save()
+
+    def _save(self) -> None:
+        payload = {
+            "version": FINGERPRINTS_VERSION,
+            "stages": {stage: asdict(record) for stage, record in sorted(self._records.items())},
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_name(f".{self.path.name}.tmp")
+        tmp.write_text(json.dumps(payload, indent=2, default=str) + "\n", encoding="utf-8")
+        os.replace(tmp, self.path)
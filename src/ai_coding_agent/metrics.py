@@ -0,0 +1,149 @@
+"""Timing and usage metrics collected while the pipeline runs."""
+from __future__ import annotations
+
+import json
+import os
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterable
+
+
+@dataclass(slots=True)
+class ToolMetrics:
+    """Invocation count and cumulative run time of one tool within a stage."""
+
+    name: str
+    calls: int = 0
+    completed: int = 0
+    seconds: float = 0.0
+
+    def as_dict(self) -> dict[str, Any]:
+        return {"calls": self.calls, "completed": self.completed, "seconds": round(self.seconds, 6)}
+
+
+@dataclass(slots=True)
+class StageMetrics:
+    """Wall-clock, model usage and tool measurements for a single pipeline stage.
+
+    Timestamps come from :func:`time.perf_counter`; ``first_token_at`` is only
+    populated when the stage runs through the streaming path. Usage counters
+    accumulate per model response, so a failed stage still reports the work
+    it did before failing. ``skipped`` marks a stage an incremental run found
+    up to date and did not execute.
+    """
+
+    stage: str
+    started_at: float = field(default_factory=time.perf_counter)
+    finished_at: float | None = None
+    first_token_at: float | None = None
+    turns: int = 0
+    requests: int = 0
+    input_tokens: int = 0
+    cached_input_tokens: int = 0
+    output_tokens: int = 0
+    reasoning_tokens: int = 0
+    tools: dict[str, ToolMetrics] = field(default_factory=dict)
+    skipped: bool = False
+
+    def record_usage(self, usage: Any) -> None:
+        """Add one model response's :class:`agents.usage.Usage` to the totals."""
+
+        self.turns += 1
+        self.requests += usage.requests
+        self.input_tokens += usage.input_tokens
+        self.output_tokens += usage.output_tokens
+        self.cached_input_tokens += getattr(usage.input_tokens_details, "cached_tokens", 0) or 0
+        self.reasoning_tokens += getattr(usage.output_tokens_details, "reasoning_tokens", 0) or 0
+
+    def tool_started(self, name: str) -> None:
+        self.tools.setdefault(name, ToolMetrics(name)).calls += 1
+
+    def tool_finished(self, name: str, seconds: float) -> None:
+        tool = self.tools.setdefault(name, ToolMetrics(name))
+        tool.completed += 1
+        tool.seconds += seconds
+
+    @property
+    def total_tokens(self) -> int:
+        return self.input_tokens + self.output_tokens
+
+    @property
+    def tool_calls(self) -> int:
+        return sum(tool.calls for tool in self.tools.values())
+
+    def mark_first_token(self) -> None:
+        if self.first_token_at is None:
+            self.first_token_at = time.perf_counter()
+
+    def finish(self) -> None:
+        self.finished_at = time.perf_counter()
+
+    @property
+    def latency(self) -> float | None:
+        if self.finished_at is None:
+            return None
+        return self.finished_at - self.started_at
+
+    @property
+    def time_to_first_token(self) -> float | None:
+        if self.first_token_at is None:
+            return None
+        return self.first_token_at - self.started_at
+
+    def as_dict(self) -> dict[str, Any]:
+        return {
+            "stage": self.stage,
+            "skipped": self.skipped,
+            "latency": self.latency,
+            "time_to_first_token": self.time_to_first_token,
+            "turns": self.turns,
+            "requests": self.requests,
+            "input_tokens": self.input_tokens,
+            "cached_input_tokens": self.cached_input_tokens,
+            "output_tokens": self.output_tokens,
+            "reasoning_tokens": self.reasoning_tokens,
+            "total_tokens": self.total_tokens,
+            "tool_calls": self.tool_calls,
+            "tools": {name: tool.as_dict() for name, tool in sorted(self.tools.items())},
+        }
+
+
+_TOTALS = (
+    "turns",
+    "requests",
+    "input_tokens",
+    "cached_input_tokens",
+    "output_tokens",
+    "reasoning_tokens",
+    "total_tokens",
+    "tool_calls",
+)
+
+
+def summarize(stages: Iterable[StageMetrics]) -> dict[str, Any]:
+    """Return per-stage metrics plus run-wide totals as a JSON-ready dict."""
+
+    rows = [metrics.as_dict() for metrics in stages]
+    totals: dict[str, Any] = {key: sum(row[key] for row in rows) for key in _TOTALS}
+    totals["stage_seconds"] = sum(row["latency"] or 0.0 for row in rows)
+    totals["skipped_stages"] = sum(row["skipped"] for row in rows)
+    tools: dict[str, dict[str, Any]] = {}
+    for row in rows:
+        for name, tool in row["tools"].items():
+            merged = tools.setdefault(name, {"calls": 0, "completed": 0, "seconds": 0.0})
+            merged["calls"] += tool["calls"]
+            merged["completed"] += tool["completed"]
+            merged["seconds"] += tool["seconds"]
+    totals["tools"] = dict(sorted(tools.items()))
+    return {"stages": rows, "totals": totals}
+
+
+def write_metrics(path: Path, payload: dict[str, Any]) -> Path:
+    """Atomically write ``payload`` as indented JSON to ``path``."""
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f".{path.name}.tmp")
+    tmp.write_text(json.dumps(payload, indent=2, default=str) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+    return path
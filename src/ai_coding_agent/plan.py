@@ -1,11 +1,62 @@
 """Utilities for parsing agent project plans."""
 from __future__ import annotations
 
+import hashlib
 import json
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any
 
+from .constants import PromptJsonMode
+
+PROMPT_CACHE_SIZE = 32
+"""Number of rendered prompt blocks kept by :meth:`AgentProjectPlan.to_prompt_block`."""
+
+_PROMPT_CACHE: dict[tuple[str, int | None, PromptJsonMode], str] = {}
+
+_SECTIONS = (
+    ("Goals", "goals"),
+    ("Assumptions", "assumptions"),
+    ("Scope", "scope"),
+    ("User Stories", "user_stories"),
+    ("Flows", "flows"),
+    ("Risks", "risks"),
+    ("Open Questions", "open_questions"),
+    ("Project Details", "project"),
+    ("Specifications", "specifications"),
+    ("File Structure", "file_structure"),
+    ("Dependencies", "dependencies"),
+    ("Configuration", "configuration"),
+    ("Execution Flow", "execution_flow"),
+    ("Output Examples", "output_example"),
+)
+
+_DROP_ORDER = (
+    "Output Examples",
+    "Execution Flow",
+    "Flows",
+    "Configuration",
+    "Open Questions",
+    "Risks",
+    "Assumptions",
+    "Dependencies",
+    "File Structure",
+    "User Stories",
+    "Project Details",
+    "Scope",
+    "Specifications",
+    "Goals",
+)
+"""Sections removed, in order, when a prompt block exceeds its token budget."""
+
+_JSON_LADDER = (PromptJsonMode.PRETTY, PromptJsonMode.MINIFIED, PromptJsonMode.NONE)
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token)."""
+
+    return (len(text) + 3) // 4
+
 
 @dataclass(slots=True)
 class AgentProjectPlan:
@@ -78,44 +129,88 @@ class AgentProjectPlan:
         lines.append("")
         return lines
 
-    def to_prompt_block(self) -> str:
-        """Return a formatted text summary for agent hand-offs."""
+    def content_hash(self) -> str:
+        """Return a digest of the requirements, sensitive to key order."""
 
-        lines = ["# Project Requirements", ""]
+        return hashlib.sha256(json.dumps(self.requirements, separators=(",", ":")).encode("utf-8")).hexdigest()
+
+    def _render_sections(self) -> list[tuple[str, list[str]]]:
         overview = self.requirements.get("overview")
-        if overview:
-            lines.extend(["## Overview", overview.strip(), ""])
+        sections = [("Overview", ["## Overview", overview.strip() if overview else "_None provided._", ""])]
+        for title, key in _SECTIONS:
+            sections.append((title, self._format_section(title, self.requirements.get(key))))
+        return sections
+
+    def _json_lines(self, mode: PromptJsonMode) -> list[str]:
+        if mode == PromptJsonMode.NONE:
+            return []
+        if mode == PromptJsonMode.MINIFIED:
+            payload = json.dumps(self.requirements, separators=(",", ":"))
         else:
-            lines.extend(["## Overview", "_None provided._", ""])
-
-        ordered_sections = [
-            ("Goals", self.requirements.get("goals")),
-            ("Assumptions", self.requirements.get("assumptions")),
-            ("Scope", self.requirements.get("scope")),
-            ("User Stories", self.requirements.get("user_stories")),
-            ("Flows", self.requirements.get("flows")),
-            ("Risks", self.requirements.get("risks")),
-            ("Open Questions", self.requirements.get("open_questions")),
-            ("Project Details", self.requirements.get("project")),
-            ("Specifications", self.requirements.get("specifications")),
-            ("File Structure", self.requirements.get("file_structure")),
-            ("Dependencies", self.requirements.get("dependencies")),
-            ("Configuration", self.requirements.get("configuration")),
-            ("Execution Flow", self.requirements.get("execution_flow")),
-            ("Output Examples", self.requirements.get("output_example")),
-        ]
-
-        for title, value in ordered_sections:
-            lines.extend(self._format_section(title, value))
-
-        lines.append("## Full Requirements JSON")
-        lines.append("```json")
-        lines.append(json.dumps(self.requirements, indent=2))
-        lines.append("```")
-        lines.append("")
+            payload = json.dumps(self.requirements, indent=2)
+        return ["## Full Requirements JSON", "```json", payload, "```", ""]
 
+    def _assemble(
+        self,
+        sections: list[tuple[str, list[str]]],
+        json_lines: list[str],
+        omitted: list[str] | None = None,
+    ) -> str:
+        lines = ["# Project Requirements", ""]
+        for _, section in sections:
+            lines.extend(section)
+        if omitted:
+            lines.extend([f"_Omitted to fit the prompt budget: {', '.join(omitted)}._", ""])
+        lines.extend(json_lines)
         return "\n".join(lines).strip() + "\n"
 
+    def _render(self, max_tokens: int | None, json_mode: PromptJsonMode) -> str:
+        sections = self._render_sections()
+        if max_tokens is None:
+            return self._assemble(sections, self._json_lines(json_mode))
+
+        # Compact the embedded JSON first, then drop the least important
+        # sections, and only truncate when even the overview does not fit.
+        text = ""
+        for mode in _JSON_LADDER[_JSON_LADDER.index(json_mode) :]:
+            text = self._assemble(sections, self._json_lines(mode))
+            if estimate_tokens(text) <= max_tokens:
+                return text
+
+        kept = dict(sections)
+        omitted: list[str] = []
+        for title in _DROP_ORDER:
+            del kept[title]
+            omitted.append(title)
+            text = self._assemble(list(kept.items()), [], omitted)
+            if estimate_tokens(text) <= max_tokens:
+                return text
+
+        marker = "\n\n_Truncated to fit the prompt budget._\n"
+        return text[: max(max_tokens * 4 - len(marker), 0)].rstrip() + marker
+
+    def to_prompt_block(
+        self,
+        *,
+        max_tokens: int | None = None,
+        json_mode: PromptJsonMode = PromptJsonMode.PRETTY,
+    ) -> str:
+        """Return a formatted text summary for agent hand-offs.
+
+        Rendered blocks are memoized per requirements content hash. With
+        ``max_tokens`` set, the embedded JSON is minified or dropped and
+        low-priority sections are omitted until the block fits the budget.
+        """
+
+        key = (self.content_hash(), max_tokens, PromptJsonMode(json_mode))
+        block = _PROMPT_CACHE.get(key)
+        if block is None:
+            block = self._render(max_tokens, key[2])
+            if len(_PROMPT_CACHE) >= PROMPT_CACHE_SIZE:
+                _PROMPT_CACHE.pop(next(iter(_PROMPT_CACHE)), None)
+            _PROMPT_CACHE[key] = block
+        return block
+
     def initial_prompt(self, prompt_override: str | None = None) -> str:
         prompt = prompt_override or self.raw.get("prompt") or ""
         appendix = self.raw.get("input_docs_text")
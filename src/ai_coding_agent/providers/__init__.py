@@ -0,0 +1,15 @@
+"""Model provider wrappers used by the agent runner."""
+
+from .cache import CachingModelProvider, ResponseCache
+from .ratelimit import RequestScheduler, SchedulingModelProvider
+from .recording import RecordingModelProvider
+from .stub import StubModelProvider
+
+__all__ = [
+    "CachingModelProvider",
+    "RecordingModelProvider",
+    "RequestScheduler",
+    "ResponseCache",
+    "SchedulingModelProvider",
+    "StubModelProvider",
+]
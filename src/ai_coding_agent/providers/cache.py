@@ -0,0 +1,322 @@
+"""Content-addressed on-disk cache for model responses."""
+from __future__ import annotations
+
+import asyncio
+import hashlib
+import json
+import os
+import tempfile
+import time
+from dataclasses import asdict, is_dataclass
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelProvider, ModelTracing
+from agents.tool import Tool
+from pydantic import BaseModel
+
+from ..constants import CacheMode
+from .responses import (
+    dump_model_response,
+    load_model_response,
+    model_response_from_events,
+    response_stream_events,
+)
+
+
+def _json_default(value: Any) -> Any:
+    if isinstance(value, BaseModel):
+        return value.model_dump(mode="json", exclude_none=True)
+    if is_dataclass(value) and not isinstance(value, type):
+        return asdict(value)
+    if isinstance(value, (set, frozenset)):
+        return sorted(value, key=str)
+    return str(value)
+
+
+def _describe_tool(tool: Any) -> dict[str, Any]:
+    return {
+        "type": type(tool).__name__,
+        "name": getattr(tool, "name", None),
+        "description": getattr(tool, "description", None),
+        "parameters": getattr(tool, "params_json_schema", None),
+        "strict": getattr(tool, "strict_json_schema", None),
+    }
+
+
+def _describe_output_schema(output_schema: Any) -> Any:
+    if output_schema is None or output_schema.is_plain_text():
+        return None
+    return output_schema.json_schema()
+
+
+def request_fingerprint(
+    model_name: str | None,
+    system_instructions: str | None,
+    input: Any,
+    model_settings: Any,
+    tools: list[Any],
+    output_schema: Any,
+    handoffs: list[Any],
+) -> str:
+    """Return a stable SHA-256 digest identifying a model request."""
+
+    settings = model_settings.to_json_dict() if hasattr(model_settings, "to_json_dict") else model_settings
+    if isinstance(settings, dict) and settings.get("retry") is not None:
+        # Retry policy changes how a request is sent, never what comes back.
+        settings = {**settings, "retry": None}
+    payload = {
+        "model": model_name,
+        "instructions": system_instructions,
+        "input": input,
+        "settings": settings,
+        "tools": [_describe_tool(tool) for tool in tools],
+        "output_schema": _describe_output_schema(output_schema),
+        "handoffs": [
+            {"name": handoff.tool_name, "parameters": handoff.input_json_schema} for handoff in handoffs
+        ],
+    }
+    encoded = json.dumps(payload, sort_keys=True, separators=(",", ":"), default=_json_default)
+    return hashlib.sha256(encoded.encode("utf-8")).hexdigest()
+
+
+class ResponseCache:
+    """Directory of JSON entries addressed by request fingerprint.
+
+    Entries older than ``ttl_seconds`` are ignored and removed. When the cache
+    grows beyond ``max_bytes`` the least recently used entries are evicted;
+    hits refresh an entry's modification time.
+    """
+
+    def __init__(
+        self,
+        root: Path,
+        *,
+        ttl_seconds: float | None = None,
+        max_bytes: int | None = None,
+    ) -> None:
+        self.root = root.expanduser()
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self.writes = 0
+        self._approx_bytes: int | None = None
+
+    def _entry_path(self, key: str) -> Path:
+        return self.root / key[:2] / f"{key}.json"
+
+    def _expired(self, created_at: float, now: float) -> bool:
+        return self.ttl_seconds is not None and now - created_at > self.ttl_seconds
+
+    def get(self, key: str) -> dict[str, Any] | None:
+        path = self._entry_path(key)
+        try:
+            entry = json.loads(path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+
+        now = time.time()
+        if self._expired(entry.get("created_at", 0.0), now):
+            path.unlink(missing_ok=True)
+            self.misses += 1
+            return None
+
+        try:
+            os.utime(path, (now, now))
+        except OSError:
+            pass
+        self.hits += 1
+        return entry["response"]
+
+    def put(self, key: str, response: dict[str, Any]) -> None:
+        path = self._entry_path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        data = json.dumps({"created_at": time.time(), "response": response}, separators=(",", ":"))
+        fd, tmp_name = tempfile.mkstemp(dir=path.parent, prefix=".tmp-", suffix=".json")
+        try:
+            with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                handle.write(data)
+            os.replace(tmp_name, path)
+        except BaseException:
+            Path(tmp_name).unlink(missing_ok=True)
+            raise
+        self.writes += 1
+
+        if self.max_bytes is not None:
+            if self._approx_bytes is None:
+                self.prune()
+            else:
+                self._approx_bytes += len(data)
+                if self._approx_bytes > self.max_bytes:
+                    self.prune()
+
+    def prune(self) -> int:
+        """Drop expired entries, then evict LRU entries above ``max_bytes``."""
+
+        if not self.root.exists():
+            self._approx_bytes = 0
+            return 0
+
+        now = time.time()
+        removed = 0
+        entries: list[tuple[float, int, Path]] = []
+        for path in self.root.glob("*/*.json"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            # mtime is never earlier than created_at, so an expired mtime
+            # implies an expired entry.
+            if self._expired(stat.st_mtime, now):
+                path.unlink(missing_ok=True)
+                removed += 1
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        if self.max_bytes is not None and total > self.max_bytes:
+            for _, size, path in sorted(entries):
+                path.unlink(missing_ok=True)
+                removed += 1
+                total -= size
+                if total <= self.max_bytes:
+                    break
+        self._approx_bytes = total
+        return removed
+
+
+class CachingModel(Model):
+    """Model wrapper that serves repeated requests from a :class:`ResponseCache`.
+
+    Streamed hits are replayed as a single ``response.completed`` event, so
+    they produce no token deltas.
+    """
+
+    def __init__(self, inner: Model, *, model_name: str | None, cache: ResponseCache, mode: CacheMode) -> None:
+        self.inner = inner
+        self.model_name = model_name
+        self.cache = cache
+        self.mode = mode
+
+    def _key(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+    ) -> str:
+        return request_fingerprint(
+            self.model_name,
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+        )
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        key = self._key(system_instructions, input, model_settings, tools, output_schema, handoffs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            return load_model_response(cached, cache_hit=True)
+
+        response = await self.inner.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            *args,
+            **kwargs,
+        )
+        if self.mode == CacheMode.READWRITE:
+            await asyncio.to_thread(self.cache.put, key, dump_model_response(response))
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        key = self._key(system_instructions, input, model_settings, tools, output_schema, handoffs)
+        cached = await asyncio.to_thread(self.cache.get, key)
+        if cached is not None:
+            async for event in response_stream_events(load_model_response(cached, cache_hit=True), self.model_name):
+                yield event
+            return
+
+        captured: list[TResponseStreamEvent] = []
+        async for event in self.inner.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            *args,
+            **kwargs,
+        ):
+            if self.mode == CacheMode.READWRITE and event.type in {"response.output_item.done", "response.completed"}:
+                captured.append(event)
+            yield event
+
+        response = model_response_from_events(captured)
+        if response is not None:
+            await asyncio.to_thread(self.cache.put, key, dump_model_response(response))
+
+    def get_retry_advice(self, request: Any) -> Any:
+        advice = getattr(self.inner, "get_retry_advice", None)
+        return advice(request) if advice else None
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class CachingModelProvider(ModelProvider):
+    """Provider wrapper that adds response caching to every model it returns."""
+
+    def __init__(self, inner: ModelProvider, cache: ResponseCache, mode: CacheMode) -> None:
+        self.inner = inner
+        self.cache = cache
+        self.mode = mode
+
+    def get_model(self, model_name: str | None) -> Model:
+        model = self.inner.get_model(model_name)
+        if self.mode == CacheMode.OFF:
+            return model
+        return CachingModel(model, model_name=model_name, cache=self.cache, mode=self.mode)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self.inner, "aclose", None)
+        if aclose is not None:
+            await aclose()
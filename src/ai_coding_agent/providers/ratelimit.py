@@ -0,0 +1,436 @@
+"""Rate-limit-aware scheduling of model requests across stages and runs."""
+from __future__ import annotations
+
+import asyncio
+import heapq
+import itertools
+import json
+import math
+import random
+import time
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TYPE_CHECKING, Any, AsyncIterator, Awaitable, Callable, TypeVar
+
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelProvider, ModelTracing
+from agents.tool import Tool
+from openai import APIConnectionError
+
+from ..constants import RequestPriority
+from ..plan import estimate_tokens
+
+if TYPE_CHECKING:
+    from ..config import AgentRuntimeSettings
+
+T = TypeVar("T")
+
+DEFAULT_OUTPUT_TOKENS = 1024
+"""Output allowance reserved for requests that do not set ``max_tokens``."""
+
+_PRIORITY_RANK = {RequestPriority.INTERACTIVE: 0, RequestPriority.BATCH: 1}
+_RETRYABLE_STATUS = frozenset({408, 409, 429})
+_CONGESTION_STATUS = frozenset({429, 503})
+
+
+def _status_code(error: BaseException) -> int | None:
+    status = getattr(error, "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def is_retryable(error: BaseException) -> bool:
+    """Whether ``error`` is a transient failure worth retrying (429, 5xx, timeouts, dropped connections)."""
+
+    if isinstance(error, APIConnectionError):
+        return True
+    status = _status_code(error)
+    if status is None:
+        return False
+    if status == 429 and getattr(error, "code", None) == "insufficient_quota":
+        # Exhausted billing quota does not recover by waiting.
+        return False
+    return status in _RETRYABLE_STATUS or status >= 500
+
+
+def retry_after_seconds(error: BaseException) -> float | None:
+    """Return the server's requested back-off from ``Retry-After(-Ms)`` headers, if any."""
+
+    headers = getattr(getattr(error, "response", None), "headers", None)
+    if headers is None:
+        return None
+    value = headers.get("retry-after-ms")
+    if value is not None:
+        try:
+            return max(float(value) / 1000, 0.0)
+        except ValueError:
+            pass
+    value = headers.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+class _Bucket:
+    """Token bucket holding one minute of budget, refilled continuously."""
+
+    def __init__(self, per_minute: int, clock: Callable[[], float]) -> None:
+        self.capacity = float(per_minute)
+        self.level = self.capacity
+        self.rate = per_minute / 60.0
+        self._clock = clock
+        self._updated = clock()
+
+    def _refill(self) -> None:
+        now = self._clock()
+        self.level = min(self.capacity, self.level + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Seconds until ``amount`` (capped at the capacity) can be taken."""
+
+        self._refill()
+        missing = min(amount, self.capacity) - self.level
+        return 0.0 if missing <= 0 else missing / self.rate
+
+    def take(self, amount: float) -> None:
+        # May go negative: usage above the estimate is paid back before new requests start.
+        self._refill()
+        self.level -= amount
+
+    def refund(self, amount: float) -> None:
+        self._refill()
+        self.level = min(self.capacity, self.level + amount)
+
+
+@dataclass(slots=True)
+class _Ticket:
+    tokens: int
+    future: asyncio.Future[float]
+
+
+class RequestScheduler:
+    """Admission control for model requests, shared by every stage of one or more runs.
+
+    Requests wait in priority lanes (interactive before batch, FIFO within a
+    lane) until a concurrency slot is free and the optional requests- and
+    tokens-per-minute budgets allow them. Token use is reserved from an
+    estimate when a request starts and corrected from the reported usage when
+    it finishes.
+
+    The concurrency limit adapts AIMD-style: each success raises it by
+    ``1 / limit`` up to ``max_concurrency``, and a 429 or 503 halves it (at
+    most once per round of in-flight requests) down to ``min_concurrency``. A
+    ``Retry-After`` header also pauses dispatch for every waiting request.
+    Transient failures are retried up to ``max_retries`` times with
+    full-jitter exponential back-off.
+    """
+
+    def __init__(
+        self,
+        *,
+        requests_per_minute: int | None = None,
+        tokens_per_minute: int | None = None,
+        max_concurrency: int = 16,
+        min_concurrency: int = 1,
+        max_retries: int = 6,
+        base_delay: float = 0.5,
+        max_delay: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        if min_concurrency < 1 or max_concurrency < min_concurrency:
+            raise ValueError("Concurrency bounds must satisfy 1 <= min_concurrency <= max_concurrency.")
+        self.max_concurrency = max_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.limit = float(max_concurrency)
+        self.in_flight = 0
+        self.requests = 0
+        self.retries = 0
+        self.throttled = 0
+        self.waited_seconds = 0.0
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._request_bucket = _Bucket(requests_per_minute, clock) if requests_per_minute else None
+        self._token_bucket = _Bucket(tokens_per_minute, clock) if tokens_per_minute else None
+        self._queue: list[tuple[int, int, _Ticket]] = []
+        self._sequence = itertools.count()
+        self._timer: asyncio.TimerHandle | None = None
+        self._paused_until = 0.0
+        self._last_decrease = -math.inf
+
+    @classmethod
+    def from_settings(cls, settings: AgentRuntimeSettings) -> RequestScheduler:
+        return cls(
+            requests_per_minute=settings.requests_per_minute,
+            tokens_per_minute=settings.tokens_per_minute,
+            max_concurrency=settings.max_concurrent_requests,
+            min_concurrency=min(settings.min_concurrent_requests, settings.max_concurrent_requests),
+            max_retries=settings.max_request_retries,
+            base_delay=settings.retry_base_delay,
+            max_delay=settings.retry_max_delay,
+        )
+
+    @property
+    def waiting(self) -> int:
+        return sum(not ticket.future.done() for _, _, ticket in self._queue)
+
+    def _dispatch(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        while self._queue and self.in_flight < int(self.limit):
+            _, _, ticket = self._queue[0]
+            if ticket.future.done():
+                heapq.heappop(self._queue)
+                continue
+            now = self._clock()
+            wait = self._paused_until - now
+            if self._request_bucket is not None:
+                wait = max(wait, self._request_bucket.wait_time(1))
+            if self._token_bucket is not None:
+                wait = max(wait, self._token_bucket.wait_time(ticket.tokens))
+            if wait > 0:
+                self._timer = asyncio.get_running_loop().call_later(wait, self._dispatch)
+                return
+            heapq.heappop(self._queue)
+            if self._request_bucket is not None:
+                self._request_bucket.take(1)
+            if self._token_bucket is not None:
+                self._token_bucket.take(ticket.tokens)
+            self.in_flight += 1
+            ticket.future.set_result(now)
+
+    async def acquire(self, tokens: int, priority: RequestPriority = RequestPriority.INTERACTIVE) -> float:
+        """Wait for a slot and budget for a request of about ``tokens``; return its start time."""
+
+        ticket = _Ticket(tokens=tokens, future=asyncio.get_running_loop().create_future())
+        heapq.heappush(self._queue, (_PRIORITY_RANK[priority], next(self._sequence), ticket))
+        queued_at = self._clock()
+        self._dispatch()
+        try:
+            started = await ticket.future
+        except asyncio.CancelledError:
+            if ticket.future.done() and not ticket.future.cancelled():
+                self.in_flight -= 1
+                self._dispatch()
+            raise
+        self.requests += 1
+        self.waited_seconds += started - queued_at
+        return started
+
+    def release(
+        self,
+        started: float,
+        *,
+        tokens: int,
+        used_tokens: int | None = None,
+        error: BaseException | None = None,
+    ) -> None:
+        """Return the slot taken by :meth:`acquire` and adapt to how the request went."""
+
+        self.in_flight -= 1
+        if self._token_bucket is not None and used_tokens is not None:
+            self._token_bucket.refund(tokens - used_tokens)
+        if error is None:
+            self.limit = min(float(self.max_concurrency), self.limit + 1 / self.limit)
+        elif _status_code(error) in _CONGESTION_STATUS:
+            self.throttled += 1
+            now = self._clock()
+            # Requests that started before the last decrease were sent at the old
+            # rate; counting their failures again would collapse the limit.
+            if started >= self._last_decrease:
+                self.limit = max(float(self.min_concurrency), self.limit / 2)
+                self._last_decrease = now
+            retry_after = retry_after_seconds(error)
+            if retry_after:
+                self._paused_until = max(self._paused_until, now + retry_after)
+        self._dispatch()
+
+    def backoff(self, error: BaseException, attempt: int) -> float | None:
+        """Return how long to wait before retry ``attempt`` (1-based), or ``None`` to give up."""
+
+        if attempt > self.max_retries or not is_retryable(error):
+            return None
+        self.retries += 1
+        delay = self._rng.uniform(0, min(self.max_delay, self.base_delay * 2 ** (attempt - 1)))
+        retry_after = retry_after_seconds(error)
+        if retry_after is not None:
+            delay = max(delay, retry_after)
+        return delay
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        *,
+        tokens: int,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+        usage: Callable[[T], int | None] = lambda result: None,
+    ) -> T:
+        """Run ``call`` under the scheduler, retrying transient failures."""
+
+        attempt = 0
+        while True:
+            started = await self.acquire(tokens, priority)
+            try:
+                result = await call()
+            except BaseException as exc:
+                self.release(started, tokens=tokens, error=exc)
+                attempt += 1
+                delay = self.backoff(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.release(started, tokens=tokens, used_tokens=usage(result))
+            return result
+
+    def summary(self) -> str:
+        return (
+            f"{self.requests} requests, {self.retries} retries, {self.throttled} throttled, "
+            f"{self.waited_seconds:.2f}s queued, concurrency limit {self.limit:.1f}"
+        )
+
+
+def estimate_request_tokens(
+    system_instructions: str | None,
+    input: str | list[TResponseInputItem],
+    model_settings: ModelSettings,
+) -> int:
+    """Rough size of a request including its output allowance, for the token budget."""
+
+    text = input if isinstance(input, str) else json.dumps(input, default=str)
+    output = model_settings.max_tokens or DEFAULT_OUTPUT_TOKENS
+    return estimate_tokens(system_instructions or "") + estimate_tokens(text) + output
+
+
+def _response_tokens(response: ModelResponse) -> int | None:
+    return response.usage.total_tokens if response.usage.requests else None
+
+
+class SchedulingModel(Model):
+    """Model wrapper that admits every call through a :class:`RequestScheduler`.
+
+    Streams are retried only if they fail before the first event; once events
+    have been yielded the error propagates.
+    """
+
+    def __init__(self, inner: Model, *, scheduler: RequestScheduler, priority: RequestPriority) -> None:
+        self.inner = inner
+        self.scheduler = scheduler
+        self.priority = priority
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        return await self.scheduler.run(
+            lambda: self.inner.get_response(
+                system_instructions,
+                input,
+                model_settings,
+                tools,
+                output_schema,
+                handoffs,
+                tracing,
+                *args,
+                **kwargs,
+            ),
+            tokens=estimate_request_tokens(system_instructions, input, model_settings),
+            priority=self.priority,
+            usage=_response_tokens,
+        )
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        tokens = estimate_request_tokens(system_instructions, input, model_settings)
+        attempt = 0
+        while True:
+            started = await self.scheduler.acquire(tokens, self.priority)
+            emitted = False
+            used: int | None = None
+            try:
+                async for event in self.inner.stream_response(
+                    system_instructions,
+                    input,
+                    model_settings,
+                    tools,
+                    output_schema,
+                    handoffs,
+                    tracing,
+                    *args,
+                    **kwargs,
+                ):
+                    if event.type == "response.completed" and event.response.usage is not None:
+                        used = event.response.usage.total_tokens
+                    emitted = True
+                    yield event
+            except BaseException as exc:
+                self.scheduler.release(started, tokens=tokens, error=exc)
+                attempt += 1
+                delay = None if emitted else self.scheduler.backoff(exc, attempt)
+                if delay is None:
+                    raise
+                await asyncio.sleep(delay)
+                continue
+            self.scheduler.release(started, tokens=tokens, used_tokens=used)
+            return
+
+    def get_retry_advice(self, request: Any) -> Any:
+        advice = getattr(self.inner, "get_retry_advice", None)
+        return advice(request) if advice else None
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class SchedulingModelProvider(ModelProvider):
+    """Provider wrapper that routes every model it returns through one scheduler."""
+
+    def __init__(
+        self,
+        inner: ModelProvider,
+        scheduler: RequestScheduler,
+        priority: RequestPriority = RequestPriority.INTERACTIVE,
+    ) -> None:
+        self.inner = inner
+        self.scheduler = scheduler
+        self.priority = priority
+
+    def get_model(self, model_name: str | None) -> Model:
+        return SchedulingModel(self.inner.get_model(model_name), scheduler=self.scheduler, priority=self.priority)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self.inner, "aclose", None)
+        if aclose is not None:
+            await aclose()
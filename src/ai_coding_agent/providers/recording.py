@@ -0,0 +1,138 @@
+"""Capture live model sessions to disk for later offline replay."""
+from __future__ import annotations
+
+import json
+import os
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelProvider, ModelTracing
+from agents.tool import Tool
+
+from ..context import current_stage
+from .responses import dump_model_response, model_response_from_events
+
+
+class SessionRecorder:
+    """Accumulates responses per stage and rewrites the session file after each one.
+
+    The file uses the stub script format, so it can be replayed with
+    :class:`~ai_coding_agent.providers.stub.StubModelProvider`.
+    """
+
+    def __init__(self, path: Path) -> None:
+        self.path = path.expanduser()
+        self.session: dict[str, Any] = {"version": 1, "recorded_at": time.time(), "stages": {}}
+        self._lock = threading.Lock()
+
+    def record(self, stage: str, model_name: str | None, response: ModelResponse) -> None:
+        with self._lock:
+            self.session.setdefault("model", model_name)
+            self.session["stages"].setdefault(stage, []).append(dump_model_response(response))
+            data = json.dumps(self.session, indent=2)
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            fd, tmp_name = tempfile.mkstemp(dir=self.path.parent, prefix=".tmp-", suffix=".json")
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8") as handle:
+                    handle.write(data)
+                os.replace(tmp_name, self.path)
+            except BaseException:
+                Path(tmp_name).unlink(missing_ok=True)
+                raise
+
+
+class RecordingModel(Model):
+    """Model wrapper that forwards every call and records the final response."""
+
+    def __init__(self, inner: Model, *, model_name: str | None, recorder: SessionRecorder) -> None:
+        self.inner = inner
+        self.model_name = model_name
+        self.recorder = recorder
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        response = await self.inner.get_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            *args,
+            **kwargs,
+        )
+        self.recorder.record(current_stage.get() or "default", self.model_name, response)
+        return response
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        captured: list[TResponseStreamEvent] = []
+        async for event in self.inner.stream_response(
+            system_instructions,
+            input,
+            model_settings,
+            tools,
+            output_schema,
+            handoffs,
+            tracing,
+            *args,
+            **kwargs,
+        ):
+            if event.type in {"response.output_item.done", "response.completed"}:
+                captured.append(event)
+            yield event
+
+        response = model_response_from_events(captured)
+        if response is not None:
+            self.recorder.record(current_stage.get() or "default", self.model_name, response)
+
+    def get_retry_advice(self, request: Any) -> Any:
+        advice = getattr(self.inner, "get_retry_advice", None)
+        return advice(request) if advice else None
+
+    async def close(self) -> None:
+        await self.inner.close()
+
+
+class RecordingModelProvider(ModelProvider):
+    """Provider wrapper that records every model it returns into one session file."""
+
+    def __init__(self, inner: ModelProvider, path: Path) -> None:
+        self.inner = inner
+        self.recorder = SessionRecorder(path)
+
+    def get_model(self, model_name: str | None) -> Model:
+        return RecordingModel(self.inner.get_model(model_name), model_name=model_name, recorder=self.recorder)
+
+    async def aclose(self) -> None:
+        aclose = getattr(self.inner, "aclose", None)
+        if aclose is not None:
+            await aclose()
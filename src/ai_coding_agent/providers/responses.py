@@ -0,0 +1,113 @@
+"""Conversions between model responses, JSON payloads and stream events."""
+from __future__ import annotations
+
+import time
+from typing import Any, AsyncIterator, Iterable
+
+from agents.items import ModelResponse
+from agents.usage import Usage
+from openai.types.responses import (
+    Response,
+    ResponseCompletedEvent,
+    ResponseOutputItem,
+    ResponseOutputItemDoneEvent,
+    ResponseUsage,
+)
+from openai.types.responses.response_usage import InputTokensDetails, OutputTokensDetails
+from pydantic import TypeAdapter
+
+_OUTPUT_ITEMS = TypeAdapter(list[ResponseOutputItem])
+_USAGE = TypeAdapter(Usage)
+
+
+def dump_model_response(response: ModelResponse) -> dict[str, Any]:
+    """Serialize a :class:`ModelResponse` into JSON-compatible data."""
+
+    return {
+        "output": [item.model_dump(mode="json", exclude_none=True) for item in response.output],
+        "usage": _USAGE.dump_python(response.usage, mode="json"),
+        "response_id": response.response_id,
+    }
+
+
+def load_model_response(payload: dict[str, Any], *, cache_hit: bool = False) -> ModelResponse:
+    """Rebuild a :class:`ModelResponse` produced by :func:`dump_model_response`.
+
+    Cache hits cost nothing and do not exist server-side, so ``cache_hit``
+    reports empty usage and drops the response id.
+    """
+
+    output = _OUTPUT_ITEMS.validate_python(payload["output"])
+    if cache_hit or not payload.get("usage"):
+        return ModelResponse(output=output, usage=Usage(), response_id=None)
+    return ModelResponse(
+        output=output,
+        usage=_USAGE.validate_python(payload["usage"]),
+        response_id=payload.get("response_id"),
+    )
+
+
+async def response_stream_events(
+    response: ModelResponse,
+    model_name: str | None,
+) -> AsyncIterator[ResponseCompletedEvent]:
+    """Replay a complete response as a single ``response.completed`` stream event.
+
+    Usage is attached only when the response reports any, so replayed cache
+    hits stay free.
+    """
+
+    usage = None
+    if response.usage.requests or response.usage.total_tokens:
+        usage = ResponseUsage.model_construct(
+            input_tokens=response.usage.input_tokens,
+            input_tokens_details=InputTokensDetails.model_construct(
+                cached_tokens=response.usage.input_tokens_details.cached_tokens or 0
+            ),
+            output_tokens=response.usage.output_tokens,
+            output_tokens_details=OutputTokensDetails.model_construct(
+                reasoning_tokens=response.usage.output_tokens_details.reasoning_tokens or 0
+            ),
+            total_tokens=response.usage.total_tokens,
+        )
+    completed = Response.model_construct(
+        id=response.response_id or "resp_replayed",
+        created_at=time.time(),
+        model=model_name or "unknown",
+        object="response",
+        output=list(response.output),
+        parallel_tool_calls=False,
+        tool_choice="auto",
+        tools=[],
+        usage=usage,
+    )
+    yield ResponseCompletedEvent.model_construct(
+        type="response.completed",
+        response=completed,
+        sequence_number=0,
+    )
+
+
+def model_response_from_events(events: Iterable[Any]) -> ModelResponse | None:
+    """Assemble the final :class:`ModelResponse` from captured stream events."""
+
+    done_items: list[Any] = []
+    for event in events:
+        if isinstance(event, ResponseOutputItemDoneEvent):
+            done_items.append(event.item)
+        elif isinstance(event, ResponseCompletedEvent):
+            completed = event.response
+            usage = Usage()
+            if completed.usage is not None:
+                usage = Usage(
+                    requests=1,
+                    input_tokens=completed.usage.input_tokens,
+                    output_tokens=completed.usage.output_tokens,
+                    total_tokens=completed.usage.total_tokens,
+                )
+            return ModelResponse(
+                output=list(completed.output) or done_items,
+                usage=usage,
+                response_id=completed.id,
+            )
+    return None
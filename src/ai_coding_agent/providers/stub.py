@@ -0,0 +1,246 @@
+"""Offline model that plays back scripted or recorded responses per stage."""
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+from pathlib import Path
+from typing import Any, AsyncIterator
+
+from agents.agent_output import AgentOutputSchemaBase
+from agents.handoffs import Handoff
+from agents.items import ModelResponse, TResponseInputItem, TResponseStreamEvent
+from agents.model_settings import ModelSettings
+from agents.models.interface import Model, ModelProvider, ModelTracing
+from agents.tool import Tool
+from agents.usage import Usage
+from openai.types.responses import (
+    ResponseFunctionToolCall,
+    ResponseOutputMessage,
+    ResponseOutputText,
+    ResponseTextDeltaEvent,
+)
+
+from ..context import current_stage
+from .responses import load_model_response, response_stream_events
+
+_MODEL_ITEM_TYPES = frozenset(
+    {
+        "function_call",
+        "reasoning",
+        "web_search_call",
+        "file_search_call",
+        "computer_call",
+        "code_interpreter_call",
+        "image_generation_call",
+        "local_shell_call",
+        "mcp_call",
+    }
+)
+
+
+def load_script(path: Path) -> dict[str, Any]:
+    """Load a stub script or recorded session from ``path``.
+
+    The file holds ``{"stages": {name: [step, ...]}, "default": [step, ...]}``.
+    A step is either a recorded response (``{"output": [...], "usage": ...}``)
+    or a shorthand ``{"tool_calls": [{"name": ..., "arguments": {...}}],
+    "text": ..., "usage": {...}}``.
+    """
+
+    script = json.loads(path.read_text(encoding="utf-8"))
+    if not isinstance(script, dict) or not isinstance(script.get("stages", {}), dict):
+        raise ValueError(f"{path} is not a stub script: expected an object with a 'stages' mapping")
+    return script
+
+
+def default_steps(stage: str) -> list[dict[str, Any]]:
+    """Built-in script: one batch of tool calls per stage followed by a final message."""
+
+    folder = "requirements" if stage == "requirements" else f"stub/{stage}"
+    return [
+        {
+            "tool_calls": [
+                {
+                    "name": "write_many",
+                    "arguments": {
+                        "files": [
+                            {"path": f"{folder}/{stage}.md", "content": f"# {stage.title()}\n\nStub output.\n"},
+                        ]
+                    },
+                },
+                {"name": "record_event", "arguments": {"title": stage, "body": "stub stage executed"}},
+            ]
+        },
+        {"text": f"{stage.title()} stage finished."},
+    ]
+
+
+def turn_index(input: str | list[TResponseInputItem]) -> int:
+    """Count the model turns already present in a conversation ``input``."""
+
+    if isinstance(input, str):
+        return 0
+    turns = 0
+    previous = False
+    for item in input:
+        if isinstance(item, dict):
+            kind, role = item.get("type"), item.get("role")
+        else:
+            kind, role = getattr(item, "type", None), getattr(item, "role", None)
+        produced = kind in _MODEL_ITEM_TYPES or (role == "assistant" and kind in {None, "message"})
+        if produced and not previous:
+            turns += 1
+        previous = produced
+    return turns
+
+
+def _estimate_tokens(value: Any) -> int:
+    text = value if isinstance(value, str) else json.dumps(value, default=str)
+    return (len(text) + 3) // 4
+
+
+class StubModel(Model):
+    """Model that answers from a per-stage script without touching the network.
+
+    The stage comes from :data:`~ai_coding_agent.context.current_stage` and the
+    step from the number of model turns already in the conversation, so the
+    same script always yields the same tool-call sequence. Usage is taken from
+    the step when present, otherwise estimated from request and output size.
+    """
+
+    def __init__(self, script: dict[str, Any], *, model_name: str | None = None, latency: float = 0.0) -> None:
+        self.script = script
+        self.model_name = model_name
+        self.latency = latency
+        self.calls = 0
+        self.model_seconds = 0.0
+
+    def _steps(self, stage: str) -> list[dict[str, Any]]:
+        stages = self.script.get("stages", {})
+        if stage in stages:
+            return stages[stage]
+        if "default" in self.script:
+            return self.script["default"]
+        return default_steps(stage)
+
+    def _respond(self, system_instructions: str | None, input: str | list[TResponseInputItem]) -> ModelResponse:
+        stage = current_stage.get() or "default"
+        turn = turn_index(input)
+        steps = self._steps(stage)
+        step = steps[turn] if turn < len(steps) else {"text": f"{stage.title()} stage finished."}
+        if "output" in step:
+            return load_model_response(step)
+
+        output: list[Any] = []
+        for index, call in enumerate(step.get("tool_calls", [])):
+            arguments = call.get("arguments", {})
+            output.append(
+                ResponseFunctionToolCall(
+                    type="function_call",
+                    id=f"fc_{stage}_{turn}_{index}",
+                    call_id=f"call_{stage}_{turn}_{index}",
+                    name=call["name"],
+                    arguments=arguments if isinstance(arguments, str) else json.dumps(arguments),
+                    status="completed",
+                )
+            )
+        if step.get("text"):
+            output.append(
+                ResponseOutputMessage(
+                    type="message",
+                    id=f"msg_{stage}_{turn}",
+                    role="assistant",
+                    status="completed",
+                    content=[ResponseOutputText(type="output_text", text=step["text"], annotations=[])],
+                )
+            )
+
+        if "usage" in step:
+            usage = Usage(requests=1, **step["usage"])
+        else:
+            input_tokens = _estimate_tokens(system_instructions or "") + _estimate_tokens(input)
+            output_tokens = sum(_estimate_tokens(item.model_dump(exclude_none=True)) for item in output)
+            usage = Usage(requests=1, input_tokens=input_tokens, output_tokens=output_tokens)
+        usage.total_tokens = usage.total_tokens or usage.input_tokens + usage.output_tokens
+        return ModelResponse(output=output, usage=usage, response_id=f"resp_{stage}_{turn}")
+
+    async def _wait(self) -> None:
+        self.calls += 1
+        if self.latency:
+            started = time.perf_counter()
+            await asyncio.sleep(self.latency)
+            self.model_seconds += time.perf_counter() - started
+
+    async def get_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> ModelResponse:
+        await self._wait()
+        return self._respond(system_instructions, input)
+
+    async def stream_response(
+        self,
+        system_instructions: str | None,
+        input: str | list[TResponseInputItem],
+        model_settings: ModelSettings,
+        tools: list[Tool],
+        output_schema: AgentOutputSchemaBase | None,
+        handoffs: list[Handoff],
+        tracing: ModelTracing,
+        *args: Any,
+        **kwargs: Any,
+    ) -> AsyncIterator[TResponseStreamEvent]:
+        await self._wait()
+        response = self._respond(system_instructions, input)
+        sequence = 0
+        for index, item in enumerate(response.output):
+            if not isinstance(item, ResponseOutputMessage):
+                continue
+            for part in item.content:
+                for word in getattr(part, "text", "").split(" "):
+                    sequence += 1
+                    yield ResponseTextDeltaEvent.model_construct(
+                        type="response.output_text.delta",
+                        item_id=item.id,
+                        output_index=index,
+                        content_index=0,
+                        delta=f"{word} ",
+                        logprobs=[],
+                        sequence_number=sequence,
+                    )
+        async for event in response_stream_events(response, self.model_name):
+            yield event
+
+
+class StubModelProvider(ModelProvider):
+    """Provider returning :class:`StubModel` instances that share one script.
+
+    With no script every stage runs :func:`default_steps`; pass the path of a
+    session captured by :class:`~ai_coding_agent.providers.recording.RecordingModelProvider`
+    to replay it.
+    """
+
+    def __init__(self, script: dict[str, Any] | Path | None = None, *, latency: float = 0.0) -> None:
+        if isinstance(script, Path):
+            script = load_script(script)
+        self.script = script or {}
+        self.latency = latency
+        self.models: list[StubModel] = []
+
+    def get_model(self, model_name: str | None) -> Model:
+        model = StubModel(self.script, model_name=model_name, latency=self.latency)
+        self.models.append(model)
+        return model
+
+    @property
+    def model_seconds(self) -> float:
+        return sum(model.model_seconds for model in self.models)
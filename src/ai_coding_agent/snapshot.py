@@ -0,0 +1,396 @@
+"""Content-addressed workspace snapshots with incremental restore."""
+from __future__ import annotations
+
+import errno
+import hashlib
+import json
+import os
+import shutil
+import stat as stat_module
+import tempfile
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from .constants import STATE_DIR_NAME, SnapshotLinkMode
+from .tools.search_index import IGNORED_DIRS
+
+CHUNK_SIZE = 1024 * 1024
+PARALLEL_THRESHOLD = 16
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+_FICLONE = 0x40049409  # Linux ioctl: share extents between two files
+
+
+class SnapshotError(RuntimeError):
+    """Raised when a snapshot cannot be captured or restored."""
+
+
+@dataclass(slots=True)
+class FileEntry:
+    """Manifest record for a single workspace path."""
+
+    size: int
+    mtime_ns: int
+    mode: int
+    digest: str | None = None
+    link: str | None = None
+
+
+@dataclass(slots=True)
+class Snapshot:
+    """Manifest of every file in the workspace at a point in time."""
+
+    id: str
+    label: str
+    created_ns: int
+    files: dict[str, FileEntry] = field(default_factory=dict)
+
+    def to_json(self) -> dict:
+        return {
+            "id": self.id,
+            "label": self.label,
+            "created_ns": self.created_ns,
+            "files": {path: asdict(entry) for path, entry in self.files.items()},
+        }
+
+    @classmethod
+    def from_json(cls, data: dict) -> "Snapshot":
+        return cls(
+            id=data["id"],
+            label=data["label"],
+            created_ns=data["created_ns"],
+            files={path: FileEntry(**entry) for path, entry in data["files"].items()},
+        )
+
+
+@dataclass(slots=True)
+class RestoreReport:
+    """Paths touched by :meth:`SnapshotStore.restore`."""
+
+    restored: list[str] = field(default_factory=list)
+    removed: list[str] = field(default_factory=list)
+
+
+def _reflink(source: Path, destination: Path) -> bool:
+    """Clone ``source`` into ``destination`` without copying data, if supported."""
+
+    try:
+        import fcntl
+    except ImportError:  # pragma: no cover - non-POSIX platforms
+        return False
+    try:
+        with open(source, "rb") as src, open(destination, "wb") as dst:
+            fcntl.ioctl(dst.fileno(), _FICLONE, src.fileno())
+    except OSError:
+        destination.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _hash_file(path: Path) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as handle:
+        while chunk := handle.read(CHUNK_SIZE):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _map(func, items: list) -> list:
+    if len(items) < PARALLEL_THRESHOLD:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        return list(pool.map(func, items))
+
+
+class SnapshotStore:
+    """Stores workspace manifests and deduplicated file blobs.
+
+    Blobs live under ``objects/`` keyed by SHA-256 and are shared by every
+    snapshot that references the same content. Capturing a snapshot only
+    hashes and stores files whose size or mtime changed since the previous
+    snapshot; restoring only rewrites files that differ from the manifest.
+
+    ``link_mode`` controls how new blobs are ingested: ``reflink`` and
+    ``copy`` store an independent copy (``auto`` tries a reflink first),
+    while ``hardlink`` shares the workspace inode. Hardlinked blobs are only
+    safe while writers replace files by rename, as ``write_many`` does, so they
+    are re-verified before being restored.
+
+    Directories named in :data:`IGNORED_DIRS` (VCS metadata, virtualenvs,
+    ``node_modules``) plus ``exclude`` are skipped at any depth; an excluded
+    name at the workspace root also skips a file.
+    """
+
+    def __init__(
+        self,
+        workspace: Path,
+        *,
+        root: Path | None = None,
+        link_mode: SnapshotLinkMode = SnapshotLinkMode.AUTO,
+        exclude: tuple[str, ...] = (),
+    ) -> None:
+        self.workspace = workspace
+        self.root = root or workspace / STATE_DIR_NAME / "snapshots"
+        self.link_mode = link_mode
+        self.exclude = frozenset((*IGNORED_DIRS, *exclude))
+        self._latest: Snapshot | None = None
+
+    @property
+    def objects_dir(self) -> Path:
+        return self.root / "objects"
+
+    @property
+    def manifests_dir(self) -> Path:
+        return self.root / "manifests"
+
+    def _blob_path(self, digest: str) -> Path:
+        return self.objects_dir / digest[:2] / digest
+
+    def _excluded(self, relative: str) -> bool:
+        parts = relative.split("/")
+        return parts[0] in self.exclude or any(part in self.exclude for part in parts[1:-1])
+
+    def _walk(self) -> Iterator[tuple[str, os.stat_result]]:
+        stack = [self.workspace]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except FileNotFoundError:
+                continue
+            for entry in entries:
+                info = entry.stat(follow_symlinks=False)
+                if entry.name in self.exclude and (directory == self.workspace or stat_module.S_ISDIR(info.st_mode)):
+                    continue
+                if stat_module.S_ISDIR(info.st_mode):
+                    stack.append(Path(entry.path))
+                elif stat_module.S_ISREG(info.st_mode) or stat_module.S_ISLNK(info.st_mode):
+                    relative = Path(entry.path).relative_to(self.workspace).as_posix()
+                    yield relative, info
+
+    def _ingest(self, relative: str) -> str | None:
+        source = self.workspace / relative
+        try:
+            digest = _hash_file(source)
+        except FileNotFoundError:
+            # Deleted between the directory walk and ingestion.
+            return None
+        blob = self._blob_path(digest)
+        if blob.exists():
+            return digest
+        blob.parent.mkdir(parents=True, exist_ok=True)
+
+        if self.link_mode == SnapshotLinkMode.HARDLINK:
+            try:
+                os.link(source, blob)
+                return digest
+            except FileExistsError:
+                return digest
+            except OSError:
+                pass
+
+        fd, tmp_name = tempfile.mkstemp(dir=blob.parent, prefix=".tmp-")
+        os.close(fd)
+        tmp = Path(tmp_name)
+        try:
+            cloned = self.link_mode in {SnapshotLinkMode.AUTO, SnapshotLinkMode.REFLINK} and _reflink(source, tmp)
+            if not cloned:
+                if self.link_mode == SnapshotLinkMode.REFLINK:
+                    raise SnapshotError(f"Filesystem does not support reflinks for {source}")
+                shutil.copyfile(source, tmp)
+            os.chmod(tmp, 0o444)
+            os.replace(tmp, blob)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+        return digest
+
+    def latest(self) -> Snapshot | None:
+        """Return the most recently captured snapshot, if any."""
+
+        if self._latest is None:
+            snapshots = self.snapshots()
+            self._latest = snapshots[-1] if snapshots else None
+        return self._latest
+
+    def snapshots(self) -> list[Snapshot]:
+        """Return every stored snapshot, oldest first."""
+
+        if not self.manifests_dir.exists():
+            return []
+        snapshots = [
+            Snapshot.from_json(json.loads(path.read_text(encoding="utf-8")))
+            for path in self.manifests_dir.glob("*.json")
+        ]
+        return sorted(snapshots, key=lambda snapshot: snapshot.created_ns)
+
+    def load(self, snapshot_id: str) -> Snapshot:
+        path = self.manifests_dir / f"{snapshot_id}.json"
+        try:
+            return Snapshot.from_json(json.loads(path.read_text(encoding="utf-8")))
+        except FileNotFoundError as exc:
+            raise SnapshotError(f"Unknown snapshot: {snapshot_id}") from exc
+
+    def capture(self, label: str = "") -> Snapshot:
+        """Record the current workspace state and return its manifest."""
+
+        created_ns = time.time_ns()
+        previous = self.latest()
+        snapshot = Snapshot(id=uuid.uuid4().hex[:12], label=label, created_ns=created_ns)
+
+        to_ingest: list[str] = []
+        for relative, info in self._walk():
+            entry = FileEntry(size=info.st_size, mtime_ns=info.st_mtime_ns, mode=stat_module.S_IMODE(info.st_mode))
+            if stat_module.S_ISLNK(info.st_mode):
+                entry.link = os.readlink(self.workspace / relative)
+            else:
+                known = previous.files.get(relative) if previous else None
+                # Files modified in the same tick as the previous capture may
+                # have changed without their mtime moving, so re-hash them.
+                if (
+                    known is not None
+                    and known.digest is not None
+                    and known.size == entry.size
+                    and known.mtime_ns == entry.mtime_ns
+                    and known.mtime_ns < previous.created_ns
+                ):
+                    entry.digest = known.digest
+                else:
+                    to_ingest.append(relative)
+            snapshot.files[relative] = entry
+
+        for relative, digest in zip(to_ingest, _map(self._ingest, to_ingest)):
+            if digest is None:
+                del snapshot.files[relative]
+            else:
+                snapshot.files[relative].digest = digest
+
+        self.manifests_dir.mkdir(parents=True, exist_ok=True)
+        manifest = self.manifests_dir / f"{snapshot.id}.json"
+        tmp = manifest.with_suffix(".tmp")
+        tmp.write_text(json.dumps(snapshot.to_json(), separators=(",", ":")), encoding="utf-8")
+        os.replace(tmp, manifest)
+        self._latest = snapshot
+        return snapshot
+
+    def _materialize(self, relative: str, entry: FileEntry) -> None:
+        target = self.workspace / relative
+        target.parent.mkdir(parents=True, exist_ok=True)
+        if target.is_symlink() or target.is_file():
+            target.unlink()
+        elif target.is_dir():
+            shutil.rmtree(target)
+
+        if entry.link is not None:
+            os.symlink(entry.link, target)
+            return
+
+        assert entry.digest is not None
+        blob = self._blob_path(entry.digest)
+        if not blob.exists():
+            raise SnapshotError(f"Missing blob {entry.digest} for {relative}")
+        if blob.stat().st_nlink > 1 and _hash_file(blob) != entry.digest:
+            raise SnapshotError(f"Blob {entry.digest} for {relative} was modified through a hardlink")
+
+        fd, tmp_name = tempfile.mkstemp(dir=target.parent, prefix=f".{target.name}.", suffix=".tmp")
+        os.close(fd)
+        tmp = Path(tmp_name)
+        try:
+            if not _reflink(blob, tmp):
+                shutil.copyfile(blob, tmp)
+            os.chmod(tmp, entry.mode)
+            os.utime(tmp, ns=(entry.mtime_ns, entry.mtime_ns))
+            os.replace(tmp, target)
+        except BaseException:
+            tmp.unlink(missing_ok=True)
+            raise
+
+    def restore(self, snapshot: Snapshot | str, *, paths: Iterable[str] | None = None) -> RestoreReport:
+        """Return the workspace to ``snapshot``, touching only changed paths.
+
+        With ``paths``, only those workspace-relative paths are restored:
+        ones missing from the snapshot are deleted, and every other file is
+        left as it is now.
+        """
+
+        if isinstance(snapshot, str):
+            snapshot = self.load(snapshot)
+
+        report = RestoreReport()
+        if paths is None:
+            current = dict(self._walk())
+            files = snapshot.files
+        else:
+            # Stat just the selected paths instead of walking the whole workspace.
+            current = {}
+            files = {}
+            for relative in sorted(set(paths)):
+                if self._excluded(relative):
+                    continue
+                if relative in snapshot.files:
+                    files[relative] = snapshot.files[relative]
+                try:
+                    info = os.lstat(self.workspace / relative)
+                except (FileNotFoundError, NotADirectoryError):
+                    continue
+                if stat_module.S_ISREG(info.st_mode) or stat_module.S_ISLNK(info.st_mode):
+                    current[relative] = info
+        for relative, info in current.items():
+            if relative not in snapshot.files:
+                (self.workspace / relative).unlink()
+                report.removed.append(relative)
+
+        changed: list[str] = []
+        for relative, entry in files.items():
+            info = current.get(relative)
+            if info is not None:
+                is_link = stat_module.S_ISLNK(info.st_mode)
+                if entry.link is not None and is_link and os.readlink(self.workspace / relative) == entry.link:
+                    continue
+                if (
+                    entry.link is None
+                    and not is_link
+                    and info.st_size == entry.size
+                    and info.st_mtime_ns == entry.mtime_ns
+                ):
+                    if stat_module.S_IMODE(info.st_mode) != entry.mode:
+                        os.chmod(self.workspace / relative, entry.mode)
+                    continue
+            changed.append(relative)
+
+        keep = {str(Path(relative).parent) for relative in snapshot.files}
+        for relative in sorted(report.removed, key=lambda item: item.count("/"), reverse=True):
+            parent = Path(relative).parent
+            while str(parent) not in keep and parent != Path("."):
+                try:
+                    (self.workspace / parent).rmdir()
+                except OSError as exc:
+                    if exc.errno in {errno.ENOTEMPTY, errno.EEXIST, errno.ENOENT}:
+                        break
+                    raise
+                parent = parent.parent
+
+        _map(lambda relative: self._materialize(relative, snapshot.files[relative]), changed)
+        report.restored.extend(changed)
+        return report
+
+    def prune(self, keep: int) -> int:
+        """Keep the ``keep`` newest snapshots and delete blobs nobody references."""
+
+        snapshots = self.snapshots()
+        for snapshot in snapshots[:-keep] if keep else snapshots:
+            (self.manifests_dir / f"{snapshot.id}.json").unlink(missing_ok=True)
+        retained = snapshots[-keep:] if keep else []
+        self._latest = retained[-1] if retained else None
+
+        referenced = {entry.digest for snapshot in retained for entry in snapshot.files.values()}
+        removed = 0
+        if self.objects_dir.exists():
+            for blob in self.objects_dir.glob("*/*"):
+                if blob.name not in referenced:
+                    blob.unlink(missing_ok=True)
+                    removed += 1
+        return removed
@@ -0,0 +1,311 @@
+"""Persistent SQLite store for run history."""
+from __future__ import annotations
+
+import json
+import queue
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import closing
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+SCHEMA_VERSION = 2
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id TEXT PRIMARY KEY,
+    workspace TEXT NOT NULL,
+    prompt TEXT,
+    status TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    finished_at REAL
+);
+CREATE INDEX IF NOT EXISTS runs_started_at ON runs (started_at);
+
+CREATE TABLE IF NOT EXISTS settings (
+    run_id TEXT PRIMARY KEY REFERENCES runs (id) ON DELETE CASCADE,
+    payload TEXT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS stages (
+    run_id TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    status TEXT NOT NULL,
+    started_at REAL,
+    finished_at REAL,
+    metrics TEXT,
+    PRIMARY KEY (run_id, name)
+);
+
+CREATE TABLE IF NOT EXISTS events (
+    id INTEGER PRIMARY KEY,
+    run_id TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    stage TEXT,
+    created_at REAL NOT NULL,
+    message TEXT NOT NULL,
+    kind TEXT NOT NULL DEFAULT 'log',
+    payload TEXT
+);
+CREATE INDEX IF NOT EXISTS events_run ON events (run_id, id);
+
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id TEXT NOT NULL REFERENCES runs (id) ON DELETE CASCADE,
+    name TEXT NOT NULL,
+    payload TEXT,
+    updated_at REAL NOT NULL,
+    PRIMARY KEY (run_id, name)
+);
+"""
+
+_INSERT_RUN = "INSERT INTO runs (id, workspace, prompt, status, started_at) VALUES (?, ?, ?, ?, ?)"
+_INSERT_SETTINGS = "INSERT OR REPLACE INTO settings (run_id, payload) VALUES (?, ?)"
+_FINISH_RUN = "UPDATE runs SET status = ?, finished_at = ? WHERE id = ?"
+_UPSERT_STAGE = """
+INSERT INTO stages (run_id, name, status, started_at, finished_at, metrics) VALUES (?, ?, ?, ?, ?, ?)
+ON CONFLICT (run_id, name) DO UPDATE SET
+    status = excluded.status,
+    started_at = COALESCE(excluded.started_at, stages.started_at),
+    finished_at = excluded.finished_at,
+    metrics = COALESCE(excluded.metrics, stages.metrics)
+"""
+_INSERT_EVENT = "INSERT INTO events (run_id, stage, created_at, message, kind, payload) VALUES (?, ?, ?, ?, ?, ?)"
+_UPSERT_ARTIFACT = """
+INSERT INTO artifacts (run_id, name, payload, updated_at) VALUES (?, ?, ?, ?)
+ON CONFLICT (run_id, name) DO UPDATE SET payload = excluded.payload, updated_at = excluded.updated_at
+"""
+
+# Applied in order to databases created by earlier schema versions.
+MIGRATIONS = {
+    2: """
+    ALTER TABLE events ADD COLUMN kind TEXT NOT NULL DEFAULT 'log';
+    ALTER TABLE events ADD COLUMN payload TEXT;
+    """,
+}
+
+
+class RunStoreError(RuntimeError):
+    """Raised when the background writer failed to persist queued records."""
+
+
+@dataclass(slots=True)
+class _Flush:
+    done: threading.Event
+
+
+_STOP = object()
+
+
+def _dumps(payload: Any) -> str:
+    return json.dumps(payload, default=str)
+
+
+class RunStore:
+    """SQLite-backed history of runs, stages, events, artifacts and settings.
+
+    The database runs in WAL mode so readers never block the writer. Record
+    methods only enqueue rows; a background thread commits them in batches,
+    keeping disk I/O off the event loop. Call :meth:`flush` before reading
+    rows written by the current process and :meth:`close` when done.
+    """
+
+    def __init__(self, path: Path, *, batch_size: int = 512) -> None:
+        self.path = path.expanduser()
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.batch_size = batch_size
+        self._queue: queue.SimpleQueue[Any] = queue.SimpleQueue()
+        self._error: BaseException | None = None
+        with closing(self._connect()) as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            version = conn.execute("PRAGMA user_version").fetchone()[0]
+            if version < SCHEMA_VERSION:
+                existing = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'runs'").fetchone()
+                if existing:
+                    for target in range(version + 1, SCHEMA_VERSION + 1):
+                        if target in MIGRATIONS:
+                            conn.executescript(MIGRATIONS[target])
+                conn.executescript(SCHEMA)
+                conn.execute(f"PRAGMA user_version={SCHEMA_VERSION}")
+        self._thread = threading.Thread(target=self._write_loop, name="run-store-writer", daemon=True)
+        self._thread.start()
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(self.path, timeout=30.0, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute("PRAGMA foreign_keys=ON")
+        conn.row_factory = sqlite3.Row
+        return conn
+
+    def _write_loop(self) -> None:
+        conn = self._connect()
+        try:
+            stopping = False
+            while not stopping:
+                batch = [self._queue.get()]
+                while len(batch) < self.batch_size:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                # Consecutive rows for the same statement share one executemany
+                # call; order across statements is preserved.
+                statements: list[tuple[str, list[tuple[Any, ...]]]] = []
+                waiters: list[threading.Event] = []
+                for item in batch:
+                    if item is _STOP:
+                        stopping = True
+                    elif isinstance(item, _Flush):
+                        waiters.append(item.done)
+                    else:
+                        sql, params = item
+                        if statements and statements[-1][0] == sql:
+                            statements[-1][1].append(params)
+                        else:
+                            statements.append((sql, [params]))
+                if statements and self._error is None:
+                    try:
+                        with conn:
+                            for sql, rows in statements:
+                                conn.executemany(sql, rows)
+                    except sqlite3.Error as exc:
+                        self._error = exc
+                for done in waiters:
+                    done.set()
+        finally:
+            conn.close()
+
+    def _enqueue(self, sql: str, params: tuple[Any, ...]) -> None:
+        self._queue.put((sql, params))
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Block until every record queued so far has been committed."""
+
+        # After close() the writer has committed everything and exited; only reads remain.
+        if self._thread.is_alive():
+            done = threading.Event()
+            self._queue.put(_Flush(done))
+            if not done.wait(timeout):
+                raise RunStoreError("Timed out waiting for the run store writer.")
+        if self._error is not None:
+            raise RunStoreError(f"Run store writes failed: {self._error}") from self._error
+
+    def close(self) -> None:
+        if self._thread.is_alive():
+            self.flush()
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    # Recording -----------------------------------------------------------
+
+    def start_run(self, workspace: Path, *, prompt: str | None = None, settings: dict[str, Any] | None = None) -> str:
+        run_id = uuid.uuid4().hex
+        self._enqueue(_INSERT_RUN, (run_id, str(workspace), prompt, "running", time.time()))
+        if settings is not None:
+            self._enqueue(_INSERT_SETTINGS, (run_id, _dumps(settings)))
+        return run_id
+
+    def finish_run(self, run_id: str, status: str) -> None:
+        self._enqueue(_FINISH_RUN, (status, time.time(), run_id))
+
+    def record_stage(
+        self,
+        run_id: str,
+        name: str,
+        status: str,
+        *,
+        metrics: dict[str, Any] | None = None,
+    ) -> None:
+        now = time.time()
+        started_at = now if status == "running" else None
+        finished_at = None if status == "running" else now
+        payload = _dumps(metrics) if metrics is not None else None
+        self._enqueue(_UPSERT_STAGE, (run_id, name, status, started_at, finished_at, payload))
+
+    def record_event(
+        self,
+        run_id: str,
+        stage: str | None,
+        message: str,
+        *,
+        kind: str = "log",
+        payload: dict[str, Any] | None = None,
+        created_at: float | None = None,
+    ) -> None:
+        encoded = _dumps(payload) if payload else None
+        self._enqueue(_INSERT_EVENT, (run_id, stage, created_at or time.time(), message, kind, encoded))
+
+    def record_artifact(self, run_id: str, name: str, payload: Any) -> None:
+        self._enqueue(_UPSERT_ARTIFACT, (run_id, name, _dumps(payload), time.time()))
+
+    # Queries -------------------------------------------------------------
+
+    def _query(self, sql: str, params: tuple[Any, ...] = ()) -> list[dict[str, Any]]:
+        with closing(self._connect()) as conn:
+            return [dict(row) for row in conn.execute(sql, params)]
+
+    def runs(self, *, limit: int = 20, offset: int = 0, status: str | None = None) -> list[dict[str, Any]]:
+        """Return the most recent runs with their event counts, newest first."""
+
+        where = "WHERE runs.status = ?" if status else ""
+        params: tuple[Any, ...] = (status,) if status else ()
+        return self._query(
+            f"""
+            SELECT runs.*, (SELECT COUNT(*) FROM events WHERE events.run_id = runs.id) AS event_count
+            FROM runs {where}
+            ORDER BY runs.started_at DESC
+            LIMIT ? OFFSET ?
+            """,
+            (*params, limit, offset),
+        )
+
+    def stages(self, run_id: str) -> list[dict[str, Any]]:
+        rows = self._query("SELECT * FROM stages WHERE run_id = ? ORDER BY started_at", (run_id,))
+        for row in rows:
+            row["metrics"] = json.loads(row["metrics"]) if row["metrics"] else None
+        return rows
+
+    def events(
+        self,
+        run_id: str,
+        *,
+        stage: str | None = None,
+        kind: str | None = None,
+        contains: str | None = None,
+        since: float | None = None,
+        after_id: int = 0,
+        limit: int = 1000,
+    ) -> list[dict[str, Any]]:
+        """Return events for ``run_id`` in order, optionally filtered, paged by id."""
+
+        clauses = ["run_id = ?", "id > ?"]
+        params: list[Any] = [run_id, after_id]
+        if stage is not None:
+            clauses.append("stage = ?")
+            params.append(stage)
+        if kind is not None:
+            clauses.append("kind = ?")
+            params.append(kind)
+        if contains:
+            clauses.append("instr(message, ?) > 0")
+            params.append(contains)
+        if since is not None:
+            clauses.append("created_at >= ?")
+            params.append(since)
+        rows = self._query(
+            f"SELECT * FROM events WHERE {' AND '.join(clauses)} ORDER BY id LIMIT ?",
+            (*params, limit),
+        )
+        for row in rows:
+            row["payload"] = json.loads(row["payload"]) if row["payload"] else None
+        return rows
+
+    def artifacts(self, run_id: str) -> dict[str, Any]:
+        rows = self._query("SELECT name, payload FROM artifacts WHERE run_id = ?", (run_id,))
+        return {row["name"]: json.loads(row["payload"]) if row["payload"] else None for row in rows}
+
+    def settings(self, run_id: str) -> dict[str, Any] | None:
+        rows = self._query("SELECT payload FROM settings WHERE run_id = ?", (run_id,))
+        return json.loads(rows[0]["payload"]) if rows else None
@@ -0,0 +1,155 @@
+"""Markdown summaries of requirement files, cached per file across runs."""
+from __future__ import annotations
+
+import json
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Sequence
+
+SUMMARY_CACHE_VERSION = 1
+SUMMARY_LIMIT = 400
+"""Maximum characters kept from each file."""
+
+_MAX_WORKERS = 16
+_FILES_PER_WORKER = 8
+"""Minimum files per reader thread; smaller batches are read inline, where a pool costs more than it saves."""
+
+
+def summarize_markdown(text: str, limit: int = SUMMARY_LIMIT) -> str:
+    """Join the leading non-empty lines of ``text`` up to ``limit`` characters."""
+
+    segments = []
+    for line in text.splitlines():
+        stripped = line.strip()
+        if not stripped:
+            continue
+        segments.append(stripped)
+        snippet = " ".join(segments)
+        if len(snippet) >= limit:
+            break
+    summary = " ".join(segments)
+    if len(summary) > limit:
+        summary = summary[:limit].rstrip() + "..."
+    return summary or "_No content available._"
+
+
+def _read(path: Path) -> bytes | OSError:
+    try:
+        return path.read_bytes()
+    except OSError as exc:
+        return exc
+
+
+def _read_all(paths: list[Path]) -> list[bytes | OSError]:
+    """Read ``paths`` in order, spreading them over reader threads in interleaved chunks."""
+
+    workers = min(_MAX_WORKERS, len(paths) // _FILES_PER_WORKER)
+    if workers < 2:
+        return [_read(path) for path in paths]
+    chunks = [paths[start::workers] for start in range(workers)]
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        chunked = list(pool.map(lambda chunk: [_read(path) for path in chunk], chunks))
+    contents: list[bytes | OSError] = [b""] * len(paths)
+    for start, chunk in enumerate(chunked):
+        contents[start::workers] = chunk
+    return contents
+
+
+@dataclass(slots=True)
+class FileSummary:
+    """Summary of one file, or the error that prevented reading it."""
+
+    path: Path
+    summary: str | None = None
+    error: OSError | None = None
+    cached: bool = False
+
+
+class SummaryCache:
+    """JSON file mapping workspace paths to summaries keyed by mtime and size.
+
+    Only files whose modification time or size changed since the last call
+    are read again. Entries for files that no longer exist are dropped when
+    the cache is saved.
+    """
+
+    def __init__(self, path: Path, *, limit: int = SUMMARY_LIMIT) -> None:
+        self.path = path.expanduser()
+        self.limit = limit
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._entries: dict[str, tuple[int, int, str]] = {}
+        try:
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+        except (OSError, ValueError):
+            return
+        if isinstance(data, dict) and data.get("version") == SUMMARY_CACHE_VERSION and data.get("limit") == limit:
+            for key, entry in data.get("files", {}).items():
+                if isinstance(entry, list) and len(entry) == 3:
+                    self._entries[key] = (entry[0], entry[1], entry[2])
+
+    def summarize(self, files: Sequence[Path], *, root: Path) -> list[FileSummary]:
+        """Summarize ``files`` concurrently, in order, reusing cached entries.
+
+        Cache keys are paths relative to ``root``, so the cache survives a
+        workspace being moved.
+        """
+
+        results: list[FileSummary] = []
+        entries: dict[str, tuple[int, int, str]] = {}
+        misses: list[tuple[int, str, os.stat_result]] = []
+        for index, path in enumerate(files):
+            key = path.relative_to(root).as_posix()
+            try:
+                stat = path.stat()
+            except OSError as exc:
+                results.append(FileSummary(path, error=exc))
+                continue
+            cached = self._entries.get(key)
+            if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+                entries[key] = cached
+                results.append(FileSummary(path, cached[2], cached=True))
+            else:
+                misses.append((index, key, stat))
+                results.append(FileSummary(path))
+
+        # Only the reads run in threads; summarizing holds the GIL and stays on this thread.
+        contents = _read_all([files[index] for index, _, _ in misses])
+        for (index, key, stat), content in zip(misses, contents):
+            if isinstance(content, OSError):
+                results[index].error = content
+                continue
+            try:
+                summary = summarize_markdown(content.decode("utf-8"), self.limit)
+            except UnicodeDecodeError as exc:
+                results[index].error = OSError(f"{files[index]} is not valid UTF-8: {exc.reason}")
+                continue
+            results[index].summary = summary
+            entries[key] = (stat.st_mtime_ns, stat.st_size, summary)
+
+        with self._lock:
+            self.hits += sum(1 for result in results if result.cached)
+            self.misses += len(misses)
+            if entries != self._entries:
+                self._entries = entries
+                self._save()
+        return results
+
+    def _save(self) -> None:
+        payload = {
+            "version": SUMMARY_CACHE_VERSION,
+            "limit": self.limit,
+            "files": {key: list(entry) for key, entry in sorted(self._entries.items())},
+        }
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = self.path.with_name(f".{self.path.name}.tmp")
+            tmp.write_text(json.dumps(payload, separators=(",", ":")) + "\n", encoding="utf-8")
+            os.replace(tmp, self.path)
+        except OSError:
+            # The cache is an optimization; failing to persist it must not fail the stage.
+            return
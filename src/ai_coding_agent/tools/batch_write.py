@@ -0,0 +1,148 @@
+"""Crash-safe batched file writes used by the ``write_many`` tool."""
+from __future__ import annotations
+
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, TypeVar
+
+PARALLEL_THRESHOLD = 16
+"""Batches with at least this many pending writes are fanned out to threads."""
+
+MAX_WORKERS = min(32, (os.cpu_count() or 1) + 4)
+
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+_T = TypeVar("_T")
+_R = TypeVar("_R")
+
+
+@dataclass(slots=True)
+class PendingWrite:
+    """A single file write planned as part of a batch."""
+
+    target: Path
+    data: bytes
+    overwrite: bool = True
+
+
+@dataclass(slots=True)
+class BatchWriteReport:
+    """Outcome of :func:`write_batch`."""
+
+    written: list[Path] = field(default_factory=list)
+    unchanged: list[Path] = field(default_factory=list)
+    skipped: list[Path] = field(default_factory=list)
+
+
+def _map(func: Callable[[_T], _R], items: list[_T]) -> list[_R]:
+    if len(items) < PARALLEL_THRESHOLD:
+        return [func(item) for item in items]
+    with ThreadPoolExecutor(max_workers=MAX_WORKERS) as pool:
+        return list(pool.map(func, items))
+
+
+def _classify(write: PendingWrite) -> str:
+    """Return ``write``, ``unchanged`` or ``skipped`` for a pending write."""
+
+    try:
+        stat = write.target.stat()
+    except FileNotFoundError:
+        return "write"
+    if not write.overwrite:
+        return "skipped"
+    if stat.st_size != len(write.data):
+        return "write"
+    try:
+        return "unchanged" if write.target.read_bytes() == write.data else "write"
+    except OSError:
+        return "write"
+
+
+def _stage(write: PendingWrite) -> Path:
+    """Write ``write.data`` to a durable temporary file next to the target."""
+
+    fd, tmp_name = tempfile.mkstemp(dir=write.target.parent, prefix=f".{write.target.name}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as handle:
+            handle.write(write.data)
+            handle.flush()
+            os.fsync(handle.fileno())
+        try:
+            mode = write.target.stat().st_mode & 0o7777
+        except FileNotFoundError:
+            mode = 0o666 & ~_UMASK
+        os.chmod(tmp_name, mode)
+    except BaseException:
+        Path(tmp_name).unlink(missing_ok=True)
+        raise
+    return Path(tmp_name)
+
+
+def _fsync_directory(directory: Path) -> None:
+    try:
+        fd = os.open(directory, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+def write_batch(writes: Iterable[PendingWrite], *, create_parents: bool = True) -> BatchWriteReport:
+    """Write many files so that no target is ever left partially written.
+
+    Files whose current content already matches are left untouched. Every
+    remaining file is staged to a fsynced temporary file in its target
+    directory (in parallel for large batches), and only once all of them are
+    staged are they renamed into place. Each parent directory is created and
+    fsynced once per batch. If staging fails, no target is modified.
+    """
+
+    planned: dict[Path, PendingWrite] = {}
+    for write in writes:
+        # Later entries for the same path win, matching sequential writes.
+        planned[write.target] = write
+    pending = list(planned.values())
+
+    report = BatchWriteReport()
+    if create_parents:
+        for parent in sorted({write.target.parent for write in pending}):
+            parent.mkdir(parents=True, exist_ok=True)
+
+    to_write: list[PendingWrite] = []
+    for write, outcome in zip(pending, _map(_classify, pending)):
+        if outcome == "write":
+            to_write.append(write)
+        elif outcome == "unchanged":
+            report.unchanged.append(write.target)
+        else:
+            report.skipped.append(write.target)
+
+    staged: list[Path | None] = [None] * len(to_write)
+
+    def stage(index: int) -> None:
+        staged[index] = _stage(to_write[index])
+
+    try:
+        _map(stage, list(range(len(to_write))))
+    except BaseException:
+        for tmp in staged:
+            if tmp is not None:
+                tmp.unlink(missing_ok=True)
+        raise
+
+    for write, tmp in zip(to_write, staged):
+        assert tmp is not None
+        os.replace(tmp, write.target)
+        report.written.append(write.target)
+
+    for directory in {write.target.parent for write in to_write}:
+        _fsync_directory(directory)
+    return report
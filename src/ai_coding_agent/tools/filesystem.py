@@ -5,10 +5,18 @@ from pathlib import Path
 from typing import Any, Optional
 
 from agents.run_context import RunContextWrapper
-from agents.tool import function_tool
+from agents.tool import default_tool_error_function, function_tool
 from pydantic import BaseModel, Field, model_validator
 
-from ..context import AgentRunState, unwrap_context
+from ..context import AgentRunState, current_stage, unwrap_context
+from .batch_write import BatchWriteReport, PendingWrite, write_batch
+from .patch import PatchError, apply_hunks, apply_replacement, content_sha256, parse_unified_diff
+from .ranged_read import read_bytes, read_lines, read_tail
+from .search_index import WorkspaceIndex
+
+
+HASH_MAX_BYTES = 1024 * 1024
+"""read_file reports a content hash for files up to this size."""
 
 
 class FileWriteRequest(BaseModel):
@@ -37,8 +45,56 @@ class FileWriteRequest(BaseModel):
         return base / self.path
 
 
+class SearchReplaceBlock(BaseModel):
+    """Literal text replacement within one file."""
+
+    search: str = Field(..., description="Exact text to find, with enough surrounding lines to be unique")
+    replace: str = Field(..., description="Text to put in its place")
+    replace_all: bool = Field(default=False, description="Replace every occurrence instead of exactly one")
+
+
+class FileEditRequest(BaseModel):
+    """Edits to one existing file, applied in order: the diff first, then each replacement."""
+
+    path: str = Field(..., description="Path of the file relative to the workspace root")
+    diff: Optional[str] = Field(default=None, description="Unified diff for this file; hunks start with @@")
+    replacements: list[SearchReplaceBlock] = Field(default_factory=list, description="Search/replace blocks")
+    expected_sha256: Optional[str] = Field(
+        default=None,
+        description="sha256 returned by read_file for the content the edit was written against",
+    )
+
+
+class PatchedFileResult(BaseModel):
+    path: str = Field(..., description="Path of the edited file relative to the workspace root")
+    sha256: str = Field(..., description="SHA-256 of the new content; pass it as expected_sha256 for further edits")
+    hunks: int = Field(default=0, description="Number of diff hunks applied")
+    replacements: int = Field(default=0, description="Number of search/replace blocks applied")
+    changed: bool = Field(default=True, description="Whether the edits changed the file")
+
+
+class ApplyPatchResult(BaseModel):
+    files: list[PatchedFileResult] = Field(default_factory=list, description="Per-file outcome")
+    written: int = Field(default=0, description="Number of files written to disk")
+
+
+class SearchHitResult(BaseModel):
+    path: str = Field(..., description="Path of the matching file relative to the workspace root")
+    line: int = Field(..., description="1-based line number of the match")
+    snippet: str = Field(..., description="The matching line, trimmed")
+    score: float = Field(..., description="Relevance score; higher is better")
+
+
+class SearchWorkspaceResult(BaseModel):
+    query: str = Field(..., description="The query that was searched for")
+    hits: list[SearchHitResult] = Field(default_factory=list, description="Ranked file:line hits")
+    files_indexed: int = Field(default=0, description="Number of files currently in the search index")
+
+
 class WriteManyResult(BaseModel):
     written: int = Field(..., description="Number of files written to disk")
+    unchanged: int = Field(default=0, description="Number of files skipped because their content was identical")
+    skipped: int = Field(default=0, description="Number of existing files left alone because overwrite was false")
 
 
 class RecordEventResult(BaseModel):
@@ -50,6 +106,20 @@ class ReadFileResult(BaseModel):
     path: str = Field(..., description="Path of the file that was read")
     content: str = Field(..., description="UTF-8 decoded content of the file (possibly truncated)")
     truncated: bool = Field(default=False, description="Whether the content was truncated due to max_bytes limit")
+    size: int = Field(default=0, description="Total size of the file in bytes")
+    offset: int = Field(default=0, description="Byte offset at which the returned content starts")
+    next_offset: Optional[int] = Field(
+        default=None,
+        description="Byte offset to pass as offset to continue reading, or null at end of file",
+    )
+    next_line: Optional[int] = Field(
+        default=None,
+        description="Line number to pass as start_line to continue a line-range read, if any",
+    )
+    sha256: Optional[str] = Field(
+        default=None,
+        description="SHA-256 of the whole file, for apply_patch's expected_sha256 (omitted for very large files)",
+    )
 
 
 @function_tool(name_override="write_many", description_override="Write multiple files to the workspace")
@@ -68,21 +138,143 @@ def write_many_tool(
     if base_path:
         workspace = workspace / base_path
 
-    written = 0
+    writes = []
     for raw in files:
         if not isinstance(raw, FileWriteRequest):
             request = FileWriteRequest.model_validate(raw)
         else:
             request = raw
-        target = request.target_path(workspace)
-        if create_parents:
-            target.parent.mkdir(parents=True, exist_ok=True)
-        if target.exists() and not request.overwrite:
-            continue
-        target.write_text(request.content, encoding=encoding)
-        written += 1
-    state.log(f"write_many wrote {written} files under {workspace}")
-    return WriteManyResult(written=written)
+        writes.append(
+            PendingWrite(
+                target=request.target_path(workspace),
+                data=request.content.encode(encoding),
+                overwrite=request.overwrite,
+            )
+        )
+
+    report = write_batch(writes, create_parents=create_parents)
+    _record_batch(state, writes, report, encoding=encoding)
+    written = len(report.written)
+    state.log(
+        f"write_many wrote {written} files under {workspace} "
+        f"({len(report.unchanged)} unchanged, {len(report.skipped)} skipped)",
+        kind="tool",
+        payload={
+            "tool": "write_many",
+            "written": [state.relative_path(path) or str(path) for path in report.written],
+            "unchanged": len(report.unchanged),
+            "skipped": [state.relative_path(path) or str(path) for path in report.skipped],
+        },
+    )
+    return WriteManyResult(written=written, unchanged=len(report.unchanged), skipped=len(report.skipped))
+
+
+def _record_batch(state: AgentRunState, writes: list[PendingWrite], report: BatchWriteReport, *, encoding: str) -> None:
+    """Update the search index, incremental bookkeeping and handoff after a batch write."""
+
+    if state.search_index is not None:
+        state.search_index.update(report.written)
+    state.record_writes([*report.written, *report.unchanged])
+    if state.handoff is not None and report.written:
+        written_paths = set(report.written)
+        stage = current_stage.get()
+        for write in writes:
+            if write.target in written_paths:
+                relative = state.relative_path(write.target) or str(write.target)
+                state.handoff.record(stage, relative, write.data, encoding=encoding)
+
+
+def _apply_edit(text: str, edit: FileEditRequest) -> tuple[str, int]:
+    crlf = "\r\n" in text
+    if crlf:
+        text = text.replace("\r\n", "\n")
+    hunks = 0
+    if edit.diff:
+        parsed = parse_unified_diff(edit.diff.replace("\r\n", "\n"))
+        text = apply_hunks(text, parsed, path=edit.path)
+        hunks = len(parsed)
+    for block in edit.replacements:
+        text = apply_replacement(
+            text,
+            block.search.replace("\r\n", "\n"),
+            block.replace.replace("\r\n", "\n"),
+            replace_all=block.replace_all,
+            path=edit.path,
+        )
+    return (text.replace("\n", "\r\n") if crlf else text), hunks
+
+
+def _patch_error(ctx: RunContextWrapper[Any], error: Exception) -> str:
+    # The model needs the reason (which hunk, which hash) to rebuild its edit.
+    if isinstance(error, (ValueError, FileNotFoundError)):
+        return f"apply_patch failed and no files were changed: {error}"
+    return default_tool_error_function(ctx, error)
+
+
+@function_tool(
+    name_override="apply_patch",
+    description_override=(
+        "Edit existing workspace files with unified diffs or search/replace blocks. "
+        "All edits are validated before any file is written; if one fails, nothing changes."
+    ),
+    failure_error_function=_patch_error,
+)
+def apply_patch_tool(
+    ctx: RunContextWrapper[AgentRunState],
+    edits: list[FileEditRequest],
+    *,
+    encoding: str = "utf-8",
+) -> ApplyPatchResult:
+    """Apply edits to many files at once, sending only the changed lines.
+
+    Args:
+        edits: Per-file edits. Several edits to the same path are applied in sequence.
+        encoding: Text encoding of the edited files.
+    """
+
+    state = unwrap_context(ctx)
+    originals: dict[Path, bytes] = {}
+    contents: dict[Path, str] = {}
+    counts: dict[Path, list[int]] = {}
+    for raw in edits:
+        edit = raw if isinstance(raw, FileEditRequest) else FileEditRequest.model_validate(raw)
+        if not edit.diff and not edit.replacements:
+            raise PatchError(f"Edit for {edit.path} has neither a diff nor replacements.")
+        target = _resolve_workspace_path(state.workspace, edit.path)
+        if target not in originals:
+            if not target.is_file():
+                raise FileNotFoundError(f"File not found: {edit.path}; create new files with write_many.")
+            originals[target] = target.read_bytes()
+            contents[target] = originals[target].decode(encoding)
+            counts[target] = [0, 0]
+        if edit.expected_sha256 and edit.expected_sha256 != content_sha256(originals[target]):
+            raise PatchError(f"{edit.path} changed since it was read (sha256 mismatch); re-read it and retry.")
+        contents[target], hunks = _apply_edit(contents[target], edit)
+        counts[target][0] += hunks
+        counts[target][1] += len(edit.replacements)
+
+    writes = [PendingWrite(target=target, data=text.encode(encoding)) for target, text in contents.items()]
+    report = write_batch(writes, create_parents=False)
+    state.record_reads(originals)
+    _record_batch(state, writes, report, encoding=encoding)
+    files = [
+        PatchedFileResult(
+            path=state.relative_path(write.target) or str(write.target),
+            sha256=content_sha256(write.data),
+            hunks=counts[write.target][0],
+            replacements=counts[write.target][1],
+            changed=write.data != originals[write.target],
+        )
+        for write in writes
+    ]
+    hunks = sum(hunks for hunks, _ in counts.values())
+    replacements = sum(replacements for _, replacements in counts.values())
+    state.log(
+        f"apply_patch edited {len(report.written)} files ({hunks} hunks, {replacements} replacements)",
+        kind="tool",
+        payload={"tool": "apply_patch", "written": [file.path for file in files if file.changed]},
+    )
+    return ApplyPatchResult(files=files, written=len(report.written))
 
 
 @function_tool(name_override="record_event", description_override="Append a structured event to the run log")
@@ -95,7 +287,7 @@ def record_event_tool(
 
     state = unwrap_context(ctx)
     message = f"[{title}] {body}"
-    state.log(message)
+    state.log(message, kind="event", payload={"title": title, "body": body})
     return RecordEventResult(status="recorded", message=message)
 
 
@@ -116,24 +308,117 @@ def read_file_tool(
     *,
     encoding: str = "utf-8",
     max_bytes: Optional[int] = 16384,
+    offset: int = 0,
+    start_line: Optional[int] = None,
+    end_line: Optional[int] = None,
+    tail_lines: Optional[int] = None,
 ) -> ReadFileResult:
-    """Return file contents (optionally truncated) for the requesting agent."""
+    """Return a window of a file for the requesting agent.
+
+    Args:
+        path: File path relative to the workspace root.
+        encoding: Text encoding used to decode the content.
+        max_bytes: Maximum number of bytes to return.
+        offset: Byte offset to start reading from; use next_offset to page.
+        start_line: First line (1-based) to return; enables line-range mode.
+        end_line: Last line (inclusive) to return in line-range mode.
+        tail_lines: Return only the last N lines of the file.
+    """
 
     state = unwrap_context(ctx)
     target = _resolve_workspace_path(state.workspace, path)
     if not target.exists() or not target.is_file():
         raise FileNotFoundError(f"File not found: {target}")
 
-    data = target.read_bytes()
-    truncated = False
-    if max_bytes is not None and len(data) > max_bytes:
-        data = data[:max_bytes]
-        truncated = True
+    utf8 = encoding.lower().replace("_", "-") in {"utf-8", "utf8", "utf-8-sig"}
+    if tail_lines is not None:
+        window = read_tail(target, lines=tail_lines, max_bytes=max_bytes, utf8=utf8)
+    elif start_line is not None or end_line is not None:
+        window = read_lines(
+            target,
+            start_line=start_line or 1,
+            end_line=end_line,
+            max_bytes=max_bytes,
+            utf8=utf8,
+        )
+    else:
+        window = read_bytes(target, offset=offset, max_bytes=max_bytes, utf8=utf8)
 
-    content = data.decode(encoding, errors="replace")
-    relative = str(target.relative_to(state.workspace))
-    state.log(f"read_file served {relative} (truncated={truncated})")
-    return ReadFileResult(path=relative, content=content, truncated=truncated)
+    content = window.data.decode(encoding, errors="replace")
+    if window.offset == 0 and window.end == window.size:
+        sha256 = content_sha256(window.data)
+    elif window.size <= HASH_MAX_BYTES:
+        sha256 = content_sha256(target.read_bytes())
+    else:
+        sha256 = None
+    relative = str(target.relative_to(state.workspace.resolve()))
+    state.record_reads([target])
+    state.log(
+        f"read_file served {relative} bytes {window.offset}-{window.end} of {window.size} "
+        f"(truncated={window.truncated})",
+        kind="tool",
+        payload={
+            "tool": "read_file",
+            "path": relative,
+            "offset": window.offset,
+            "end": window.end,
+            "size": window.size,
+            "truncated": window.truncated,
+        },
+    )
+    return ReadFileResult(
+        path=relative,
+        content=content,
+        truncated=window.truncated,
+        size=window.size,
+        offset=window.offset,
+        next_offset=window.next_offset,
+        next_line=window.next_line,
+        sha256=sha256,
+    )
+
+
+def _search_index(state: AgentRunState) -> WorkspaceIndex:
+    if state.search_index is None:
+        state.search_index = WorkspaceIndex(state.workspace)
+    return state.search_index
+
+
+@function_tool(
+    name_override="search_workspace",
+    description_override="Search workspace files for a string and return ranked file:line hits",
+)
+def search_workspace_tool(
+    ctx: RunContextWrapper[AgentRunState],
+    query: str,
+    *,
+    max_results: int = 20,
+    path_prefix: Optional[str] = None,
+) -> SearchWorkspaceResult:
+    """Find lines containing ``query`` across the workspace.
+
+    Args:
+        query: Case-insensitive text to search for, such as a symbol or phrase.
+        max_results: Maximum number of hits to return.
+        path_prefix: Only search files whose relative path starts with this prefix.
+    """
+
+    state = unwrap_context(ctx)
+    index = _search_index(state)
+    stats = index.refresh()
+    hits = index.search(query, max_results=max_results, path_prefix=path_prefix)
+    state.record_reads(state.workspace / hit.path for hit in hits)
+    state.log(
+        f"search_workspace found {len(hits)} hits for {query!r} "
+        f"({stats.files} files indexed, {stats.indexed + stats.reindexed} refreshed)",
+        kind="tool",
+        payload={"tool": "search_workspace", "query": query, "hits": [f"{hit.path}:{hit.line}" for hit in hits]},
+    )
+    return SearchWorkspaceResult(
+        query=query,
+        hits=[SearchHitResult(path=hit.path, line=hit.line, snippet=hit.snippet, score=hit.score) for hit in hits],
+        files_indexed=stats.files,
+    )
 
 
-TOOLS = [write_many_tool, record_event_tool, read_file_tool]
+TOOLS = [write_many_tool, apply_patch_tool, record_event_tool, read_file_tool, search_workspace_tool]
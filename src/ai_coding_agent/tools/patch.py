@@ -0,0 +1,133 @@
+"""Unified-diff and search/replace edits used by the ``apply_patch`` tool."""
+from __future__ import annotations
+
+import hashlib
+import re
+from dataclasses import dataclass, field
+from typing import Iterable, Sequence
+
+_HUNK_HEADER = re.compile(r"^@@+ -(\d+)(?:,(\d+))? \+(\d+)(?:,(\d+))? @@+")
+_FILE_HEADERS = ("diff --git ", "index ", "--- ", "+++ ", "new file mode", "deleted file mode", "similarity index")
+
+
+class PatchError(ValueError):
+    """Raised when an edit does not apply to the current file content."""
+
+
+def content_sha256(data: bytes) -> str:
+    return hashlib.sha256(data).hexdigest()
+
+
+@dataclass(slots=True)
+class Hunk:
+    """One ``@@`` section of a unified diff."""
+
+    old_start: int | None
+    old: list[str] = field(default_factory=list)
+    new: list[str] = field(default_factory=list)
+
+
+def parse_unified_diff(diff: str) -> list[Hunk]:
+    """Parse the hunks of a single-file unified diff.
+
+    A hunk spans the number of old and new lines its header announces, so
+    removed or added lines that look like ``---``/``+++`` headers stay part
+    of it. Past that span, file headers end the hunk while further hunk
+    lines are still accepted, since hand-written diffs often get the counts
+    wrong. A bare ``@@`` line starts a hunk that is located by its context
+    alone and runs until the next ``@@``.
+    """
+
+    hunks: list[Hunk] = []
+    current: Hunk | None = None
+    # Old and new lines the open hunk's header still expects; None for a bare ``@@``.
+    left: list[int] | None = None
+    for line in diff.splitlines():
+        if line.startswith("@@"):
+            match = _HUNK_HEADER.match(line)
+            current = Hunk(old_start=int(match.group(1)) if match else None)
+            hunks.append(current)
+            left = [int(match.group(2) or 1), int(match.group(4) or 1)] if match else None
+            continue
+        spanned = left is not None and left[0] <= 0 and left[1] <= 0
+        if current is not None and spanned and line.startswith(("--- ", "+++ ", "diff --git ")):
+            current = None
+        if current is None:
+            if line.startswith(_FILE_HEADERS) or not line.strip():
+                continue
+            raise PatchError(f"Expected a hunk header (@@ -start,count +start,count @@), got {line!r}.")
+        if line.startswith("\\"):
+            # "\ No newline at end of file"; trailing newlines are preserved from the original.
+            continue
+        marker, text = (line[:1], line[1:]) if line else (" ", "")
+        if marker == " ":
+            current.old.append(text)
+            current.new.append(text)
+        elif marker == "-":
+            current.old.append(text)
+        elif marker == "+":
+            current.new.append(text)
+        else:
+            raise PatchError(f"Unexpected line in hunk: {line!r}.")
+        if left is not None:
+            left[0] -= marker != "+"
+            left[1] -= marker != "-"
+    if not hunks:
+        raise PatchError("The diff contains no hunks.")
+    return [hunk for hunk in hunks if hunk.old != hunk.new]
+
+
+def _find(lines: Sequence[str], needle: Sequence[str], *, start: int, hint: int) -> int | None:
+    """Return the position of ``needle`` at or after ``start`` closest to ``hint``."""
+
+    if not needle:
+        return min(max(hint, start), len(lines))
+    size = len(needle)
+    last = len(lines) - size
+    if last < start:
+        return None
+    for normalize in (None, str.rstrip):
+        target = list(needle) if normalize is None else [normalize(line) for line in needle]
+        hint = min(max(hint, start), last)
+        for distance in range(max(hint - start, last - hint) + 1):
+            for position in (hint - distance, hint + distance):
+                if start <= position <= last:
+                    window = lines[position : position + size]
+                    if normalize is not None:
+                        window = [normalize(line) for line in window]
+                    if window == target:
+                        return position
+    return None
+
+
+def apply_hunks(text: str, hunks: Iterable[Hunk], *, path: str = "file") -> str:
+    """Apply ``hunks`` in order, tolerating line offsets and trailing-whitespace drift."""
+
+    lines = text.split("\n")
+    offset = 0
+    cursor = 0
+    for number, hunk in enumerate(hunks, start=1):
+        hint = cursor if hunk.old_start is None else max(hunk.old_start - 1 + offset, 0)
+        position = _find(lines, hunk.old, start=cursor, hint=hint)
+        if position is None:
+            near = f" near line {hunk.old_start}" if hunk.old_start is not None else ""
+            raise PatchError(f"Hunk {number} does not match {path}{near}; re-read the file and rebuild the diff.")
+        lines[position : position + len(hunk.old)] = hunk.new
+        offset += len(hunk.new) - len(hunk.old)
+        cursor = position + len(hunk.new)
+    return "\n".join(lines)
+
+
+def apply_replacement(text: str, search: str, replace: str, *, replace_all: bool = False, path: str = "file") -> str:
+    """Replace ``search`` in ``text``; it must match exactly once unless ``replace_all`` is set."""
+
+    if not search:
+        raise PatchError(f"Empty search text for {path}.")
+    count = text.count(search)
+    if count == 0:
+        raise PatchError(f"Search text not found in {path}: {search[:80]!r}.")
+    if count > 1 and not replace_all:
+        raise PatchError(
+            f"Search text matches {count} times in {path}; add surrounding lines or set replace_all: {search[:80]!r}."
+        )
+    return text.replace(search, replace)
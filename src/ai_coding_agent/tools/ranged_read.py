@@ -0,0 +1,159 @@
+"""Bounded reads of large files by byte range, line range or tail."""
+from __future__ import annotations
+
+import mmap
+import os
+from dataclasses import dataclass
+from pathlib import Path
+
+
+@dataclass(slots=True)
+class FileWindow:
+    """A slice of a file together with the information needed to page on."""
+
+    data: bytes
+    offset: int
+    end: int
+    size: int
+    truncated: bool = False
+    next_line: int | None = None
+
+    @property
+    def next_offset(self) -> int | None:
+        return self.end if self.end < self.size else None
+
+
+def _utf8_width(lead: int) -> int:
+    """Byte length of the UTF-8 sequence starting with ``lead``."""
+
+    if lead >= 0xF0:
+        return 4
+    if lead >= 0xE0:
+        return 3
+    if lead >= 0xC0:
+        return 2
+    return 1
+
+
+def _utf8_bounds(chunk: bytes, *, trim_start: bool, trim_end: bool) -> tuple[int, int]:
+    """Return ``(start, end)`` indexes that keep ``chunk`` on code point boundaries."""
+
+    start = 0
+    if trim_start:
+        while start < min(3, len(chunk)) and chunk[start] & 0xC0 == 0x80:
+            start += 1
+    end = len(chunk)
+    if trim_end:
+        index = end - 1
+        while index >= max(start, end - 4) and chunk[index] & 0xC0 == 0x80:
+            index -= 1
+        if index >= start and end - index < _utf8_width(chunk[index]):
+            end = index
+    return start, end
+
+
+def _window(data: bytes, offset: int, size: int, *, utf8: bool, truncated: bool = False) -> FileWindow:
+    end = offset + len(data)
+    if utf8 and data:
+        lead, trail = _utf8_bounds(data, trim_start=offset > 0, trim_end=end < size)
+        data = data[lead:trail]
+        offset += lead
+        end = offset + len(data)
+    return FileWindow(data=data, offset=offset, end=end, size=size, truncated=truncated)
+
+
+def read_bytes(path: Path, *, offset: int = 0, max_bytes: int | None = None, utf8: bool = True) -> FileWindow:
+    """Read at most ``max_bytes`` starting at ``offset`` without loading the rest.
+
+    When ``max_bytes`` is narrower than the character at ``offset``, that
+    whole character is returned instead of an empty window, so callers
+    paging by ``next_offset`` always advance.
+    """
+
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        offset = min(max(offset, 0), size)
+        handle.seek(offset)
+        length = size - offset if max_bytes is None else min(max_bytes, size - offset)
+        data = handle.read(length)
+        window = _window(data, offset, size, utf8=utf8, truncated=offset + len(data) < size)
+        if window.end == offset and data:
+            handle.seek(offset)
+            data = handle.read(_utf8_width(data[0]))
+            end = offset + len(data)
+            window = FileWindow(data=data, offset=offset, end=end, size=size, truncated=end < size)
+    return window
+
+
+def read_lines(
+    path: Path,
+    *,
+    start_line: int = 1,
+    end_line: int | None = None,
+    max_bytes: int | None = None,
+    utf8: bool = True,
+) -> FileWindow:
+    """Read lines ``start_line``..``end_line`` (1-based, inclusive) via ``mmap``."""
+
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return FileWindow(data=b"", offset=0, end=0, size=0)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            start = 0
+            for _ in range(max(start_line, 1) - 1):
+                newline = mapped.find(b"\n", start)
+                if newline == -1:
+                    return FileWindow(data=b"", offset=size, end=size, size=size)
+                start = newline + 1
+
+            stop = size
+            next_line: int | None = None
+            if end_line is not None:
+                cursor = start
+                for _ in range(max(end_line - max(start_line, 1) + 1, 0)):
+                    newline = mapped.find(b"\n", cursor)
+                    if newline == -1:
+                        cursor = size
+                        break
+                    cursor = newline + 1
+                stop = cursor
+                if stop < size:
+                    next_line = end_line + 1
+
+            truncated = False
+            if max_bytes is not None and stop - start > max_bytes:
+                stop = start + max_bytes
+                truncated = True
+                next_line = None
+            window = _window(mapped[start:stop], start, size, utf8=utf8, truncated=truncated)
+    window.next_line = next_line
+    return window
+
+
+def read_tail(path: Path, *, lines: int, max_bytes: int | None = None, utf8: bool = True) -> FileWindow:
+    """Read the last ``lines`` lines, scanning backwards from the end via ``mmap``."""
+
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if size == 0:
+            return FileWindow(data=b"", offset=0, end=0, size=0)
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            search_end = size - 1 if mapped[size - 1 : size] == b"\n" else size
+            start = 0
+            for _ in range(max(lines, 0)):
+                newline = mapped.rfind(b"\n", 0, search_end)
+                if newline == -1:
+                    start = 0
+                    break
+                start = newline + 1
+                search_end = newline
+            else:
+                if lines <= 0:
+                    start = size
+
+            truncated = False
+            if max_bytes is not None and size - start > max_bytes:
+                start = size - max_bytes
+                truncated = True
+            return _window(mapped[start:size], start, size, utf8=utf8, truncated=truncated)
@@ -0,0 +1,245 @@
+"""Incrementally maintained trigram index used by the ``search_workspace`` tool."""
+from __future__ import annotations
+
+import os
+import re
+import stat as stat_module
+import threading
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Iterable, Iterator
+
+from ..constants import STATE_DIR_NAME
+
+MAX_INDEXED_BYTES = 1024 * 1024
+"""Files larger than this are left out of the index."""
+
+IGNORED_DIRS = frozenset({STATE_DIR_NAME, ".git", ".hg", ".svn", "__pycache__", "node_modules", ".venv", "venv"})
+
+_SNIFF_BYTES = 8192
+_DEFINITION = r"\b(?:def|class|function|interface|type|struct|enum|fn|func|const|let|var)\s+{}\b"
+
+
+@dataclass(slots=True)
+class _Entry:
+    size: int
+    mtime_ns: int
+    trigrams: frozenset[str]
+
+
+@dataclass(slots=True)
+class SearchHit:
+    """A matching line within an indexed file."""
+
+    path: str
+    line: int
+    snippet: str
+    score: float
+
+
+@dataclass(slots=True)
+class IndexStats:
+    """Work done by the most recent :meth:`WorkspaceIndex.refresh`."""
+
+    indexed: int = 0
+    reindexed: int = 0
+    removed: int = 0
+    files: int = 0
+    skipped: list[str] = field(default_factory=list)
+
+
+def trigrams(text: str) -> frozenset[str]:
+    """Return the distinct lower-cased character trigrams of ``text``."""
+
+    lowered = text.lower()
+    return frozenset(lowered[index : index + 3] for index in range(len(lowered) - 2))
+
+
+def _read_text(path: Path) -> str | None:
+    try:
+        data = path.read_bytes()
+    except OSError:
+        return None
+    if b"\0" in data[:_SNIFF_BYTES]:
+        return None
+    return data.decode("utf-8", errors="replace")
+
+
+class WorkspaceIndex:
+    """Trigram inverted index over the text files of a workspace.
+
+    Each file is keyed by its relative path together with its size and
+    mtime, so :meth:`refresh` only re-reads files whose metadata changed and
+    :meth:`update` lets writers re-index exactly the paths they touched.
+    Queries use the index to narrow candidates to files containing every
+    trigram of the query, then verify and rank matching lines. Binary files
+    and files over ``max_bytes`` are not indexed.
+    """
+
+    def __init__(self, workspace: Path, *, max_bytes: int = MAX_INDEXED_BYTES) -> None:
+        self.workspace = workspace.resolve()
+        self.max_bytes = max_bytes
+        self._files: dict[str, _Entry] = {}
+        self._postings: dict[str, set[str]] = {}
+        self._lock = threading.RLock()
+
+    def __len__(self) -> int:
+        return len(self._files)
+
+    def _walk(self) -> Iterator[tuple[str, os.stat_result]]:
+        stack = [self.workspace]
+        while stack:
+            directory = stack.pop()
+            try:
+                entries = list(os.scandir(directory))
+            except (FileNotFoundError, NotADirectoryError, PermissionError):
+                continue
+            for entry in entries:
+                try:
+                    info = entry.stat(follow_symlinks=False)
+                except OSError:
+                    continue
+                if stat_module.S_ISDIR(info.st_mode):
+                    if entry.name not in IGNORED_DIRS:
+                        stack.append(Path(entry.path))
+                elif stat_module.S_ISREG(info.st_mode):
+                    yield Path(entry.path).relative_to(self.workspace).as_posix(), info
+
+    def _relative(self, path: Path | str) -> str | None:
+        candidate = Path(path)
+        if not candidate.is_absolute():
+            candidate = self.workspace / candidate
+        try:
+            relative = candidate.resolve().relative_to(self.workspace)
+        except ValueError:
+            return None
+        if any(part in IGNORED_DIRS for part in relative.parts[:-1]):
+            return None
+        return relative.as_posix()
+
+    def _drop(self, relative: str) -> bool:
+        entry = self._files.pop(relative, None)
+        if entry is None:
+            return False
+        for gram in entry.trigrams:
+            paths = self._postings.get(gram)
+            if paths is not None:
+                paths.discard(relative)
+                if not paths:
+                    del self._postings[gram]
+        return True
+
+    def _index(self, relative: str, info: os.stat_result) -> bool:
+        self._drop(relative)
+        if info.st_size > self.max_bytes:
+            return False
+        text = _read_text(self.workspace / relative)
+        if text is None:
+            return False
+        grams = trigrams(text)
+        self._files[relative] = _Entry(size=info.st_size, mtime_ns=info.st_mtime_ns, trigrams=grams)
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(relative)
+        return True
+
+    def refresh(self) -> IndexStats:
+        """Bring the index up to date with the workspace, re-reading only changed files."""
+
+        stats = IndexStats()
+        with self._lock:
+            seen: set[str] = set()
+            for relative, info in self._walk():
+                seen.add(relative)
+                known = self._files.get(relative)
+                if known is not None and known.size == info.st_size and known.mtime_ns == info.st_mtime_ns:
+                    continue
+                if self._index(relative, info):
+                    if known is None:
+                        stats.indexed += 1
+                    else:
+                        stats.reindexed += 1
+                else:
+                    stats.skipped.append(relative)
+            for relative in [relative for relative in self._files if relative not in seen]:
+                self._drop(relative)
+                stats.removed += 1
+            stats.files = len(self._files)
+        return stats
+
+    def update(self, paths: Iterable[Path | str]) -> None:
+        """Re-index ``paths`` after they were written or removed."""
+
+        with self._lock:
+            for path in paths:
+                relative = self._relative(path)
+                if relative is None:
+                    continue
+                try:
+                    info = os.stat(self.workspace / relative, follow_symlinks=False)
+                except FileNotFoundError:
+                    self._drop(relative)
+                    continue
+                if stat_module.S_ISREG(info.st_mode):
+                    self._index(relative, info)
+
+    def candidates(self, query: str) -> list[str]:
+        """Return indexed paths that may contain ``query`` (case-insensitive)."""
+
+        with self._lock:
+            grams = trigrams(query)
+            if not grams:
+                return sorted(self._files)
+            postings = sorted((self._postings.get(gram, set()) for gram in grams), key=len)
+            matched = set(postings[0])
+            for paths in postings[1:]:
+                matched &= paths
+                if not matched:
+                    break
+            return sorted(matched)
+
+    def search(
+        self,
+        query: str,
+        *,
+        max_results: int = 20,
+        path_prefix: str | None = None,
+        snippet_chars: int = 200,
+    ) -> list[SearchHit]:
+        """Return the best ``max_results`` line hits for ``query``, highest score first."""
+
+        needle = query.strip().lower()
+        if not needle:
+            return []
+        definition = re.compile(_DEFINITION.format(re.escape(needle)), re.IGNORECASE)
+        word = re.compile(rf"(?<!\w){re.escape(needle)}(?!\w)", re.IGNORECASE)
+
+        hits: list[SearchHit] = []
+        for relative in self.candidates(needle):
+            if path_prefix and not relative.startswith(path_prefix):
+                continue
+            text = _read_text(self.workspace / relative)
+            if text is None:
+                continue
+            path_bonus = 2.0 if needle in relative.lower() else 0.0
+            file_hits: list[SearchHit] = []
+            for number, line in enumerate(text.splitlines(), start=1):
+                if needle not in line.lower():
+                    continue
+                score = 1.0 + path_bonus
+                if word.search(line):
+                    score += 1.0
+                if definition.search(line):
+                    score += 3.0
+                snippet = line.strip()
+                if len(snippet) > snippet_chars:
+                    column = max(snippet.lower().find(needle) - snippet_chars // 4, 0)
+                    snippet = snippet[column : column + snippet_chars]
+                file_hits.append(SearchHit(path=relative, line=number, snippet=snippet, score=score))
+            # Files with many matches are more relevant, but with diminishing returns.
+            density = min(len(file_hits), 10) * 0.1
+            for hit in file_hits:
+                hit.score += density
+            hits.extend(file_hits)
+
+        hits.sort(key=lambda hit: (-hit.score, hit.path, hit.line))
+        return hits[:max_results]
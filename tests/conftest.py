@@ -0,0 +1,56 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+from typing import Any
+
+import pytest
+from agents import FunctionTool
+from agents.tool_context import ToolContext
+
+from ai_coding_agent.config import AgentRuntimeSettings, CacheMode, ModelBackend
+from ai_coding_agent.context import AgentRunState
+from ai_coding_agent.plan import AgentProjectPlan
+
+PLAN_PATH = Path(__file__).resolve().parents[1] / "docs" / "agent_project_plan.json"
+
+
+@pytest.fixture
+def plan() -> AgentProjectPlan:
+    return AgentProjectPlan.load(PLAN_PATH)
+
+
+@pytest.fixture
+def stub_settings(tmp_path: Path):
+    """Offline pipeline settings; pass a script dict to replay it instead of the built-in steps."""
+
+    def make(script: dict | None = None, **overrides) -> AgentRuntimeSettings:
+        values = {"model_backend": ModelBackend.STUB, "cache_mode": CacheMode.OFF}
+        if script is not None:
+            path = tmp_path / "script.json"
+            path.write_text(json.dumps(script), encoding="utf-8")
+            values["model_script"] = path
+        values.update(overrides)
+        return AgentRuntimeSettings(**values)
+
+    return make
+
+
+@pytest.fixture
+def state(tmp_path: Path, plan: AgentProjectPlan) -> AgentRunState:
+    workspace = tmp_path / "workspace"
+    workspace.mkdir()
+    return AgentRunState(workspace=workspace, plan=plan)
+
+
+@pytest.fixture
+def invoke(state: AgentRunState):
+    """Call a function tool the way the runner does, against ``state``, and return its result."""
+
+    def call(tool: FunctionTool, **arguments: Any) -> Any:
+        payload = json.dumps(arguments)
+        context = ToolContext(state, tool_name=tool.name, tool_call_id="call_test", tool_arguments=payload)
+        return asyncio.run(tool.on_invoke_tool(context, payload))
+
+    return call
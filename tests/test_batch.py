@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import shutil
+from pathlib import Path
+
+import pytest
+
+from ai_coding_agent.agents.batch import BatchManifestError, BatchRunner, load_jobs
+
+PLAN_PATH = Path(__file__).resolve().parents[1] / "docs" / "agent_project_plan.json"
+
+
+def _plans(directory: Path, *names: str) -> Path:
+    directory.mkdir(parents=True, exist_ok=True)
+    for name in names:
+        shutil.copy(PLAN_PATH, directory / f"{name}.json")
+    return directory
+
+
+def test_load_jobs_from_directory_uses_plan_stems(tmp_path: Path) -> None:
+    source = _plans(tmp_path / "plans", "alpha", "beta")
+
+    jobs = load_jobs(source, output_root=tmp_path / "out")
+
+    assert [job.name for job in jobs] == ["alpha", "beta"]
+    assert [job.workspace for job in jobs] == [tmp_path / "out" / "alpha", tmp_path / "out" / "beta"]
+
+
+def test_load_jobs_from_manifest_resolves_relative_paths(tmp_path: Path) -> None:
+    _plans(tmp_path / "plans", "alpha")
+    manifest = tmp_path / "runs.jsonl"
+    manifest.write_text(
+        json.dumps("plans/alpha.json")
+        + "\n"
+        + json.dumps({"plan": "plans/alpha.json", "name": "tuned", "settings": {"max_turns": 3}})
+        + "\n",
+        encoding="utf-8",
+    )
+
+    first, second = load_jobs(manifest, output_root=tmp_path / "out")
+
+    assert first.plan_path == (tmp_path / "plans" / "alpha.json").resolve()
+    assert second.name == "tuned" and second.settings == {"max_turns": 3}
+    assert second.workspace == tmp_path / "out" / "tuned"
+
+
+@pytest.mark.parametrize(
+    "runs, message",
+    [
+        ([], "No plans found"),
+        ([{"name": "missing plan"}], "'plan' key"),
+        (["a.json", {"plan": "b.json", "workspace": "a"}], "share workspace"),
+    ],
+)
+def test_load_jobs_rejects_bad_manifests(tmp_path: Path, runs: list, message: str) -> None:
+    manifest = tmp_path / "runs.json"
+    manifest.write_text(json.dumps({"runs": runs}), encoding="utf-8")
+
+    with pytest.raises(BatchManifestError, match=message):
+        load_jobs(manifest, output_root=tmp_path / "out")
+
+
+def test_batch_runs_every_job_and_isolates_failures(tmp_path: Path, stub_settings) -> None:
+    source = _plans(tmp_path / "plans", "alpha", "beta")
+    (source / "broken.json").write_text("{not json", encoding="utf-8")
+    jobs = load_jobs(source, output_root=tmp_path / "out")
+    runner = BatchRunner(jobs, settings=stub_settings(run_store=False, snapshots=False), max_concurrency=2)
+    reported: list[str] = []
+
+    results = asyncio.run(runner.run(on_result=lambda result: reported.append(result.job.name)))
+
+    assert [result.job.name for result in results] == ["alpha", "beta", "broken"]
+    assert [result.status for result in results] == ["completed", "completed", "failed"]
+    assert sorted(reported) == ["alpha", "beta", "broken"]
+    assert results[2].state is None and "JSONDecodeError" in results[2].error
+    for result in results[:2]:
+        assert result.state.workspace == tmp_path / "out" / result.job.name
+        assert result.as_dict()["totals"]["turns"] > 0
@@ -0,0 +1,76 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+import pytest
+
+from ai_coding_agent.tools import batch_write
+from ai_coding_agent.tools.batch_write import PendingWrite, write_batch
+from ai_coding_agent.tools.filesystem import write_many_tool
+
+
+def test_later_writes_to_the_same_path_win(tmp_path: Path) -> None:
+    target = tmp_path / "a.txt"
+    report = write_batch([PendingWrite(target, b"first"), PendingWrite(target, b"second")])
+    assert target.read_bytes() == b"second"
+    assert report.written == [target]
+
+
+def test_unchanged_and_skipped_files_are_not_rewritten(tmp_path: Path) -> None:
+    same = tmp_path / "same.txt"
+    keep = tmp_path / "keep.txt"
+    same.write_bytes(b"content")
+    keep.write_bytes(b"original")
+    before = same.stat().st_ino
+
+    report = write_batch([PendingWrite(same, b"content"), PendingWrite(keep, b"new", overwrite=False)])
+
+    assert report.unchanged == [same] and report.skipped == [keep] and report.written == []
+    assert same.stat().st_ino == before
+    assert keep.read_bytes() == b"original"
+
+
+def test_existing_permissions_are_kept(tmp_path: Path) -> None:
+    script = tmp_path / "run.sh"
+    script.write_bytes(b"#!/bin/sh\n")
+    os.chmod(script, 0o755)
+    write_batch([PendingWrite(script, b"#!/bin/sh\necho hi\n")])
+    assert script.stat().st_mode & 0o777 == 0o755
+
+
+def test_large_batches_create_parents_and_leave_no_temp_files(tmp_path: Path) -> None:
+    writes = [PendingWrite(tmp_path / f"dir{index % 4}" / f"{index}.txt", str(index).encode()) for index in range(40)]
+    report = write_batch(writes)
+    assert len(report.written) == 40
+    assert (tmp_path / "dir3" / "39.txt").read_bytes() == b"39"
+    assert not list(tmp_path.rglob("*.tmp"))
+
+
+def test_failed_staging_leaves_every_target_untouched(tmp_path: Path, monkeypatch) -> None:
+    first = tmp_path / "first.txt"
+    first.write_bytes(b"old")
+    real_stage = batch_write._stage
+
+    def stage(write: PendingWrite) -> Path:
+        if write.target.name == "second.txt":
+            raise OSError("disk full")
+        return real_stage(write)
+
+    monkeypatch.setattr(batch_write, "_stage", stage)
+    with pytest.raises(OSError):
+        write_batch([PendingWrite(first, b"new"), PendingWrite(tmp_path / "second.txt", b"x")])
+
+    assert first.read_bytes() == b"old"
+    assert not (tmp_path / "second.txt").exists()
+    assert not list(tmp_path.glob(".*.tmp"))
+
+
+def test_write_many_records_stage_writes(state, invoke) -> None:
+    result = invoke(
+        write_many_tool,
+        files=[{"path": "src/app.py", "content": "print('hi')\n"}, {"path": "README.md", "content": "# App\n"}],
+    )
+    assert result.written == 2
+    assert (state.workspace / "src" / "app.py").read_text() == "print('hi')\n"
+    assert state.events.query(kind="tool")[-1].payload["written"] == ["src/app.py", "README.md"]
@@ -0,0 +1,15 @@
+from __future__ import annotations
+
+from ai_coding_agent.bench.pipeline import bench_pipeline
+from ai_coding_agent.config import AgentRuntimeSettings
+
+
+def test_bench_pipeline_reports_simulated_model_time(plan) -> None:
+    settings = AgentRuntimeSettings(run_store=False, snapshots=False)
+    assert settings.request_scheduler
+
+    results = bench_pipeline(plan, iterations=1, warmup=0, latency=0.01, settings=settings)
+
+    # Two model turns per stage, four stages.
+    assert results["model"]["median"] >= 8 * 0.01
+    assert set(results["stages"]) == {"requirements", "coding", "testing", "documentation"}
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+from ai_coding_agent.bench.harness import BenchContext, compare, results_document
+from ai_coding_agent.bench.suite import run_suite, select
+
+
+def test_select_filters_by_pattern_and_quick() -> None:
+    names = [case.name for case in select(["write_many"], quick=True)]
+    assert "write_many[10]" in names
+    assert "write_many[10000]" not in names
+    assert "write_many[10000]" in [case.name for case in select(["write_many"])]
+
+
+def test_quick_cases_run_and_compare(tmp_path: Path) -> None:
+    context = BenchContext(scratch=tmp_path, quick=True, large_file_bytes=256 * 1024)
+    cases = select(["write_many[10]", "apply_patch", "read_file", "to_prompt_block[bundled]", "requirements_summary[100]"])
+    seen: list[str] = []
+
+    results = run_suite(context, cases, repeat=2, on_result=lambda case, samples, skipped: seen.append(case.name))
+
+    assert seen == [case.name for case in cases]
+    for name, stats in results.items():
+        assert stats["samples"] == 2 and len(stats["values"]) == 2, name
+        assert 0 < stats["min"] <= stats["median"] <= stats["max"]
+
+    document = results_document(results, groups={case.name: case.group for case in cases})
+    rows = compare(document, document)
+    assert {row["ratio"] for row in rows} == {1.0}
@@ -0,0 +1,73 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+from typer.testing import CliRunner
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.cli import app
+from ai_coding_agent.config import PromptJsonMode
+
+PLAN_PATH = Path(__file__).resolve().parents[1] / "docs" / "agent_project_plan.json"
+
+
+@pytest.mark.parametrize("stream", ["--stream", "--no-stream"])
+def test_run_closes_the_pipeline(tmp_path: Path, monkeypatch, stream: str) -> None:
+    closed: list[MultiAgentPipeline] = []
+    aclose = MultiAgentPipeline.aclose
+
+    async def spy(self: MultiAgentPipeline) -> None:
+        closed.append(self)
+        await aclose(self)
+
+    monkeypatch.setattr(MultiAgentPipeline, "aclose", spy)
+
+    result = CliRunner().invoke(
+        app,
+        ["run", str(tmp_path / "workspace"), "--input-plan", str(PLAN_PATH), "--model-backend", "stub", stream],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert len(closed) == 1
+    assert closed[0].run_store is not None and not closed[0].run_store._thread.is_alive()
+
+
+def test_run_batch_passes_prompt_budgets_to_each_job(tmp_path: Path, monkeypatch) -> None:
+    plans = tmp_path / "plans"
+    plans.mkdir()
+    for name in ("a", "b"):
+        (plans / f"{name}.json").write_text(PLAN_PATH.read_text(encoding="utf-8"), encoding="utf-8")
+    seen: list[MultiAgentPipeline] = []
+    init = MultiAgentPipeline.__init__
+
+    def spy(self: MultiAgentPipeline, *args, **kwargs) -> None:
+        init(self, *args, **kwargs)
+        seen.append(self)
+
+    monkeypatch.setattr(MultiAgentPipeline, "__init__", spy)
+
+    result = CliRunner().invoke(
+        app,
+        [
+            "run-batch",
+            str(plans),
+            "--output-dir",
+            str(tmp_path / "out"),
+            "--model-backend",
+            "stub",
+            "--plan-json",
+            "minified",
+            "--plan-max-tokens",
+            "500",
+            "--handoff-max-tokens",
+            "0",
+        ],
+    )
+
+    assert result.exit_code == 0, result.output
+    assert len(seen) == 2
+    for pipeline in seen:
+        assert pipeline.settings.plan_prompt_json is PromptJsonMode.MINIFIED
+        assert pipeline.settings.plan_prompt_max_tokens == 500
+        assert pipeline.settings.handoff_max_tokens is None
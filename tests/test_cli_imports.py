@@ -0,0 +1,24 @@
+from __future__ import annotations
+
+import subprocess
+import sys
+
+import pytest
+
+HEAVY = ("agents", "openai", "rich", "pydantic")
+
+
+def _loaded_after(code: str) -> set[str]:
+    script = f"import sys\n{code}\nprint(' '.join(name for name in {HEAVY!r} if name in sys.modules))"
+    completed = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return set(completed.stdout.split())
+
+
+@pytest.mark.parametrize("module", ["ai_coding_agent", "ai_coding_agent.cli", "ai_coding_agent.constants"])
+def test_importing_the_cli_loads_no_heavy_dependencies(module: str) -> None:
+    assert _loaded_after(f"import {module}") == set()
+
+
+def test_help_does_not_load_the_agents_sdk() -> None:
+    code = "from typer.testing import CliRunner\nfrom ai_coding_agent.cli import app\nCliRunner().invoke(app, ['run', '--help'])"
+    assert not {"agents", "openai"} & _loaded_after(code)
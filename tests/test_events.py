@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+import asyncio
+import json
+import threading
+from pathlib import Path
+
+import pytest
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.constants import STATE_DIR_NAME
+from ai_coding_agent.events import EventLog, EventRecord, JsonlEventSink, RunStoreEventSink
+from ai_coding_agent.store import RunStore
+
+
+def _record(index: int, *, stage: str = "coding", kind: str = "log") -> EventRecord:
+    return EventRecord(float(index), stage, kind, f"event {index}", {"index": index})
+
+
+def test_ring_buffer_drops_oldest_without_a_sink() -> None:
+    log = EventLog(capacity=3)
+    for index in range(5):
+        log.append(_record(index))
+
+    assert [record.message for record in log] == ["event 2", "event 3", "event 4"]
+    assert log.dropped == 2 and log.total == 5
+
+
+def test_evicted_records_spill_to_jsonl_and_stay_queryable(tmp_path: Path) -> None:
+    sink = JsonlEventSink(tmp_path / "events.jsonl")
+    log = EventLog(capacity=2, sink=sink)
+    for index in range(5):
+        log.append(_record(index, stage="coding" if index % 2 else "testing"))
+
+    assert len(log) == 2 and log.spilled == 3
+    assert [record.timestamp for record in log.query()] == [0.0, 1.0, 2.0, 3.0, 4.0]
+    assert [record.message for record in log.query(stage="coding")] == ["event 1", "event 3"]
+    assert [record.payload for record in log.query(limit=2)] == [{"index": 3}, {"index": 4}]
+
+    log.close()
+    assert len((tmp_path / "events.jsonl").read_text().splitlines()) == 3
+
+
+def test_jsonl_sink_writes_on_a_background_thread(tmp_path: Path, monkeypatch) -> None:
+    writers: list[threading.Thread] = []
+    dumps = json.dumps
+
+    def spy(*args, **kwargs):
+        writers.append(threading.current_thread())
+        return dumps(*args, **kwargs)
+
+    monkeypatch.setattr("ai_coding_agent.events.json.dumps", spy)
+    sink = JsonlEventSink(tmp_path / "events.jsonl")
+    sink.write(_record(index) for index in range(50))
+
+    assert [record.message for record in sink.read(contains="event 4")][:2] == ["event 4", "event 40"]
+    assert len(writers) == 50 and threading.current_thread() not in writers
+    sink.close()
+    assert len((tmp_path / "events.jsonl").read_text().splitlines()) == 50
+
+
+def test_jsonl_sink_reports_write_failures_on_read(tmp_path: Path) -> None:
+    blocker = tmp_path / "not-a-directory"
+    blocker.write_text("")
+    sink = JsonlEventSink(blocker / "events.jsonl")
+
+    sink.write([_record(0)])
+
+    with pytest.raises(OSError):
+        list(sink.read())
+    sink.close()
+
+
+@pytest.mark.parametrize(
+    "filters, expected",
+    [
+        ({"kind": "tool"}, [1, 3]),
+        ({"contains": "event 2"}, [2]),
+        ({"since": 3.0}, [3, 4]),
+        ({"stage": "testing", "kind": "log"}, [0, 2, 4]),
+    ],
+)
+def test_query_filters(filters: dict, expected: list[int]) -> None:
+    log = EventLog()
+    for index in range(5):
+        log.append(_record(index, stage="testing", kind="tool" if index % 2 else "log"))
+
+    assert [record.payload["index"] for record in log.query(**filters)] == expected
+
+
+def test_run_store_sink_reads_spilled_events_from_the_store(tmp_path: Path) -> None:
+    store = RunStore(tmp_path / "runs.sqlite3")
+    try:
+        run_id = store.start_run(tmp_path)
+        log = EventLog(capacity=2, sink=RunStoreEventSink(store, run_id))
+        for index in range(4):
+            record = _record(index, kind="tool" if index == 1 else "log")
+            store.record_event(
+                run_id, record.stage, record.message, kind=record.kind, payload=record.payload, created_at=1.0 + index
+            )
+            log.append(record)
+
+        assert log.spilled == 2
+        assert [record.message for record in log.query()] == ["event 0", "event 1", "event 2", "event 3"]
+        assert [record.payload for record in log.query(kind="tool")] == [{"index": 1}]
+    finally:
+        store.close()
+
+
+def test_capacity_must_be_positive() -> None:
+    with pytest.raises(ValueError):
+        EventLog(capacity=0)
+
+
+def test_runs_in_one_workspace_spill_to_separate_files(tmp_path: Path, plan, stub_settings) -> None:
+    settings = stub_settings(run_store=False, snapshots=False, event_buffer_size=1)
+
+    states = [
+        asyncio.run(MultiAgentPipeline(workspace=tmp_path, plan=plan, settings=settings).run(prompt))
+        for prompt in ("First", "Second")
+    ]
+
+    assert len(list((tmp_path / STATE_DIR_NAME / "events").glob("*.jsonl"))) == 2
+    for state in states:
+        starts = [record for record in state.events.query() if record.message == "Pipeline start"]
+        assert len(starts) == 1
+        assert len(state.events.query()) == state.events.total
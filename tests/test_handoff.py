@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from pathlib import Path
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.events import EventRecord, RunStoreEventSink
+from ai_coding_agent.handoff import HandoffCompactor, outline
+from ai_coding_agent.plan import estimate_tokens
+
+PYTHON = '''"""Task service."""
+import json
+
+
+class TaskService:
+    def create(self, title):
+        return title
+
+
+async def sync_tasks():
+    pass
+'''
+
+
+def test_outline_picks_structure_by_file_type() -> None:
+    assert outline("app/service.py", PYTHON) == (
+        "class TaskService",
+        "    def create(self, title)",
+        "async def sync_tasks()",
+    )
+    assert outline("README.md", "# Title\ntext\n## Usage\n") == ("# Title", "## Usage")
+    assert outline("config.json", '{"name": "x", "version": 1}') == ("name", "version")
+    assert outline("pyproject.toml", "[project]\nname = 'x'\n  nested = 1\n") == ("[project]", "name = 'x'")
+
+
+def test_outline_falls_back_to_first_line_and_caps_entries() -> None:
+    assert outline("notes.txt", "\n  plain prose only\nmore\n") == ("plain prose only",)
+    many = "".join(f"def f{index}():\n    pass\n" for index in range(100))
+    assert len(outline("many.py", many, max_entries=5)) == 5
+
+
+def test_packet_lists_files_events_and_outlines_for_selected_stages() -> None:
+    compactor = HandoffCompactor()
+    compactor.record("coding", "app/service.py", PYTHON.encode())
+    compactor.record("documentation", "README.md", b"# Docs\n")
+    events = [
+        EventRecord(1.0, "coding", "event", "Chose SQLite for storage"),
+        EventRecord(2.0, "documentation", "event", "Wrote the README"),
+    ]
+
+    packet = compactor.packet(["coding"], events=events)
+
+    assert "## Handoff from coding" in packet
+    assert "- app/service.py (11 lines" in packet
+    assert "Chose SQLite for storage" in packet
+    assert "class TaskService" in packet
+    assert "README.md" not in packet and "Wrote the README" not in packet
+    assert compactor.packet(["testing"]) == ""
+
+
+def test_rewriting_a_file_replaces_its_outline() -> None:
+    compactor = HandoffCompactor()
+    compactor.record("coding", "a.py", b"def old():\n    pass\n")
+    compactor.record("coding", "b.py", b"def other():\n    pass\n")
+    compactor.record("coding", "a.py", b"def new():\n    pass\n")
+
+    assert [entry.path for entry in compactor.files()] == ["b.py", "a.py"]
+    assert compactor.files()[-1].entries == ("def new()",)
+
+
+def test_packet_stays_within_budget_and_reports_omissions() -> None:
+    compactor = HandoffCompactor()
+    for index in range(200):
+        compactor.record("coding", f"pkg/module_{index:03d}.py", PYTHON.encode())
+
+    packet = compactor.packet(["coding"], max_tokens=500)
+
+    assert estimate_tokens(packet) <= 520
+    assert "more" in packet
+    # The file list may not use the whole budget: some outlines still fit.
+    assert "### Outlines" in packet and "class TaskService" in packet
+
+
+def test_downstream_stages_receive_a_handoff(tmp_path: Path, plan, stub_settings) -> None:
+    script = {
+        "stages": {
+            "requirements": [
+                {
+                    "tool_calls": [
+                        {"name": "write_many", "arguments": {"files": [{"path": "docs/SPEC.md", "content": "# Spec\n"}]}}
+                    ]
+                },
+                {"text": "done"},
+            ]
+        },
+        "default": [{"text": "done"}],
+    }
+    settings = stub_settings(script, run_store=False, snapshots=False, handoff_max_tokens=1000)
+    pipeline = MultiAgentPipeline(workspace=tmp_path, plan=plan, settings=settings)
+
+    state = asyncio.run(pipeline.run("Build it"))
+
+    handoffs = state.events.query(contains="Handoff for")
+    stages = sorted(event.message.split()[2].rstrip(":") for event in handoffs)
+    assert stages == ["coding", "documentation", "testing"]
+    for event in handoffs:
+        assert event.payload["upstream"] == ["requirements"] and event.payload["files"] == 1
+
+
+def test_spilled_history_for_handoffs_is_read_off_the_event_loop(
+    tmp_path: Path, plan, stub_settings, monkeypatch
+) -> None:
+    threads: list[threading.Thread] = []
+    read = RunStoreEventSink.read
+
+    def spy(self, **filters):
+        threads.append(threading.current_thread())
+        return read(self, **filters)
+
+    monkeypatch.setattr(RunStoreEventSink, "read", spy)
+    settings = stub_settings(
+        snapshots=False,
+        handoff_max_tokens=1000,
+        event_buffer_size=2,
+        run_store_path=tmp_path / "runs.sqlite3",
+    )
+    pipeline = MultiAgentPipeline(workspace=tmp_path / "workspace", plan=plan, settings=settings)
+
+    async def run() -> None:
+        try:
+            await pipeline.run("Build it")
+        finally:
+            await pipeline.aclose()
+
+    asyncio.run(run())
+
+    assert threads
+    assert threading.main_thread() not in threads
@@ -0,0 +1,60 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.incremental import FingerprintStore, StageRecord
+
+
+def _run(workspace: Path, plan, settings) -> dict[str, bool]:
+    pipeline = MultiAgentPipeline(workspace=workspace, plan=plan, settings=settings)
+    state = asyncio.run(pipeline.run("Build it"))
+    return {name: metrics.skipped for name, metrics in state.stage_metrics.items()}
+
+
+def test_unchanged_run_skips_every_stage(tmp_path: Path, plan, stub_settings) -> None:
+    settings = stub_settings(incremental=True, run_store=False, snapshots=False)
+    assert not any(_run(tmp_path, plan, settings).values())
+    assert all(_run(tmp_path, plan, settings).values())
+
+
+def test_editing_an_output_reruns_its_stage(tmp_path: Path, plan, stub_settings) -> None:
+    settings = stub_settings(incremental=True, run_store=False, snapshots=False)
+    _run(tmp_path, plan, settings)
+    (tmp_path / "stub" / "testing" / "testing.md").write_text("edited\n", encoding="utf-8")
+
+    skipped = _run(tmp_path, plan, settings)
+
+    assert skipped == {"requirements": True, "coding": True, "testing": False, "documentation": True}
+
+
+def test_plan_edit_without_requirements_files_reruns_only_dependent_stages(
+    tmp_path: Path, plan, stub_settings
+) -> None:
+    # The requirements stage writes nothing, so requirements_summary stays the plan block.
+    script = {"stages": {"requirements": [{"text": "Nothing to write."}]}}
+    settings = stub_settings(script, incremental=True, run_store=False, snapshots=False)
+    _run(tmp_path, plan, settings)
+
+    plan.requirements["risks"] = ["A new risk no stage depends on"]
+    skipped = _run(tmp_path, plan, settings)
+    assert skipped == {"requirements": False, "coding": True, "testing": True, "documentation": True}
+
+    plan.requirements["specifications"] = {"changed": True}
+    skipped = _run(tmp_path, plan, settings)
+    assert skipped == {"requirements": False, "coding": False, "testing": False, "documentation": True}
+
+
+def test_fingerprint_store_round_trip(tmp_path: Path) -> None:
+    (tmp_path / "out.txt").write_text("data", encoding="utf-8")
+    store = FingerprintStore(tmp_path / "fingerprints.json")
+    store.put("coding", StageRecord.capture(tmp_path, "abc", reads=[], outputs=["out.txt"], artifacts={"a": 1}))
+
+    record = FingerprintStore(tmp_path / "fingerprints.json").get("coding")
+
+    assert record is not None
+    assert record.stale_reason(tmp_path, "abc") is None
+    assert record.stale_reason(tmp_path, "other") is not None
+    (tmp_path / "out.txt").write_text("changed", encoding="utf-8")
+    assert record.stale_reason(tmp_path, "abc") is not None
@@ -0,0 +1,47 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.metrics import StageMetrics, summarize
+
+
+def test_summarize_totals_stages_and_tools() -> None:
+    first = StageMetrics(stage="a", input_tokens=10, output_tokens=5, turns=1)
+    first.tool_started("write_many")
+    first.tool_finished("write_many", 0.5)
+    second = StageMetrics(stage="b", input_tokens=1, output_tokens=1, turns=2, skipped=True)
+    second.tool_started("write_many")
+    for metrics in (first, second):
+        metrics.finish()
+
+    totals = summarize([first, second])["totals"]
+
+    assert (totals["input_tokens"], totals["output_tokens"], totals["total_tokens"]) == (11, 6, 17)
+    assert (totals["turns"], totals["tool_calls"], totals["skipped_stages"]) == (3, 2, 1)
+    assert totals["tools"]["write_many"] == {"calls": 2, "completed": 1, "seconds": 0.5}
+
+
+def test_pipeline_records_usage_per_stage_and_exports_json(tmp_path: Path, plan, stub_settings) -> None:
+    write = {
+        "tool_calls": [{"name": "write_many", "arguments": {"files": [{"path": "x.txt", "content": "x"}]}}],
+        "usage": {"input_tokens": 100, "output_tokens": 20},
+    }
+    script = {"default": [write, {"text": "done", "usage": {"input_tokens": 50, "output_tokens": 5}}]}
+    settings = stub_settings(script, run_store=False, snapshots=False, metrics_path=tmp_path / "metrics.json")
+    pipeline = MultiAgentPipeline(workspace=tmp_path / "workspace", plan=plan, settings=settings)
+
+    state = asyncio.run(pipeline.run("Build it"))
+
+    coding = state.stage_metrics["coding"]
+    assert (coding.turns, coding.input_tokens, coding.output_tokens) == (2, 150, 25)
+    assert coding.tools["write_many"].calls == coding.tools["write_many"].completed == 1
+    assert coding.latency is not None and coding.latency > 0
+
+    exported = json.loads((tmp_path / "metrics.json").read_text())
+    assert exported["status"] == "completed"
+    assert exported["totals"]["input_tokens"] == 4 * 150
+    assert [row["stage"] for row in exported["stages"]][0] == "requirements"
+    assert state.artifacts["metrics_path"] == str(tmp_path / "metrics.json")
@@ -0,0 +1,159 @@
+from __future__ import annotations
+
+import pytest
+
+from ai_coding_agent.tools.filesystem import apply_patch_tool
+from ai_coding_agent.tools.patch import (
+    PatchError,
+    apply_hunks,
+    apply_replacement,
+    content_sha256,
+    parse_unified_diff,
+)
+
+SOURCE = "".join(f"line {index}\n" for index in range(1, 21))
+
+
+def test_parse_skips_file_headers_and_context_only_hunks() -> None:
+    diff = "--- a/f.py\n+++ b/f.py\n@@ -2,3 +2,3 @@\n line 2\n-line 3\n+LINE 3\n line 4\n@@ -9 +9 @@\n line 9\n"
+
+    hunks = parse_unified_diff(diff)
+
+    assert len(hunks) == 1
+    assert hunks[0].old_start == 2
+    assert hunks[0].old == ["line 2", "line 3", "line 4"]
+    assert hunks[0].new == ["line 2", "LINE 3", "line 4"]
+
+
+def test_removed_and_added_lines_that_look_like_file_headers_stay_in_the_hunk() -> None:
+    text = "SELECT 1;\n-- old comment\nSELECT 2;\n"
+    diff = "@@ -1,3 +1,3 @@\n SELECT 1;\n--- old comment\n+-- new comment\n SELECT 2;\n"
+
+    hunks = parse_unified_diff(diff)
+
+    assert hunks[0].old == ["SELECT 1;", "-- old comment", "SELECT 2;"]
+    assert hunks[0].new == ["SELECT 1;", "-- new comment", "SELECT 2;"]
+    assert apply_hunks(text, hunks) == "SELECT 1;\n-- new comment\nSELECT 2;\n"
+    added = parse_unified_diff("@@ -1 +1,2 @@\n x\n+++ counter\n")
+    assert added[0].new == ["x", "++ counter"]
+
+
+def test_file_headers_after_the_announced_span_end_the_hunk() -> None:
+    diff = "--- a/f.py\n+++ b/f.py\n@@ -1 +1 @@\n-a\n+b\n--- a/f.py\n+++ b/f.py\n@@ -5 +5 @@\n-c\n+d\n"
+
+    hunks = parse_unified_diff(diff)
+
+    assert [(hunk.old, hunk.new) for hunk in hunks] == [(["a"], ["b"]), (["c"], ["d"])]
+
+
+def test_lines_beyond_a_miscounted_header_are_kept() -> None:
+    hunks = parse_unified_diff("@@ -1,1 +1,1 @@\n line 1\n-line 2\n+two\n")
+
+    assert hunks[0].old == ["line 1", "line 2"] and hunks[0].new == ["line 1", "two"]
+
+
+@pytest.mark.parametrize("diff", ["", "just some text\n", "@@ -1 +1 @@\n?line\n"])
+def test_parse_rejects_malformed_diffs(diff: str) -> None:
+    with pytest.raises(PatchError):
+        parse_unified_diff(diff)
+
+
+def test_hunks_apply_despite_wrong_line_numbers() -> None:
+    diff = "@@ -3,3 +3,3 @@\n line 10\n-line 11\n+eleven\n line 12\n"
+
+    result = apply_hunks(SOURCE, parse_unified_diff(diff))
+
+    assert "line 10\neleven\nline 12\n" in result
+    assert "line 11\n" not in result
+
+
+def test_later_hunks_account_for_earlier_line_drift() -> None:
+    diff = "@@ -1,2 +1,4 @@\n line 1\n+added a\n+added b\n line 2\n@@ -15,2 +17,1 @@\n-line 15\n line 16\n"
+
+    result = apply_hunks(SOURCE, parse_unified_diff(diff))
+
+    assert result.startswith("line 1\nadded a\nadded b\nline 2\n")
+    assert "line 15\n" not in result and "line 16\n" in result
+
+
+def test_hunks_tolerate_trailing_whitespace_drift() -> None:
+    text = "def f():   \n    return 1\n"
+    diff = "@@ -1,2 +1,2 @@\n def f():\n-    return 1\n+    return 2\n"
+
+    assert apply_hunks(text, parse_unified_diff(diff)) == "def f():\n    return 2\n"
+
+
+def test_bare_hunk_header_is_located_by_context() -> None:
+    diff = "@@\n line 7\n-line 8\n+eight\n"
+
+    assert "line 7\neight\nline 9" in apply_hunks(SOURCE, parse_unified_diff(diff))
+
+
+def test_unmatched_hunk_names_the_file() -> None:
+    with pytest.raises(PatchError, match="app.py near line 4"):
+        apply_hunks(SOURCE, parse_unified_diff("@@ -4 +4 @@\n-missing\n+new\n"), path="app.py")
+
+
+def test_replacement_must_be_unique_unless_replace_all() -> None:
+    text = "a = 1\nb = 1\n"
+
+    assert apply_replacement(text, "a = 1", "a = 2") == "a = 2\nb = 1\n"
+    assert apply_replacement(text, "= 1", "= 3", replace_all=True) == "a = 3\nb = 3\n"
+    with pytest.raises(PatchError, match="matches 2 times"):
+        apply_replacement(text, "= 1", "= 3")
+    with pytest.raises(PatchError, match="not found"):
+        apply_replacement(text, "c = 1", "c = 2")
+
+
+def test_apply_patch_tool_edits_files_and_returns_new_hash(state, invoke) -> None:
+    target = state.workspace / "app.py"
+    target.write_bytes(b"x = 1\r\ny = 2\r\n")
+
+    result = invoke(
+        apply_patch_tool,
+        edits=[
+            {
+                "path": "app.py",
+                "diff": "@@ -1,2 +1,2 @@\n x = 1\n-y = 2\n+y = 3\n",
+                "replacements": [{"search": "x = 1", "replace": "x = 0"}],
+                "expected_sha256": content_sha256(target.read_bytes()),
+            }
+        ],
+    )
+
+    assert target.read_bytes() == b"x = 0\r\ny = 3\r\n"
+    assert result.written == 1
+    assert result.files[0].sha256 == content_sha256(target.read_bytes())
+    assert (result.files[0].hunks, result.files[0].replacements) == (1, 1)
+
+
+def test_apply_patch_tool_changes_nothing_when_any_edit_fails(state, invoke) -> None:
+    first = state.workspace / "first.py"
+    second = state.workspace / "second.py"
+    first.write_text("a = 1\n")
+    second.write_text("b = 1\n")
+
+    result = invoke(
+        apply_patch_tool,
+        edits=[
+            {"path": "first.py", "replacements": [{"search": "a = 1", "replace": "a = 2"}]},
+            {
+                "path": "second.py",
+                "replacements": [{"search": "b = 1", "replace": "b = 2"}],
+                "expected_sha256": "0" * 64,
+            },
+        ],
+    )
+
+    assert "sha256 mismatch" in result and "no files were changed" in result
+    assert first.read_text() == "a = 1\n" and second.read_text() == "b = 1\n"
+
+
+@pytest.mark.parametrize(
+    "path, message",
+    [("../outside.py", "escapes the workspace"), ("missing.py", "File not found")],
+)
+def test_apply_patch_tool_rejects_bad_paths(state, invoke, path: str, message: str) -> None:
+    result = invoke(apply_patch_tool, edits=[{"path": path, "replacements": [{"search": "a", "replace": "b"}]}])
+
+    assert message in result
@@ -0,0 +1,42 @@
+from __future__ import annotations
+
+from ai_coding_agent.constants import PromptJsonMode
+from ai_coding_agent.plan import AgentProjectPlan, estimate_tokens
+
+
+def test_prompt_block_is_memoized_per_content(plan: AgentProjectPlan) -> None:
+    first = plan.to_prompt_block()
+    assert plan.to_prompt_block() is first
+
+    plan.requirements = {**plan.requirements, "overview": "A different overview."}
+    changed = plan.to_prompt_block()
+    assert changed is not first
+    assert "A different overview." in changed
+
+
+def test_in_place_edits_change_the_prompt_block(plan: AgentProjectPlan) -> None:
+    before = plan.content_hash()
+    first = plan.to_prompt_block()
+
+    plan.requirements["overview"] = "Edited in place."
+
+    assert plan.content_hash() != before
+    assert plan.to_prompt_block() is not first
+    assert "Edited in place." in plan.to_prompt_block()
+
+
+def test_content_hash_matches_for_equal_requirements(plan: AgentProjectPlan) -> None:
+    copy = AgentProjectPlan(requirements=dict(plan.requirements))
+    assert copy.content_hash() == plan.content_hash()
+
+
+def test_token_budget_compacts_json_then_drops_sections(plan: AgentProjectPlan) -> None:
+    full = plan.to_prompt_block()
+    minified = plan.to_prompt_block(json_mode=PromptJsonMode.MINIFIED)
+    assert len(minified) < len(full)
+
+    budget = estimate_tokens(full) // 4
+    block = plan.to_prompt_block(max_tokens=budget)
+    assert estimate_tokens(block) <= budget
+    assert "## Overview" in block
+    assert "Full Requirements JSON" not in block
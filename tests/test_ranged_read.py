@@ -0,0 +1,63 @@
+from __future__ import annotations
+
+from pathlib import Path
+
+import pytest
+
+from ai_coding_agent.tools.ranged_read import read_bytes, read_lines, read_tail
+
+TEXT = "ascii é € 😀 end\n" * 3
+
+
+@pytest.fixture
+def sample(tmp_path: Path) -> Path:
+    path = tmp_path / "sample.txt"
+    path.write_text(TEXT, encoding="utf-8")
+    return path
+
+
+@pytest.mark.parametrize("max_bytes", [1, 2, 3, 5, 64])
+def test_paging_by_offset_reassembles_the_file(sample: Path, max_bytes: int) -> None:
+    chunks = []
+    offset: int | None = 0
+    for _ in range(len(TEXT.encode())):
+        window = read_bytes(sample, offset=offset, max_bytes=max_bytes)
+        chunks.append(window.data.decode("utf-8"))
+        offset = window.next_offset
+        if offset is None:
+            break
+    assert offset is None
+    assert "".join(chunks) == TEXT
+
+
+def test_narrow_window_returns_the_whole_character(sample: Path) -> None:
+    start = TEXT.encode().index("€".encode())
+    window = read_bytes(sample, offset=start, max_bytes=1)
+    assert window.data == "€".encode()
+    assert window.end == start + 3 and window.truncated
+
+
+def test_offset_inside_a_character_skips_to_the_next_boundary(sample: Path) -> None:
+    start = TEXT.encode().index("é".encode()) + 1
+    window = read_bytes(sample, offset=start, max_bytes=4)
+    assert window.offset == start + 1
+    window.data.decode("utf-8")
+
+
+def test_raw_reads_do_not_trim(sample: Path) -> None:
+    window = read_bytes(sample, offset=1, max_bytes=2, utf8=False)
+    assert window.data == TEXT.encode()[1:3]
+
+
+def test_read_lines_range_and_next_line(sample: Path) -> None:
+    window = read_lines(sample, start_line=2, end_line=2)
+    assert window.data.decode() == TEXT.splitlines(keepends=True)[1]
+    assert window.next_line == 3
+    assert read_lines(sample, start_line=10).data == b""
+
+
+def test_read_tail(sample: Path) -> None:
+    window = read_tail(sample, lines=1)
+    assert window.data.decode() == TEXT.splitlines(keepends=True)[-1]
+    assert not window.truncated
+    assert read_tail(sample, lines=5, max_bytes=6).data.decode() == " end\n"
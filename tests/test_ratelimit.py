@@ -0,0 +1,206 @@
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+
+import pytest
+
+from ai_coding_agent.constants import RequestPriority
+from ai_coding_agent.providers.ratelimit import RequestScheduler, is_retryable, retry_after_seconds
+
+
+class StatusError(Exception):
+    def __init__(self, status_code: int, *, code: str | None = None, headers: dict[str, str] | None = None) -> None:
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.code = code
+        self.response = SimpleNamespace(headers=headers or {})
+
+
+@pytest.mark.parametrize(
+    "error, expected",
+    [
+        (StatusError(429), True),
+        (StatusError(503), True),
+        (StatusError(408), True),
+        (StatusError(400), False),
+        (StatusError(429, code="insufficient_quota"), False),
+        (ValueError("boom"), False),
+    ],
+)
+def test_is_retryable(error: BaseException, expected: bool) -> None:
+    assert is_retryable(error) is expected
+
+
+def test_retry_after_prefers_milliseconds_header() -> None:
+    assert retry_after_seconds(StatusError(429, headers={"retry-after-ms": "250", "retry-after": "9"})) == 0.25
+    assert retry_after_seconds(StatusError(429, headers={"retry-after": "2"})) == 2.0
+    assert retry_after_seconds(StatusError(429)) is None
+
+
+def test_success_raises_limit_additively_up_to_the_maximum() -> None:
+    scheduler = RequestScheduler(max_concurrency=4, min_concurrency=1)
+    scheduler.limit = 2.0
+
+    async def go() -> None:
+        for _ in range(3):
+            started = await scheduler.acquire(10)
+            scheduler.release(started, tokens=10)
+
+    asyncio.run(go())
+
+    assert scheduler.limit == pytest.approx(2.0 + 1 / 2 + 1 / 2.5 + 1 / 2.9)
+    scheduler.limit = 3.99
+    scheduler.in_flight = 1
+    scheduler.release(0.0, tokens=10)
+    assert scheduler.limit == 4.0
+
+
+def test_congestion_halves_limit_once_per_round() -> None:
+    now = [100.0]
+    scheduler = RequestScheduler(max_concurrency=8, min_concurrency=2, clock=lambda: now[0])
+
+    async def go() -> None:
+        first = await scheduler.acquire(10)
+        second = await scheduler.acquire(10)
+        now[0] += 1
+        scheduler.release(first, tokens=10, error=StatusError(429))
+        # Sent before the decrease: does not halve again.
+        scheduler.release(second, tokens=10, error=StatusError(429))
+
+    asyncio.run(go())
+    assert scheduler.limit == 4.0
+    assert scheduler.throttled == 2
+
+    for _ in range(3):
+        scheduler.in_flight += 1
+        now[0] += 1
+        scheduler.release(now[0], tokens=10, error=StatusError(503))
+    assert scheduler.limit == 2.0
+
+
+def test_non_congestion_errors_leave_limit_alone() -> None:
+    scheduler = RequestScheduler(max_concurrency=8)
+    scheduler.in_flight = 1
+    scheduler.release(0.0, tokens=10, error=StatusError(500))
+    assert scheduler.limit == 8.0
+
+
+def test_concurrency_limit_bounds_in_flight_requests() -> None:
+    scheduler = RequestScheduler(max_concurrency=2)
+    peak = 0
+
+    async def call() -> str:
+        nonlocal peak
+        peak = max(peak, scheduler.in_flight)
+        await asyncio.sleep(0.01)
+        return "ok"
+
+    async def go() -> list[str]:
+        return await asyncio.gather(*(scheduler.run(call, tokens=1) for _ in range(6)))
+
+    assert asyncio.run(go()) == ["ok"] * 6
+    assert peak == 2
+    assert scheduler.in_flight == 0 and scheduler.requests == 6
+
+
+def test_interactive_requests_jump_the_batch_queue() -> None:
+    scheduler = RequestScheduler(max_concurrency=1)
+    order: list[str] = []
+
+    async def go() -> None:
+        held = await scheduler.acquire(1)
+
+        async def request(name: str, priority: RequestPriority) -> None:
+            started = await scheduler.acquire(1, priority)
+            order.append(name)
+            scheduler.release(started, tokens=1)
+
+        waiters = [
+            asyncio.create_task(request("batch-1", RequestPriority.BATCH)),
+            asyncio.create_task(request("batch-2", RequestPriority.BATCH)),
+            asyncio.create_task(request("interactive", RequestPriority.INTERACTIVE)),
+        ]
+        await asyncio.sleep(0)
+        scheduler.release(held, tokens=1)
+        await asyncio.gather(*waiters)
+
+    asyncio.run(go())
+    assert order == ["interactive", "batch-1", "batch-2"]
+
+
+def test_run_retries_transient_failures_then_succeeds() -> None:
+    scheduler = RequestScheduler(max_retries=3, base_delay=0.001, max_delay=0.001, rng=random.Random(0))
+    failures = [StatusError(503), StatusError(429)]
+
+    async def call() -> str:
+        if failures:
+            raise failures.pop(0)
+        return "ok"
+
+    assert asyncio.run(scheduler.run(call, tokens=1)) == "ok"
+    assert scheduler.retries == 2 and scheduler.requests == 3
+
+
+def test_run_gives_up_after_max_retries_and_on_fatal_errors() -> None:
+    scheduler = RequestScheduler(max_retries=2, base_delay=0.001, max_delay=0.001)
+    calls = 0
+
+    async def always(error: BaseException) -> None:
+        nonlocal calls
+        calls += 1
+        raise error
+
+    with pytest.raises(StatusError):
+        asyncio.run(scheduler.run(lambda: always(StatusError(503)), tokens=1))
+    assert calls == 3
+
+    calls = 0
+    with pytest.raises(StatusError):
+        asyncio.run(scheduler.run(lambda: always(StatusError(400)), tokens=1))
+    assert calls == 1
+    assert scheduler.in_flight == 0
+
+
+def test_backoff_honours_retry_after() -> None:
+    scheduler = RequestScheduler(base_delay=0.001, max_delay=0.001)
+    assert scheduler.backoff(StatusError(429, headers={"retry-after": "5"}), 1) == 5.0
+    assert scheduler.backoff(StatusError(429), scheduler.max_retries + 1) is None
+
+
+def test_token_budget_delays_requests_until_refilled() -> None:
+    now = [0.0]
+    scheduler = RequestScheduler(tokens_per_minute=600, clock=lambda: now[0])
+
+    async def go() -> bool:
+        started = await scheduler.acquire(600)
+        scheduler.release(started, tokens=600, used_tokens=600)
+        pending = asyncio.ensure_future(scheduler.acquire(300))
+        await asyncio.sleep(0)
+        blocked = not pending.done()
+        now[0] += 30.0
+        scheduler._dispatch()
+        await pending
+        return blocked
+
+    assert asyncio.run(go()) is True
+
+
+def test_reported_usage_refunds_the_token_estimate() -> None:
+    now = [0.0]
+    scheduler = RequestScheduler(tokens_per_minute=1000, clock=lambda: now[0])
+
+    async def go() -> None:
+        started = await scheduler.acquire(900)
+        scheduler.release(started, tokens=900, used_tokens=100)
+        # 900 reserved, 800 refunded: another 900-token request fits immediately.
+        started = await scheduler.acquire(900)
+        scheduler.release(started, tokens=900)
+
+    asyncio.run(asyncio.wait_for(go(), timeout=1))
+
+
+def test_invalid_concurrency_bounds_are_rejected() -> None:
+    with pytest.raises(ValueError):
+        RequestScheduler(max_concurrency=1, min_concurrency=2)
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import asyncio
+import os
+import time
+from pathlib import Path
+
+from agents.model_settings import ModelSettings
+from agents.retry import ModelRetrySettings
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.config import CacheMode
+from ai_coding_agent.providers.cache import ResponseCache, request_fingerprint
+from ai_coding_agent.providers.stub import StubModelProvider
+
+
+def _fingerprint(settings: ModelSettings, input: str = "hello") -> str:
+    return request_fingerprint("gpt-5", "be brief", input, settings, [], None, [])
+
+
+def test_fingerprint_depends_on_request_but_not_retry_policy() -> None:
+    base = _fingerprint(ModelSettings(temperature=0.2))
+    assert base == _fingerprint(ModelSettings(temperature=0.2))
+    assert base == _fingerprint(ModelSettings(temperature=0.2, retry=ModelRetrySettings(max_retries=0)))
+    assert base != _fingerprint(ModelSettings(temperature=0.3))
+    assert base != _fingerprint(ModelSettings(temperature=0.2), input="goodbye")
+
+
+def test_cache_round_trip_and_ttl(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path, ttl_seconds=60)
+    assert cache.get("ab" * 32) is None
+    cache.put("ab" * 32, {"output": []})
+    assert cache.get("ab" * 32) == {"output": []}
+    assert (cache.hits, cache.misses, cache.writes) == (1, 1, 1)
+
+    expired = ResponseCache(tmp_path, ttl_seconds=1e-9)
+    time.sleep(0.01)
+    assert expired.get("ab" * 32) is None
+    assert not any(tmp_path.glob("*/*.json"))
+
+
+def test_prune_evicts_least_recently_used(tmp_path: Path) -> None:
+    cache = ResponseCache(tmp_path)
+    for index, key in enumerate(("a" * 64, "b" * 64, "c" * 64)):
+        cache.put(key, {"payload": "x" * 100})
+        os.utime(cache._entry_path(key), (1000 + index, 1000 + index))
+    # Entries differ by a few bytes (their timestamps), so budget for exactly the two newest.
+    cache.max_bytes = sum(cache._entry_path(key * 64).stat().st_size for key in "bc")
+    assert cache.prune() == 1
+    assert cache.get("a" * 64) is None
+    assert cache.get("c" * 64) is not None
+
+
+def test_second_run_is_served_from_cache(tmp_path: Path, plan, stub_settings) -> None:
+    settings = stub_settings(
+        cache_mode=CacheMode.READWRITE,
+        cache_dir=tmp_path / "cache",
+        run_store=False,
+        snapshots=False,
+        request_scheduler=False,
+    )
+
+    def run(workspace: Path) -> MultiAgentPipeline:
+        pipeline = MultiAgentPipeline(workspace=workspace, plan=plan, settings=settings)
+        asyncio.run(pipeline.run("Build it"))
+        return pipeline
+
+    first = run(tmp_path / "one")
+    second = run(tmp_path / "two")
+
+    assert first.response_cache.writes > 0
+    assert second.response_cache.misses == 0
+    assert second.response_cache.hits == first.response_cache.writes
+    stub = second.model_provider.inner
+    assert isinstance(stub, StubModelProvider)
+    assert sum(model.calls for model in stub.models) == 0
+    assert (tmp_path / "two" / "stub" / "coding" / "coding.md").exists()
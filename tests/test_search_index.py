@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from ai_coding_agent.tools.filesystem import search_workspace_tool, write_many_tool
+from ai_coding_agent.tools.search_index import WorkspaceIndex
+
+
+def _write(root: Path, relative: str, text: str | bytes) -> Path:
+    path = root / relative
+    path.parent.mkdir(parents=True, exist_ok=True)
+    if isinstance(text, bytes):
+        path.write_bytes(text)
+    else:
+        path.write_text(text, encoding="utf-8")
+    return path
+
+
+def test_definitions_rank_above_references(tmp_path: Path) -> None:
+    _write(tmp_path, "app/models.py", "class TaskQueue:\n    pass\n")
+    _write(tmp_path, "app/views.py", "from .models import TaskQueue\nqueue = TaskQueue()\n")
+    index = WorkspaceIndex(tmp_path)
+    index.refresh()
+
+    hits = index.search("taskqueue")
+
+    assert (hits[0].path, hits[0].line) == ("app/models.py", 1)
+    assert {(hit.path, hit.line) for hit in hits} == {("app/models.py", 1), ("app/views.py", 1), ("app/views.py", 2)}
+    assert [hit.path for hit in index.search("TaskQueue", path_prefix="app/views")] == ["app/views.py"] * 2
+
+
+def test_refresh_only_rereads_changed_files(tmp_path: Path) -> None:
+    _write(tmp_path, "a.txt", "alpha")
+    changed = _write(tmp_path, "b.txt", "beta")
+    _write(tmp_path, "gone.txt", "gamma")
+    index = WorkspaceIndex(tmp_path)
+    assert index.refresh().indexed == 3
+
+    changed.write_text("beta version two", encoding="utf-8")
+    os.utime(changed, ns=(1, 1))
+    (tmp_path / "gone.txt").unlink()
+    stats = index.refresh()
+
+    assert (stats.indexed, stats.reindexed, stats.removed, stats.files) == (0, 1, 1, 2)
+    assert index.search("version two")[0].path == "b.txt"
+    assert index.search("gamma") == []
+
+
+def test_binary_large_and_ignored_files_are_skipped(tmp_path: Path) -> None:
+    _write(tmp_path, "blob.bin", b"needle\0binary")
+    _write(tmp_path, "big.txt", "needle " * 100)
+    _write(tmp_path, "node_modules/lib.js", "needle")
+    _write(tmp_path, ".ai_coding_agent/state.json", "needle")
+    _write(tmp_path, "small.txt", "needle")
+    index = WorkspaceIndex(tmp_path, max_bytes=200)
+
+    stats = index.refresh()
+
+    assert sorted(stats.skipped) == ["big.txt", "blob.bin"]
+    assert [hit.path for hit in index.search("needle")] == ["small.txt"]
+
+
+def test_update_reindexes_written_paths(tmp_path: Path) -> None:
+    index = WorkspaceIndex(tmp_path)
+    index.refresh()
+    path = _write(tmp_path, "new.py", "def handler(): ...\n")
+
+    index.update([path])
+    assert index.candidates("handler") == ["new.py"]
+
+    path.unlink()
+    index.update([path])
+    assert index.candidates("handler") == []
+
+
+def test_search_tool_sees_files_written_by_write_many(invoke) -> None:
+    invoke(search_workspace_tool, query="anything")
+    invoke(write_many_tool, files=[{"path": "pkg/service.py", "content": "def build_service():\n    return 1\n"}])
+
+    result = invoke(search_workspace_tool, query="build_service")
+
+    assert [(hit.path, hit.line) for hit in result.hits] == [("pkg/service.py", 1)]
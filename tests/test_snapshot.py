@@ -0,0 +1,141 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.snapshot import SnapshotStore
+
+
+def _write(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(text, encoding="utf-8")
+
+
+def test_restore_reverts_changes_and_removes_new_files(tmp_path: Path) -> None:
+    _write(tmp_path / "a.txt", "one")
+    _write(tmp_path / "pkg" / "b.txt", "two")
+    store = SnapshotStore(tmp_path)
+    snapshot = store.capture("before")
+
+    _write(tmp_path / "a.txt", "changed")
+    _write(tmp_path / "new" / "c.txt", "three")
+    (tmp_path / "pkg" / "b.txt").unlink()
+
+    report = store.restore(snapshot)
+
+    assert (tmp_path / "a.txt").read_text() == "one"
+    assert (tmp_path / "pkg" / "b.txt").read_text() == "two"
+    assert not (tmp_path / "new").exists()
+    assert sorted(report.restored) == ["a.txt", "pkg/b.txt"]
+    assert report.removed == ["new/c.txt"]
+
+
+def test_restore_leaves_unchanged_files_alone(tmp_path: Path) -> None:
+    _write(tmp_path / "a.txt", "one")
+    store = SnapshotStore(tmp_path)
+    snapshot = store.capture()
+
+    report = store.restore(snapshot)
+
+    assert report.restored == [] and report.removed == []
+
+
+def test_capture_reuses_blobs_for_unchanged_content(tmp_path: Path) -> None:
+    _write(tmp_path / "a.txt", "same")
+    _write(tmp_path / "b.txt", "same")
+    store = SnapshotStore(tmp_path)
+    first = store.capture()
+    second = store.capture()
+
+    assert first.files["a.txt"].digest == first.files["b.txt"].digest == second.files["a.txt"].digest
+    assert len(list(store.objects_dir.glob("*/*"))) == 1
+
+
+def test_restore_limited_to_paths_keeps_other_changes(tmp_path: Path) -> None:
+    _write(tmp_path / "shared.txt", "base")
+    store = SnapshotStore(tmp_path)
+    snapshot = store.capture()
+
+    # The failing stage's writes...
+    _write(tmp_path / "shared.txt", "failed edit")
+    _write(tmp_path / "failed" / "out.txt", "partial")
+    # ...and a sibling stage's, made while it ran.
+    _write(tmp_path / "sibling" / "out.txt", "keep me")
+
+    report = store.restore(snapshot, paths=["shared.txt", "failed/out.txt"])
+
+    assert (tmp_path / "shared.txt").read_text() == "base"
+    assert not (tmp_path / "failed").exists()
+    assert (tmp_path / "sibling" / "out.txt").read_text() == "keep me"
+    assert report.removed == ["failed/out.txt"]
+
+
+def test_capture_skips_vcs_dependency_and_virtualenv_directories(tmp_path: Path) -> None:
+    _write(tmp_path / "app.py", "code")
+    for ignored in (".git/HEAD", "node_modules/lib/index.js", "web/node_modules/x.js", ".venv/bin/python"):
+        _write(tmp_path / ignored, "ignored")
+    store = SnapshotStore(tmp_path)
+
+    snapshot = store.capture()
+    _write(tmp_path / "node_modules" / "new.js", "installed later")
+    report = store.restore(snapshot)
+
+    assert sorted(snapshot.files) == ["app.py"]
+    assert report.removed == []
+    assert (tmp_path / "node_modules" / "new.js").exists()
+
+
+def test_restore_with_paths_stats_only_those_paths(tmp_path: Path, monkeypatch) -> None:
+    _write(tmp_path / "a.txt", "one")
+    store = SnapshotStore(tmp_path)
+    snapshot = store.capture()
+    _write(tmp_path / "a.txt", "changed")
+    _write(tmp_path / "b.txt", "new")
+    _write(tmp_path / "node_modules" / "dep.js", "not snapshotted")
+
+    def walk():
+        raise AssertionError("restore(paths=...) must not walk the workspace")
+
+    monkeypatch.setattr(store, "_walk", walk)
+    report = store.restore(snapshot, paths=["a.txt", "b.txt", "missing.txt", "node_modules/dep.js"])
+
+    assert (tmp_path / "a.txt").read_text() == "one"
+    assert not (tmp_path / "b.txt").exists()
+    assert (tmp_path / "node_modules" / "dep.js").exists()
+    assert (report.restored, report.removed) == (["a.txt"], ["b.txt"])
+
+
+def test_prune_drops_unreferenced_blobs(tmp_path: Path) -> None:
+    _write(tmp_path / "a.txt", "v1")
+    store = SnapshotStore(tmp_path)
+    store.capture()
+    _write(tmp_path / "a.txt", "v2 with a different size")
+    store.capture()
+
+    assert store.prune(keep=1) == 1
+    assert len(store.snapshots()) == 1
+
+
+def test_failed_stage_does_not_roll_back_concurrent_siblings(tmp_path: Path, plan, stub_settings) -> None:
+    def write(path: str) -> dict:
+        return {"tool_calls": [{"name": "write_many", "arguments": {"files": [{"path": path, "content": "x\n"}]}}]}
+
+    script = {
+        "stages": {
+            "coding": [write("src/partial.py"), {"tool_calls": [{"name": "no_such_tool", "arguments": {}}]}],
+            "testing": [write("tests/test_app.py"), {"text": "done"}],
+            "documentation": [write("docs/README.md"), {"text": "done"}],
+        }
+    }
+    settings = stub_settings(script, stub_latency_seconds=0.01, max_parallel_stages=3, run_store=False)
+    pipeline = MultiAgentPipeline(workspace=tmp_path, plan=plan, settings=settings)
+
+    with pytest.raises(Exception):
+        asyncio.run(pipeline.run("Build it"))
+
+    assert not (tmp_path / "src" / "partial.py").exists()
+    assert (tmp_path / "tests" / "test_app.py").exists()
+    assert (tmp_path / "docs" / "README.md").exists()
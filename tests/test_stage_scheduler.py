@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+
+import pytest
+
+from ai_coding_agent.agents.scheduler import StageGraphError, StageScheduler
+
+
+@dataclass
+class Stage:
+    name: str
+    inputs: tuple[str, ...] = ()
+    outputs: tuple[str, ...] = ()
+
+
+DIAMOND = [
+    Stage("requirements", outputs=("summary",)),
+    Stage("coding", inputs=("summary",), outputs=("code",)),
+    Stage("testing", inputs=("summary",), outputs=("tests",)),
+    Stage("release", inputs=("code", "tests")),
+]
+
+
+def test_levels_group_independent_stages() -> None:
+    assert StageScheduler(DIAMOND).levels() == [["requirements"], ["coding", "testing"], ["release"]]
+
+
+@pytest.mark.parametrize(
+    ("stages", "message"),
+    [
+        ([Stage("a"), Stage("a")], "Duplicate"),
+        ([Stage("a", outputs=("x",)), Stage("b", outputs=("x",))], "produced by both"),
+        ([Stage("a", inputs=("missing",))], "unknown inputs"),
+        ([Stage("a", inputs=("y",), outputs=("x",)), Stage("b", inputs=("x",), outputs=("y",))], "cycle"),
+    ],
+)
+def test_invalid_graphs_are_rejected(stages: list[Stage], message: str) -> None:
+    with pytest.raises(StageGraphError, match=message):
+        StageScheduler(stages)
+
+
+def test_run_respects_dependencies_and_concurrency() -> None:
+    started: list[str] = []
+    finished: list[str] = []
+    running = 0
+    peak = 0
+
+    async def execute(stage: Stage) -> None:
+        nonlocal running, peak
+        started.append(stage.name)
+        running += 1
+        peak = max(peak, running)
+        await asyncio.sleep(0.01)
+        running -= 1
+        finished.append(stage.name)
+
+    asyncio.run(StageScheduler(DIAMOND, max_concurrency=2).run(execute))
+
+    assert started[0] == "requirements" and started[-1] == "release"
+    assert finished.index("coding") < started.index("release")
+    assert finished.index("testing") < started.index("release")
+    assert peak == 2
+
+
+def test_failure_cancels_remaining_stages_and_is_unwrapped() -> None:
+    ran: list[str] = []
+
+    async def execute(stage: Stage) -> None:
+        ran.append(stage.name)
+        if stage.name == "coding":
+            raise RuntimeError("boom")
+        await asyncio.sleep(0.05)
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(StageScheduler(DIAMOND, max_concurrency=3).run(execute))
+    assert "release" not in ran
@@ -0,0 +1,122 @@
+from __future__ import annotations
+
+import asyncio
+import sqlite3
+from pathlib import Path
+
+import pytest
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.store import SCHEMA_VERSION, RunStore, RunStoreError
+
+
+@pytest.fixture
+def store(tmp_path: Path):
+    store = RunStore(tmp_path / "runs.sqlite3")
+    yield store
+    store.close()
+
+
+def test_records_are_visible_after_flush(store: RunStore, tmp_path: Path) -> None:
+    run_id = store.start_run(tmp_path, prompt="Build it", settings={"model": "gpt-5"})
+    store.record_stage(run_id, "coding", "running")
+    store.record_stage(run_id, "coding", "completed", metrics={"turns": 2})
+    store.record_artifact(run_id, "summary", {"files": 3})
+    store.record_artifact(run_id, "summary", {"files": 4})
+    store.finish_run(run_id, "completed")
+    store.flush()
+
+    [run] = store.runs()
+    assert run["status"] == "completed" and run["finished_at"] is not None
+    [stage] = store.stages(run_id)
+    assert stage["status"] == "completed" and stage["started_at"] is not None
+    assert stage["metrics"] == {"turns": 2}
+    assert store.artifacts(run_id) == {"summary": {"files": 4}}
+    assert store.settings(run_id) == {"model": "gpt-5"}
+
+
+def test_event_filters_and_paging(store: RunStore, tmp_path: Path) -> None:
+    run_id = store.start_run(tmp_path)
+    for index in range(5):
+        store.record_event(run_id, "coding" if index % 2 else "testing", f"event {index}", kind="tool")
+    store.record_event(run_id, None, "plain", payload={"n": 1}, created_at=1e12)
+    store.flush()
+
+    assert [row["message"] for row in store.events(run_id, stage="coding")] == ["event 1", "event 3"]
+    assert [row["payload"] for row in store.events(run_id, kind="log")] == [{"n": 1}]
+    assert [row["message"] for row in store.events(run_id, since=1e12)] == ["plain"]
+    assert [row["message"] for row in store.events(run_id, contains="event 4")] == ["event 4"]
+    first = store.events(run_id, limit=2)
+    rest = store.events(run_id, after_id=first[-1]["id"])
+    assert len(first) + len(rest) == 6
+    assert store.runs()[0]["event_count"] == 6
+
+
+def test_writer_errors_surface_on_flush(tmp_path: Path) -> None:
+    store = RunStore(tmp_path / "runs.sqlite3")
+    store.record_event("no-such-run", None, "orphan")
+    with pytest.raises(RunStoreError, match="FOREIGN KEY"):
+        store.flush()
+
+
+def test_closed_store_can_still_be_read(tmp_path: Path) -> None:
+    store = RunStore(tmp_path / "runs.sqlite3")
+    run_id = store.start_run(tmp_path)
+    store.record_event(run_id, None, "hello")
+    store.close()
+
+    store.flush(timeout=1)
+    assert [event["message"] for event in store.events(run_id)] == ["hello"]
+
+
+def test_version_1_database_is_migrated(tmp_path: Path) -> None:
+    path = tmp_path / "old.sqlite3"
+    with sqlite3.connect(path) as conn:
+        conn.executescript(
+            """
+            CREATE TABLE runs (id TEXT PRIMARY KEY, workspace TEXT NOT NULL, prompt TEXT,
+                               status TEXT NOT NULL, started_at REAL NOT NULL, finished_at REAL);
+            CREATE TABLE events (id INTEGER PRIMARY KEY, run_id TEXT NOT NULL REFERENCES runs (id),
+                                 stage TEXT, created_at REAL NOT NULL, message TEXT NOT NULL);
+            INSERT INTO runs VALUES ('old', '/w', NULL, 'completed', 1.0, 2.0);
+            INSERT INTO events (run_id, stage, created_at, message) VALUES ('old', NULL, 1.5, 'legacy');
+            PRAGMA user_version = 1;
+            """
+        )
+    conn.close()
+
+    store = RunStore(path)
+    try:
+        [event] = store.events("old")
+        assert event["kind"] == "log" and event["payload"] is None
+        store.record_event("old", None, "new", kind="stage", payload={"ok": True})
+        store.flush()
+        assert store.events("old", kind="stage")[0]["payload"] == {"ok": True}
+    finally:
+        store.close()
+    with sqlite3.connect(path) as conn:
+        assert conn.execute("PRAGMA user_version").fetchone()[0] == SCHEMA_VERSION
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+    conn.close()
+
+
+def test_pipeline_run_is_recorded(tmp_path: Path, plan, stub_settings) -> None:
+    pipeline = MultiAgentPipeline(workspace=tmp_path, plan=plan, settings=stub_settings(snapshots=False))
+    try:
+        state = asyncio.run(pipeline.run("Build it"))
+    finally:
+        asyncio.run(pipeline.aclose())
+
+    store = RunStore(pipeline.run_store.path)
+    try:
+        [run] = store.runs()
+        assert run["id"] == state.run_id and run["status"] == "completed"
+        assert {row["name"]: row["status"] for row in store.stages(state.run_id)} == {
+            "requirements": "completed",
+            "coding": "completed",
+            "testing": "completed",
+            "documentation": "completed",
+        }
+        assert len(store.events(state.run_id)) == state.events.total
+    finally:
+        store.close()
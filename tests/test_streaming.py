@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+
+
+def test_stream_reports_stages_tokens_and_final_state(tmp_path: Path, plan, stub_settings) -> None:
+    pipeline = MultiAgentPipeline(
+        workspace=tmp_path, plan=plan, settings=stub_settings(run_store=False, snapshots=False)
+    )
+
+    async def collect() -> list:
+        return [event async for event in pipeline.stream("Build it")]
+
+    events = asyncio.run(collect())
+
+    kinds = [event.kind for event in events]
+    assert kinds[-1] == "pipeline_completed"
+    assert {"token", "tool_called", "tool_output", "log"} <= set(kinds)
+    stages = ("requirements", "coding", "testing", "documentation")
+    started = [event.stage for event in events if event.kind == "stage_started"]
+    completed = [event.stage for event in events if event.kind == "stage_completed"]
+    assert sorted(started) == sorted(completed) == sorted(stages)
+    assert started[0] == completed[0] == "requirements"
+
+    state = events[-1].data["state"]
+    assert set(state.stage_metrics) == set(stages)
+    assert (tmp_path / "stub" / "coding" / "coding.md").exists()
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+import asyncio
+import json
+from pathlib import Path
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.config import ModelBackend
+from ai_coding_agent.providers.recording import RecordingModelProvider
+from ai_coding_agent.providers.stub import StubModelProvider, default_steps
+
+
+def _files(root: Path) -> dict[str, str]:
+    return {
+        path.relative_to(root).as_posix(): path.read_text(encoding="utf-8")
+        for path in sorted(root.rglob("*"))
+        if path.is_file() and ".ai_coding_agent" not in path.parts
+    }
+
+
+def test_stub_runs_are_deterministic(tmp_path: Path, plan, stub_settings) -> None:
+    settings = stub_settings(run_store=False, snapshots=False)
+    for name in ("one", "two"):
+        asyncio.run(MultiAgentPipeline(workspace=tmp_path / name, plan=plan, settings=settings).run("Build it"))
+
+    assert _files(tmp_path / "one") == _files(tmp_path / "two")
+    assert "stub/coding/coding.md" in _files(tmp_path / "one")
+
+
+def test_recorded_session_replays_the_same_run(tmp_path: Path, plan, stub_settings) -> None:
+    script = {"default": [*default_steps("scripted")[:1], {"text": "Recorded."}]}
+    settings = stub_settings(script, run_store=False, snapshots=False, request_scheduler=False)
+    recorder = MultiAgentPipeline(workspace=tmp_path / "recorded", plan=plan, settings=settings)
+    session = tmp_path / "session.json"
+    recorder.model_provider = RecordingModelProvider(recorder.model_provider, session)
+    recorded = asyncio.run(recorder.run("Build it"))
+
+    stages = json.loads(session.read_text())["stages"]
+    assert set(stages) == {"requirements", "coding", "testing", "documentation"}
+
+    replay_settings = settings.model_copy(update={"model_backend": ModelBackend.REPLAY, "model_script": session})
+    replayer = MultiAgentPipeline(workspace=tmp_path / "replayed", plan=plan, settings=replay_settings)
+    replayed = asyncio.run(replayer.run("Build it"))
+
+    assert isinstance(replayer.model_provider, StubModelProvider)
+    assert _files(tmp_path / "replayed") == _files(tmp_path / "recorded")
+    for name, metrics in recorded.stage_metrics.items():
+        assert replayed.stage_metrics[name].turns == metrics.turns
+        assert replayed.stage_metrics[name].total_tokens == metrics.total_tokens
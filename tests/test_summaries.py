@@ -0,0 +1,99 @@
+from __future__ import annotations
+
+import os
+from pathlib import Path
+
+from ai_coding_agent.agents.pipeline import MultiAgentPipeline
+from ai_coding_agent.context import AgentRunState
+from ai_coding_agent.summaries import SummaryCache, summarize_markdown
+
+
+def _requirements(root: Path, count: int) -> list[Path]:
+    root.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for index in range(count):
+        path = root / f"req_{index:02d}.md"
+        path.write_text(f"# Requirement {index}\n\nThe system shall do thing {index}.\n", encoding="utf-8")
+        paths.append(path)
+    return paths
+
+
+def test_summarize_markdown_joins_leading_lines_and_truncates() -> None:
+    assert summarize_markdown("# Title\n\n  body line \n") == "# Title body line"
+    assert summarize_markdown("x" * 50, limit=10) == "x" * 10 + "..."
+    assert summarize_markdown("\n\n") == "_No content available._"
+
+
+def test_second_call_hits_the_cache(tmp_path: Path) -> None:
+    files = _requirements(tmp_path / "requirements", 20)
+    cache = SummaryCache(tmp_path / "cache.json")
+
+    first = cache.summarize(files, root=tmp_path)
+    second = cache.summarize(files, root=tmp_path)
+
+    assert [result.summary for result in first] == [result.summary for result in second]
+    assert first[3].summary == "# Requirement 3 The system shall do thing 3."
+    assert not any(result.cached for result in first) and all(result.cached for result in second)
+    assert (cache.hits, cache.misses) == (20, 20)
+
+
+def test_changed_file_is_summarized_again(tmp_path: Path) -> None:
+    files = _requirements(tmp_path, 3)
+    cache = SummaryCache(tmp_path / "cache.json")
+    cache.summarize(files, root=tmp_path)
+
+    files[1].write_text("# Rewritten requirement\n", encoding="utf-8")
+    stat = files[1].stat()
+    os.utime(files[1], ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000))
+    results = cache.summarize(files, root=tmp_path)
+
+    assert [result.cached for result in results] == [True, False, True]
+    assert results[1].summary == "# Rewritten requirement"
+
+
+def test_cache_persists_across_instances_and_drops_deleted_files(tmp_path: Path) -> None:
+    files = _requirements(tmp_path, 3)
+    SummaryCache(tmp_path / "cache.json").summarize(files, root=tmp_path)
+
+    files[2].unlink()
+    reloaded = SummaryCache(tmp_path / "cache.json")
+    results = reloaded.summarize(files[:2], root=tmp_path)
+
+    assert all(result.cached for result in results)
+    assert sorted(SummaryCache(tmp_path / "cache.json")._entries) == ["req_00.md", "req_01.md"]
+
+
+def test_cache_with_a_different_limit_starts_empty(tmp_path: Path) -> None:
+    files = _requirements(tmp_path, 2)
+    SummaryCache(tmp_path / "cache.json").summarize(files, root=tmp_path)
+
+    results = SummaryCache(tmp_path / "cache.json", limit=10).summarize(files, root=tmp_path)
+
+    assert not any(result.cached for result in results)
+
+
+def test_unreadable_and_non_utf8_files_report_errors(tmp_path: Path) -> None:
+    files = _requirements(tmp_path, 1)
+    binary = tmp_path / "binary.md"
+    binary.write_bytes(b"\xff\xfe\x00")
+    missing = tmp_path / "missing.md"
+
+    results = SummaryCache(tmp_path / "cache.json").summarize([files[0], binary, missing], root=tmp_path)
+
+    assert results[0].summary is not None
+    assert "not valid UTF-8" in str(results[1].error)
+    assert isinstance(results[2].error, FileNotFoundError)
+
+
+def test_pipeline_summary_reuses_cache_across_pipelines(tmp_path: Path, plan, stub_settings) -> None:
+    _requirements(tmp_path / "requirements", 3)
+    settings = stub_settings(run_store=False, snapshots=False)
+
+    first = MultiAgentPipeline(workspace=tmp_path, plan=plan, settings=settings)
+    text = first._emit_requirements_summary(AgentRunState(workspace=tmp_path, plan=plan))
+    second = MultiAgentPipeline(workspace=tmp_path, plan=plan, settings=settings)
+    again = second._emit_requirements_summary(AgentRunState(workspace=tmp_path, plan=plan))
+
+    assert text == again
+    assert "## requirements/req_01.md" in text
+    assert (first.summary_cache.misses, second.summary_cache.hits) == (3, 3)
@@ -0,0 +1,26 @@
+"""Recompute the per-status task counters stored on each project."""
+from __future__ import annotations
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from projects.models import Project
+
+
+class Command(BaseCommand):
+    help = "Rebuild the stored per-status task counts of all projects, or of the given project slugs."
+
+    def add_arguments(self, parser) -> None:
+        parser.add_argument("slugs", nargs="*", help="Only rebuild these projects")
+
+    def handle(self, *args, **options) -> None:
+        projects = Project.objects.all()
+        slugs = options["slugs"]
+        if slugs:
+            projects = projects.filter(slug__in=slugs)
+            missing = set(slugs) - set(projects.values_list("slug", flat=True))
+            if missing:
+                raise CommandError(f"Unknown project slug(s): {', '.join(sorted(missing))}")
+        with transaction.atomic():
+            updated = projects.refresh_task_counts()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt task counts for {updated} project(s)."))
@@ -0,0 +1,46 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:11
+
+from django.db import migrations, models
+from django.db.models.functions import Coalesce
+
+
+def fill_task_counts(apps, schema_editor):
+    Project = apps.get_model("projects", "Project")
+    Task = apps.get_model("projects", "Task")
+    counts = {}
+    for status in ("todo", "in_progress", "done"):
+        per_project = (
+            Task.objects.filter(project=models.OuterRef("pk"), status=status)
+            .order_by()
+            .values("project")
+            .annotate(total=models.Count("pk"))
+            .values("total")
+        )
+        counts[f"{status}_count"] = Coalesce(models.Subquery(per_project), 0)
+    Project.objects.update(**counts)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0001_initial"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="project",
+            name="todo_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="in_progress_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name="project",
+            name="done_count",
+            field=models.PositiveIntegerField(default=0, editable=False),
+        ),
+        migrations.RunPython(fill_task_counts, migrations.RunPython.noop),
+    ]
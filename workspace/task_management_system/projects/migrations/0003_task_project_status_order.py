@@ -0,0 +1,17 @@
+# Generated by Django 5.1.1 on 2026-10-16 23:40
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("projects", "0002_project_task_counts"),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name="task",
+            index=models.Index(fields=["project", "status", "order"], name="task_project_status_order"),
+        ),
+    ]
@@ -1,21 +1,69 @@
 """Database models for the task management system."""
 from __future__ import annotations
 
-from django.db import models
+from collections import Counter
+from typing import Iterable
+
+from django.db import models, transaction
+from django.db.models.functions import Coalesce
 from django.utils import timezone
 from django.utils.text import slugify
 
 
+def counter_field(status: str) -> str:
+    """Name of the ``Project`` column counting tasks in ``status``."""
+
+    return f"{status}_count"
+
+
+class ProjectQuerySet(models.QuerySet):
+    def refresh_task_counts(self) -> int:
+        """Recompute the stored per-status task counters with one UPDATE."""
+
+        counts = {}
+        for status in Task.Status.values:
+            per_project = (
+                Task.objects.filter(project=models.OuterRef("pk"), status=status)
+                .order_by()
+                .values("project")
+                .annotate(total=models.Count("pk"))
+                .values("total")
+            )
+            counts[counter_field(status)] = Coalesce(models.Subquery(per_project), 0)
+        return self.update(**counts)
+
+    def adjust_task_counts(self, deltas: Counter[tuple[int, str]]) -> None:
+        """Apply ``(project_id, status) -> change`` deltas with atomic ``F()`` updates."""
+
+        by_project: dict[int, dict[str, models.Expression]] = {}
+        for (project_id, status), delta in deltas.items():
+            if delta:
+                field = counter_field(status)
+                by_project.setdefault(project_id, {})[field] = models.F(field) + delta
+        for project_id, changes in by_project.items():
+            self.filter(pk=project_id).update(**changes)
+
+
 class Project(models.Model):
-    """A project groups a collection of related tasks."""
+    """A project groups a collection of related tasks.
+
+    Task counts per status are stored on the project and kept current by
+    ``Task`` writes, so listings read them without querying tasks. Run
+    ``manage.py rebuild_task_counts`` after writing tasks with raw SQL.
+    """
 
     name = models.CharField(max_length=255, unique=True)
     slug = models.SlugField(max_length=255, unique=True, blank=True)
     description = models.TextField(blank=True)
     archived = models.BooleanField(default=False)
+    todo_count = models.PositiveIntegerField(default=0, editable=False)
+    in_progress_count = models.PositiveIntegerField(default=0, editable=False)
+    done_count = models.PositiveIntegerField(default=0, editable=False)
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = ProjectQuerySet.as_manager()
+
     class Meta:
         ordering = ["name"]
 
@@ -35,11 +83,11 @@ class Project(models.Model):
 
     @property
     def total_tasks(self) -> int:
-        return self.tasks.count()
+        return self.todo_count + self.in_progress_count + self.done_count
 
     @property
     def completed_tasks(self) -> int:
-        return self.tasks.filter(status=Task.Status.DONE).count()
+        return self.done_count
 
     @property
     def completion_percentage(self) -> int:
@@ -50,6 +98,7 @@ class Project(models.Model):
 
     @property
     def overdue_tasks(self) -> int:
+        # Overdue depends on today's date, so it cannot be maintained on write.
         today = timezone.localdate()
         return (
             self.tasks.filter(due_date__lt=today, status__in=[Task.Status.TO_DO, Task.Status.IN_PROGRESS])
@@ -58,6 +107,100 @@ class Project(models.Model):
         )
 
 
+class TaskQuerySet(models.QuerySet):
+    """Bulk operations that keep the project task counters in step."""
+
+    # Cleared on the queryset ``bulk_update`` runs its batched UPDATEs through,
+    # so they skip the recount it performs once for the whole call.
+    _track_counts = True
+
+    def _clone(self) -> TaskQuerySet:
+        clone = super()._clone()
+        clone._track_counts = self._track_counts
+        return clone
+
+    def bulk_create(self, objs: Iterable[Task], *args, **kwargs) -> list[Task]:
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            created = super().bulk_create(objs, *args, **kwargs)
+            if kwargs.get("ignore_conflicts") or kwargs.get("update_conflicts"):
+                # Skipped or merged rows are not reported back, so recount instead of adding.
+                Project.objects.filter(pk__in={task.project_id for task in objs}).refresh_task_counts()
+            else:
+                Project.objects.adjust_task_counts(Counter((task.project_id, task.status) for task in created))
+        for task in created:
+            task._loaded = (task.project_id, task.status)
+        return created
+
+    def bulk_create_ordered(self, objs: Iterable[Task], *, batch_size: int | None = None) -> list[Task]:
+        """Create tasks appended to the end of their project and status columns.
+
+        The highest existing ``order`` of every affected column is read with
+        one grouped query, and the new tasks are numbered in memory, instead
+        of one ``MAX(order)`` lookup and one INSERT per task.
+        """
+
+        objs = list(objs)
+        with transaction.atomic(using=self.db):
+            highest = {
+                (row["project_id"], row["status"]): row["highest"]
+                for row in self.filter(project_id__in={task.project_id for task in objs})
+                .order_by()
+                .values("project_id", "status")
+                .annotate(highest=models.Max("order"))
+            }
+            for task in objs:
+                key = (task.project_id, task.status)
+                task.order = highest[key] = (highest.get(key) or 0) + 1
+            return self.bulk_create(objs, batch_size=batch_size)
+
+    def bulk_update(self, objs: Iterable[Task], fields: Iterable[str], *args, **kwargs) -> int:
+        objs = list(objs)
+        fields = list(fields)
+        if not {"status", "project", "project_id"} & set(fields):
+            return super().bulk_update(objs, fields, *args, **kwargs)
+        with transaction.atomic(using=self.db):
+            affected = {task.project_id for task in objs}
+            if {"project", "project_id"} & set(fields):
+                before = self.filter(pk__in=[task.pk for task in objs]).order_by()
+                affected.update(before.values_list("project_id", flat=True))
+            untracked = self._chain()
+            untracked._track_counts = False
+            updated = super(TaskQuerySet, untracked).bulk_update(objs, fields, *args, **kwargs)
+            Project.objects.filter(pk__in=affected).refresh_task_counts()
+        for task in objs:
+            task._loaded = (task.project_id, task.status)
+        return updated
+
+    def update(self, **kwargs) -> int:
+        if not self._track_counts or not {"status", "project", "project_id"} & kwargs.keys():
+            return super().update(**kwargs)
+        with transaction.atomic(using=self.db):
+            affected = set(self.order_by().values_list("project_id", flat=True).distinct())
+            target = kwargs.get("project", kwargs.get("project_id"))
+            updated = super().update(**kwargs)
+            if isinstance(target, (Project, int)):
+                affected.add(target.pk if isinstance(target, Project) else target)
+            elif target is not None:
+                # The new project comes from an expression; recount every project.
+                Project.objects.refresh_task_counts()
+                return updated
+            Project.objects.filter(pk__in=affected).refresh_task_counts()
+        return updated
+
+    def delete(self) -> tuple[int, dict[str, int]]:
+        with transaction.atomic(using=self.db):
+            deltas = Counter(
+                {
+                    (row["project_id"], row["status"]): -row["total"]
+                    for row in self.order_by().values("project_id", "status").annotate(total=models.Count("pk"))
+                }
+            )
+            deleted = super().delete()
+            Project.objects.adjust_task_counts(deltas)
+        return deleted
+
+
 class Task(models.Model):
     """A unit of work within a project."""
 
@@ -83,17 +226,40 @@ class Task(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TaskQuerySet.as_manager()
+
+    # (project_id, status) as last read from or written to the database.
+    _loaded: tuple[int, str] | None = None
+
     class Meta:
         ordering = ["order", "created_at"]
+        indexes = [models.Index(fields=["project", "status", "order"], name="task_project_status_order")]
 
     def __str__(self) -> str:  # pragma: no cover - human readable
         return f"{self.title} ({self.project.name})"
 
+    @classmethod
+    def from_db(cls, db, field_names, values) -> Task:
+        instance = super().from_db(db, field_names, values)
+        if not {"project_id", "status"} & instance.get_deferred_fields():
+            instance._loaded = (instance.project_id, instance.status)
+        return instance
+
+    def refresh_from_db(self, *args, **kwargs) -> None:
+        super().refresh_from_db(*args, **kwargs)
+        if not {"project_id", "status"} & self.get_deferred_fields():
+            self._loaded = (self.project_id, self.status)
+
     def save(self, *args, **kwargs) -> None:
-        previous_status = None
-        if self.pk:
-            previous_status = Task.objects.filter(pk=self.pk).values_list("status", flat=True).first()
-        if self._state.adding or previous_status != self.status or self.order == 0:
+        # The loaded (project, status) replaces a SELECT of the stored row; it is
+        # only queried for instances built with a primary key but not read from
+        # the database.
+        previous = self._loaded
+        if previous is None and self.pk is not None:
+            previous = Task.objects.filter(pk=self.pk).values_list("project_id", "status").first()
+        current = (self.project_id, self.status)
+        if previous != current or self.order == 0:
+            # Served by the (project, status, order) index.
             existing = (
                 Task.objects.filter(project=self.project, status=self.status)
                 .exclude(pk=self.pk)
@@ -101,7 +267,22 @@ class Task(models.Model):
             )
             next_order = (existing["order__max"] or 0) + 1
             self.order = next_order
-        super().save(*args, **kwargs)
+        with transaction.atomic():
+            super().save(*args, **kwargs)
+            if previous != current:
+                deltas = Counter({current: 1})
+                if previous is not None:
+                    deltas[previous] -= 1
+                Project.objects.adjust_task_counts(deltas)
+        self._loaded = current
+
+    def delete(self, *args, **kwargs) -> tuple[int, dict[str, int]]:
+        stored = self._loaded or (self.project_id, self.status)
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            Project.objects.adjust_task_counts(Counter({stored: -1}))
+        self._loaded = None
+        return deleted
 
     @property
     def is_overdue(self) -> bool:
@@ -1,3 +1,391 @@
+import csv
+import json
+from datetime import date, timedelta
+from io import StringIO
+from unittest.mock import patch
+
+from django.core.management import call_command
+from django.db import connection
+from django.http import StreamingHttpResponse
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import views
+from .models import Project, Task
+
+
+class CounterAssertions:
+    def assertCountsMatch(self, *projects: Project) -> None:
+        for project in projects:
+            project.refresh_from_db()
+            live = {status: project.tasks.filter(status=status).count() for status in Task.Status.values}
+            stored = {status: getattr(project, f"{status}_count") for status in Task.Status.values}
+            self.assertEqual(stored, live, project.name)
+
+
+class TaskCounterTests(CounterAssertions, TestCase):
+    def setUp(self) -> None:
+        self.project = Project.objects.create(name="Alpha")
+        self.other = Project.objects.create(name="Beta")
+
+    def test_save_and_delete_adjust_counters(self) -> None:
+        task = Task.objects.create(project=self.project, title="One")
+        Task.objects.create(project=self.project, title="Two", status=Task.Status.DONE)
+        self.assertCountsMatch(self.project)
+
+        task.status = Task.Status.IN_PROGRESS
+        task.save()
+        task.project = self.other
+        task.save()
+        self.assertCountsMatch(self.project, self.other)
+
+        task.delete()
+        self.assertCountsMatch(self.project, self.other)
+
+    def test_repeated_save_does_not_double_count(self) -> None:
+        task = Task.objects.create(project=self.project, title="One")
+        task.status = Task.Status.DONE
+        task.save()
+        task.save()
+        self.assertCountsMatch(self.project)
+
+    def test_bulk_create_update_and_delete(self) -> None:
+        tasks = Task.objects.bulk_create(
+            [Task(project=self.project, title=f"T{i}", status=Task.Status.TO_DO, order=i + 1) for i in range(5)]
+        )
+        self.assertCountsMatch(self.project)
+
+        Task.objects.filter(pk__in=[task.pk for task in tasks[:2]]).update(status=Task.Status.DONE)
+        self.assertCountsMatch(self.project)
+
+        Task.objects.filter(pk=tasks[2].pk).update(project=self.other)
+        self.assertCountsMatch(self.project, self.other)
+
+        Task.objects.filter(project=self.project, status=Task.Status.DONE).delete()
+        self.assertCountsMatch(self.project, self.other)
+
+    def test_save_after_bulk_update_does_not_reapply_status_change(self) -> None:
+        task = Task.objects.create(project=self.project, title="One", status=Task.Status.TO_DO)
+        task.status = Task.Status.DONE
+        Task.objects.bulk_update([task], ["status"])
+        task.save()
+        self.assertCountsMatch(self.project)
+
+    def test_bulk_update_moving_projects_recounts_both(self) -> None:
+        task = Task.objects.create(project=self.project, title="One")
+        task.project = self.other
+        Task.objects.bulk_update([task], ["project"])
+        self.assertCountsMatch(self.project, self.other)
+
+    def test_bulk_update_recounts_once(self) -> None:
+        tasks = [Task.objects.create(project=self.project, title=f"T{i}") for i in range(5)]
+        for task in tasks:
+            task.status = Task.Status.DONE
+        with CaptureQueriesContext(connection) as queries:
+            Task.objects.bulk_update(tasks, ["status"], batch_size=2)
+        recounts = [query for query in queries if 'UPDATE "projects_project"' in query["sql"]]
+        self.assertEqual(len(recounts), 1)
+        self.assertFalse(any("DISTINCT" in query["sql"] for query in queries))
+        self.assertCountsMatch(self.project)
+
+    def test_bulk_update_without_status_skips_recount(self) -> None:
+        task = Task.objects.create(project=self.project, title="One")
+        task.title = "Renamed"
+        with self.assertNumQueries(1):
+            Task.objects.bulk_update([task], ["title"])
+
+    def test_rebuild_task_counts_repairs_drift(self) -> None:
+        Task.objects.create(project=self.project, title="One")
+        Project.objects.filter(pk=self.project.pk).update(todo_count=7, done_count=3)
+        call_command("rebuild_task_counts", self.project.slug, stdout=StringIO())
+        self.assertCountsMatch(self.project)
+
+    def test_project_properties_read_stored_counters(self) -> None:
+        Task.objects.create(project=self.project, title="One", status=Task.Status.DONE)
+        Task.objects.create(project=self.project, title="Two")
+        self.project.refresh_from_db()
+        with self.assertNumQueries(0):
+            self.assertEqual(self.project.total_tasks, 2)
+            self.assertEqual(self.project.completion_percentage, 50)
+
+
+class DashboardTests(TestCase):
+    def setUp(self) -> None:
+        self.project = Project.objects.create(name="Alpha")
+        today = timezone.localdate()
+        self.yesterday = today - timedelta(days=1)
+        self.tomorrow = today + timedelta(days=1)
+
+    def _metrics(self) -> dict[str, dict]:
+        response = self.client.get(reverse("projects:dashboard"))
+        self.assertEqual(response.status_code, 200)
+        return {item["project"].name: item for item in response.context["project_metrics"]}
+
+    def test_overdue_counts_only_open_tasks_past_due(self) -> None:
+        Task.objects.create(project=self.project, title="Late", due_date=self.yesterday)
+        Task.objects.create(
+            project=self.project, title="Started late", status=Task.Status.IN_PROGRESS, due_date=self.yesterday
+        )
+        Task.objects.create(project=self.project, title="Done late", status=Task.Status.DONE, due_date=self.yesterday)
+        Task.objects.create(project=self.project, title="Upcoming", due_date=self.tomorrow)
+        Task.objects.create(project=self.project, title="Undated")
+
+        metrics = self._metrics()["Alpha"]
+
+        self.assertEqual(metrics["overdue_tasks"], 2)
+        self.assertEqual(metrics["total_tasks"], 5)
+        self.assertEqual(metrics["completed_tasks"], 1)
+        self.assertEqual(metrics["completion_percentage"], 20)
+        self.assertEqual(metrics["overdue_tasks"], self.project.overdue_tasks)
+
+    def test_archived_projects_are_counted_but_not_listed(self) -> None:
+        Project.objects.create(name="Old", archived=True)
+
+        response = self.client.get(reverse("projects:dashboard"))
+
+        self.assertEqual([item["project"].name for item in response.context["project_metrics"]], ["Alpha"])
+        self.assertEqual(response.context["archived_count"], 1)
+
+    def test_query_count_does_not_grow_with_projects(self) -> None:
+        def queries() -> int:
+            with CaptureQueriesContext(connection) as captured:
+                self.client.get(reverse("projects:dashboard"))
+            return len(captured)
+
+        Task.objects.create(project=self.project, title="Late", due_date=self.yesterday)
+        baseline = queries()
+        for index in range(5):
+            project = Project.objects.create(name=f"Extra {index}")
+            Task.objects.create(project=project, title="Late", due_date=self.yesterday)
+
+        self.assertEqual(queries(), baseline)
+        self.assertEqual(len(self._metrics()), 6)
+
+
+class TaskOrderingTests(TestCase):
+    def setUp(self) -> None:
+        self.project = Project.objects.create(name="Alpha")
+
+    def _selects(self, queries: CaptureQueriesContext) -> list[str]:
+        return [query["sql"] for query in queries if query["sql"].startswith("SELECT")]
+
+    def test_new_tasks_append_to_their_column(self) -> None:
+        first = Task.objects.create(project=self.project, title="One")
+        second = Task.objects.create(project=self.project, title="Two")
+        done = Task.objects.create(project=self.project, title="Three", status=Task.Status.DONE)
+
+        self.assertEqual([first.order, second.order, done.order], [1, 2, 1])
+
+    def test_status_change_moves_task_to_end_of_new_column(self) -> None:
+        Task.objects.create(project=self.project, title="Done", status=Task.Status.DONE)
+        task = Task.objects.create(project=self.project, title="One")
+
+        task.status = Task.Status.DONE
+        task.save()
+
+        self.assertEqual(task.order, 2)
+
+    def test_saving_a_loaded_task_does_not_reread_it(self) -> None:
+        Task.objects.create(project=self.project, title="One")
+        task = Task.objects.get(title="One")
+        task.title = "Renamed"
+
+        with CaptureQueriesContext(connection) as queries:
+            task.save()
+
+        self.assertEqual(self._selects(queries), [])
+        self.assertEqual(task.order, 1)
+
+    def test_saving_an_unloaded_instance_reads_the_stored_row(self) -> None:
+        stored = Task.objects.create(project=self.project, title="One")
+        detached = Task(
+            pk=stored.pk, project=self.project, title="One", order=stored.order, created_at=stored.created_at
+        )
+        detached.status = Task.Status.DONE
+
+        with CaptureQueriesContext(connection) as queries:
+            detached.save()
+
+        self.assertEqual(len(self._selects(queries)), 2)
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.todo_count, self.project.done_count), (0, 1))
+
+    def test_bulk_create_ordered_numbers_each_column(self) -> None:
+        other = Project.objects.create(name="Beta")
+        Task.objects.create(project=self.project, title="Existing")
+
+        created = Task.objects.bulk_create_ordered(
+            [
+                Task(project=self.project, title="A"),
+                Task(project=self.project, title="B", status=Task.Status.DONE),
+                Task(project=self.project, title="C"),
+                Task(project=other, title="D"),
+            ]
+        )
+
+        self.assertEqual([task.order for task in created], [2, 1, 3, 1])
+        self.project.refresh_from_db()
+        self.assertEqual((self.project.todo_count, self.project.done_count), (3, 1))
+
+    def test_bulk_create_ordered_reads_highest_order_once(self) -> None:
+        tasks = [Task(project=self.project, title=f"T{index}") for index in range(20)]
+
+        with CaptureQueriesContext(connection) as queries:
+            Task.objects.bulk_create_ordered(tasks)
+
+        self.assertEqual(len(self._selects(queries)), 1)
+        self.assertEqual(sorted(task.order for task in tasks), list(range(1, 21)))
+
+    def test_ordering_lookup_uses_the_composite_index(self) -> None:
+        index_names = [index.name for index in Task._meta.indexes]
+        self.assertIn("task_project_status_order", index_names)
+        with connection.cursor() as cursor:
+            constraints = connection.introspection.get_constraints(cursor, Task._meta.db_table)
+        self.assertEqual(constraints["task_project_status_order"]["columns"], ["project_id", "status", "order"])
+
+
+class BulkMoveTests(CounterAssertions, TestCase):
+    def setUp(self) -> None:
+        self.project = Project.objects.create(name="Alpha")
+        self.url = reverse("projects:bulk-move-tasks", args=[self.project.slug])
+        self.todo = [Task.objects.create(project=self.project, title=f"Todo {index}") for index in range(4)]
+        self.done = [
+            Task.objects.create(project=self.project, title=f"Done {index}", status=Task.Status.DONE)
+            for index in range(2)
+        ]
+
+    def _post(self, payload, url: str | None = None):
+        body = payload if isinstance(payload, str) else json.dumps(payload)
+        return self.client.post(url or self.url, body, content_type="application/json")
+
+    def _column(self, status: str) -> list[str]:
+        return list(self.project.tasks.filter(status=status).order_by("order").values_list("title", flat=True))
+
+    def test_moves_tasks_to_position_and_renumbers_both_columns(self) -> None:
+        moved = [self.todo[3].pk, self.todo[1].pk]
+
+        response = self._post({"tasks": moved, "status": "done", "position": 1})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self._column("done"), ["Done 0", "Todo 3", "Todo 1", "Done 1"])
+        self.assertEqual(self._column("todo"), ["Todo 0", "Todo 2"])
+        body = response.json()
+        self.assertEqual(body["moved"], 2)
+        self.assertEqual([entry["order"] for entry in body["columns"]["done"]], [1, 2, 3, 4])
+        self.assertEqual([entry["order"] for entry in body["columns"]["todo"]], [1, 2])
+        self.assertCountsMatch(self.project)
+
+    def test_omitting_position_appends(self) -> None:
+        self._post({"tasks": [self.todo[0].pk], "status": "done"})
+
+        self.assertEqual(self._column("done"), ["Done 0", "Done 1", "Todo 0"])
+
+    def test_reorders_within_a_column(self) -> None:
+        response = self._post({"tasks": [self.todo[2].pk], "status": "todo", "position": 0})
+
+        self.assertEqual(self._column("todo"), ["Todo 2", "Todo 0", "Todo 1", "Todo 3"])
+        self.assertEqual(response.json()["updated"], 3)
+
+    def test_saves_with_one_bulk_update(self) -> None:
+        moved = [task.pk for task in self.todo]
+        with CaptureQueriesContext(connection) as queries:
+            self._post({"tasks": moved, "status": "in_progress"})
+        updates = [query for query in queries if query["sql"].startswith('UPDATE "projects_task"')]
+        self.assertEqual(len(updates), 1)
+        self.assertCountsMatch(self.project)
+
+    def test_rejects_invalid_payloads(self) -> None:
+        for payload in (
+            "not json",
+            "[1, 2]",
+            {"tasks": [], "status": "done"},
+            {"tasks": ["1"], "status": "done"},
+            {"tasks": [self.todo[0].pk], "status": "blocked"},
+            {"tasks": [self.todo[0].pk], "status": "done", "position": -1},
+        ):
+            with self.subTest(payload=payload):
+                response = self._post(payload)
+                self.assertEqual(response.status_code, 400)
+                self.assertIn("error", response.json())
+
+    def test_unknown_or_foreign_tasks_return_404_and_change_nothing(self) -> None:
+        other = Project.objects.create(name="Beta")
+        foreign = Task.objects.create(project=other, title="Elsewhere")
+
+        response = self._post({"tasks": [self.todo[0].pk, foreign.pk, 9999], "status": "done"})
+
+        self.assertEqual(response.status_code, 404)
+        self.assertEqual(response.json()["missing"], [foreign.pk, 9999])
+        self.assertEqual(self._column("done"), ["Done 0", "Done 1"])
+
+    def test_archived_project_and_get_are_rejected(self) -> None:
+        self.assertEqual(self.client.get(self.url).status_code, 405)
+        Project.objects.filter(pk=self.project.pk).update(archived=True)
+        self.assertEqual(self._post({"tasks": [self.todo[0].pk], "status": "done"}).status_code, 404)
+
+
+class ExportTests(TestCase):
+    def setUp(self) -> None:
+        self.project = Project.objects.create(name="Alpha")
+        Task.objects.create(
+            project=self.project,
+            title="Write, then \"quote\"",
+            description="Line one\nLine two",
+            status=Task.Status.IN_PROGRESS,
+            priority=Task.Priority.HIGH,
+            assignee="sam",
+            due_date=date(2024, 5, 1),
+        )
+        Task.objects.create(project=self.project, title="Plain")
+
+    def _export(self, fmt: str) -> tuple[StreamingHttpResponse, str]:
+        response = self.client.get(reverse("projects:export-project", args=[self.project.slug, fmt]))
+        self.assertIsInstance(response, StreamingHttpResponse)
+        return response, b"".join(response.streaming_content).decode()
+
+    def test_csv_export_is_a_streamed_attachment(self) -> None:
+        response, body = self._export("csv")
+
+        self.assertEqual(response["Content-Type"], "text/csv")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="alpha-tasks.csv"')
+        rows = list(csv.DictReader(body.splitlines(keepends=True)))
+        self.assertEqual(len(rows), 2)
+        self.assertEqual(rows[0]["task_title"], 'Write, then "quote"')
+        self.assertEqual(rows[0]["task_description"], "Line one\nLine two")
+        self.assertEqual((rows[0]["status"], rows[0]["priority"]), ("In Progress", "High"))
+        self.assertEqual((rows[0]["due_date"], rows[1]["due_date"]), ("2024-05-01", ""))
+
+    def test_json_export_is_one_array(self) -> None:
+        response, body = self._export("json")
+
+        self.assertEqual(response["Content-Type"], "application/json")
+        self.assertFalse(response.has_header("Content-Disposition"))
+        rows = json.loads(body)
+        self.assertEqual([row["task_title"] for row in rows], ['Write, then "quote"', "Plain"])
+        self.assertEqual(rows[1]["assignee"], "")
+
+    def test_ndjson_export_has_one_object_per_line(self) -> None:
+        response, body = self._export("ndjson")
+
+        self.assertEqual(response["Content-Type"], "application/x-ndjson")
+        self.assertEqual(response["Content-Disposition"], 'attachment; filename="alpha-tasks.ndjson"')
+        rows = [json.loads(line) for line in body.splitlines()]
+        self.assertEqual([row["project"] for row in rows], ["Alpha", "Alpha"])
+
+    def test_empty_project_exports_header_and_empty_array(self) -> None:
+        self.project.tasks.all().delete()
+
+        self.assertEqual(self._export("csv")[1].splitlines(), [",".join(views.EXPORT_FIELDS)])
+        self.assertEqual(json.loads(self._export("json")[1]), [])
+        self.assertEqual(self._export("ndjson")[1], "")
+
+    def test_rows_are_batched_into_chunks(self) -> None:
+        Task.objects.bulk_create([Task(project=self.project, title=f"T{index}", order=index + 1) for index in range(5)])
+
+        with patch.object(views, "EXPORT_CHUNK_SIZE", 2):
+            response = self.client.get(reverse("projects:export-project", args=[self.project.slug, "ndjson"]))
+            chunks = list(response.streaming_content)
 
-# Create your tests here.
+        self.assertEqual([chunk.count(b"\n") for chunk in chunks], [2, 2, 2, 1])
@@ -13,6 +13,7 @@ urlpatterns = [
     path("projects/<slug:slug>/archive/", views.archive_project, name="archive-project"),
     path("projects/<slug:slug>/restore/", views.restore_project, name="restore-project"),
     path("projects/<slug:slug>/tasks/add/", views.add_task, name="add-task"),
+    path("projects/<slug:slug>/tasks/bulk-move/", views.bulk_move_tasks, name="bulk-move-tasks"),
     path("projects/<slug:slug>/export/<str:fmt>/", views.export_project, name="export-project"),
     path("tasks/<int:pk>/status/", views.update_task_status, name="update-task-status"),
     path("tasks/<int:pk>/edit/", views.update_task, name="update-task"),
@@ -1,13 +1,17 @@
 """Views powering the task management system UI."""
 from __future__ import annotations
 
+import csv
+import json
 from collections import defaultdict
-from typing import Any
+from typing import Any, Callable, Iterable, Iterator
 
 from django.contrib import messages
+from django.db import transaction
 from django.db.models import Count, Q
-from django.http import HttpRequest, HttpResponse
+from django.http import HttpRequest, HttpResponse, JsonResponse, StreamingHttpResponse
 from django.shortcuts import get_object_or_404, redirect, render
+from django.utils import timezone
 from django.views.decorators.http import require_http_methods
 
 from .forms import ProjectForm, TaskForm, TaskStatusForm
@@ -15,26 +19,29 @@ from .models import Project, Task
 
 
 def dashboard(request: HttpRequest) -> HttpResponse:
+    # Totals come from the counters stored on each project; only the date-dependent
+    # overdue count is aggregated, in the same query.
+    open_statuses = [Task.Status.TO_DO, Task.Status.IN_PROGRESS]
     projects = (
         Project.objects.filter(archived=False)
-        .prefetch_related("tasks")
         .annotate(
-            total_tasks=Count("tasks"),
-            completed_tasks=Count("tasks", filter=Q(tasks__status=Task.Status.DONE)),
+            overdue_count=Count(
+                "tasks",
+                filter=Q(tasks__due_date__lt=timezone.localdate(), tasks__status__in=open_statuses),
+            ),
         )
         .order_by("name")
     )
-    project_metrics: list[dict[str, Any]] = []
-    for project in projects:
-        project_metrics.append(
-            {
-                "project": project,
-                "total_tasks": project.total_tasks,
-                "completed_tasks": project.completed_tasks,
-                "completion_percentage": project.completion_percentage,
-                "overdue_tasks": project.overdue_tasks,
-            }
-        )
+    project_metrics: list[dict[str, Any]] = [
+        {
+            "project": project,
+            "total_tasks": project.total_tasks,
+            "completed_tasks": project.completed_tasks,
+            "completion_percentage": project.completion_percentage,
+            "overdue_tasks": project.overdue_count,
+        }
+        for project in projects
+    ]
 
     context = {
         "project_metrics": project_metrics,
@@ -57,7 +64,7 @@ def create_project(request: HttpRequest) -> HttpResponse:
 
 
 def archived_projects(request: HttpRequest) -> HttpResponse:
-    projects = Project.objects.filter(archived=True).prefetch_related("tasks").order_by("name")
+    projects = Project.objects.filter(archived=True).order_by("name")
     return render(request, "projects/archived_projects.html", {"projects": projects})
 
 
@@ -112,6 +119,73 @@ def update_task_status(request: HttpRequest, pk: int) -> HttpResponse:
     return redirect("project-detail", slug=task.project.slug)
 
 
+@require_http_methods(["POST"])
+def bulk_move_tasks(request: HttpRequest, slug: str) -> JsonResponse:
+    """Move many tasks of a project into one status column at a given position.
+
+    Expects a JSON body ``{"tasks": [ids], "status": "done", "position": 0}``.
+    ``position`` is the 0-based index in the target column where the tasks are
+    inserted, in the order given; omit it to append. Every affected column is
+    renumbered in one pass and saved with a single ``bulk_update``.
+    """
+
+    project = get_object_or_404(Project, slug=slug, archived=False)
+    try:
+        payload = json.loads(request.body or b"{}")
+    except ValueError:
+        return JsonResponse({"error": "Request body must be JSON."}, status=400)
+    if not isinstance(payload, dict):
+        return JsonResponse({"error": "Request body must be a JSON object."}, status=400)
+
+    task_ids = payload.get("tasks")
+    status = payload.get("status")
+    position = payload.get("position")
+    if not isinstance(task_ids, list) or not task_ids or not all(type(task_id) is int for task_id in task_ids):
+        return JsonResponse({"error": "'tasks' must be a non-empty list of task ids."}, status=400)
+    if status not in Task.Status.values:
+        return JsonResponse({"error": f"'status' must be one of {', '.join(Task.Status.values)}."}, status=400)
+    if position is not None and (type(position) is not int or position < 0):
+        return JsonResponse({"error": "'position' must be a non-negative integer."}, status=400)
+    task_ids = list(dict.fromkeys(task_ids))
+
+    with transaction.atomic():
+        moving = {task.pk: task for task in project.tasks.select_for_update().filter(pk__in=task_ids)}
+        missing = [task_id for task_id in task_ids if task_id not in moving]
+        if missing:
+            return JsonResponse({"error": "Unknown tasks for this project.", "missing": missing}, status=404)
+
+        statuses = {status} | {task.status for task in moving.values()}
+        columns: dict[str, list[Task]] = defaultdict(list)
+        for task in project.tasks.select_for_update().filter(status__in=statuses).order_by("order", "created_at"):
+            if task.pk not in moving:
+                columns[task.status].append(task)
+        target = columns[status]
+        index = len(target) if position is None else min(position, len(target))
+        target[index:index] = [moving[task_id] for task_id in task_ids]
+
+        now = timezone.now()
+        changed: list[Task] = []
+        for column_status in statuses:
+            for order, task in enumerate(columns[column_status], start=1):
+                if task.order != order or task.status != column_status:
+                    task.order = order
+                    task.status = column_status
+                    task.updated_at = now
+                    changed.append(task)
+        Task.objects.bulk_update(changed, ["status", "order", "updated_at"], batch_size=500)
+
+    return JsonResponse(
+        {
+            "moved": len(task_ids),
+            "updated": len(changed),
+            "columns": {
+                column_status: [{"id": task.pk, "order": task.order} for task in columns[column_status]]
+                for column_status in sorted(statuses)
+            },
+        }
+    )
+
+
 @require_http_methods(["GET", "POST"])
 def update_task(request: HttpRequest, pk: int) -> HttpResponse:
     task = get_object_or_404(Task.objects.select_related("project"), pk=pk)
@@ -144,44 +218,86 @@ def restore_project(request: HttpRequest, slug: str) -> HttpResponse:
     return redirect("archived-projects")
 
 
-def export_project(request: HttpRequest, slug: str, fmt: str) -> HttpResponse:
-    project = get_object_or_404(Project.objects.prefetch_related("tasks"), slug=slug)
-    if fmt not in {"csv", "json"}:
-        messages.error(request, "Unsupported export format.")
-        return redirect("project-detail", slug=project.slug)
+EXPORT_FIELDS = ["project", "task_title", "task_description", "status", "priority", "assignee", "due_date"]
+EXPORT_CHUNK_SIZE = 2000
+"""Task rows fetched per database round trip and emitted per response chunk."""
 
-    rows = [
-        {
+
+def _export_rows(project: Project) -> Iterator[dict[str, str]]:
+    statuses = dict(Task.Status.choices)
+    priorities = dict(Task.Priority.choices)
+    tasks = project.tasks.values("title", "description", "status", "priority", "assignee", "due_date")
+    for task in tasks.iterator(chunk_size=EXPORT_CHUNK_SIZE):
+        yield {
             "project": project.name,
-            "task_title": task.title,
-            "task_description": task.description,
-            "status": task.get_status_display(),
-            "priority": task.get_priority_display(),
-            "assignee": task.assignee or "",
-            "due_date": task.due_date.isoformat() if task.due_date else "",
+            "task_title": task["title"],
+            "task_description": task["description"],
+            "status": statuses.get(task["status"], task["status"]),
+            "priority": priorities.get(task["priority"], task["priority"]),
+            "assignee": task["assignee"] or "",
+            "due_date": task["due_date"].isoformat() if task["due_date"] else "",
         }
-        for task in project.tasks.all()
-    ]
 
-    if fmt == "json":
-        from django.http import JsonResponse
 
-        return JsonResponse(rows, safe=False)
+def _chunked(lines: Iterable[str]) -> Iterator[str]:
+    # Join rows into larger chunks; one chunk per row makes the response write-bound.
+    batch: list[str] = []
+    for line in lines:
+        batch.append(line)
+        if len(batch) >= EXPORT_CHUNK_SIZE:
+            yield "".join(batch)
+            batch.clear()
+    if batch:
+        yield "".join(batch)
 
-    import csv
-    from io import StringIO
 
-    buffer = StringIO()
-    writer = csv.DictWriter(
-        buffer,
-        fieldnames=["project", "task_title", "task_description", "status", "priority", "assignee", "due_date"],
-    )
-    writer.writeheader()
+class _Echo:
+    """File-like object whose ``write`` returns the value, so csv.writer can produce strings."""
+
+    def write(self, value: str) -> str:
+        return value
+
+
+def _csv_lines(rows: Iterable[dict[str, str]]) -> Iterator[str]:
+    writer = csv.DictWriter(_Echo(), fieldnames=EXPORT_FIELDS)
+    yield writer.writeheader()
+    for row in rows:
+        yield writer.writerow(row)
+
+
+def _json_array_lines(rows: Iterable[dict[str, str]]) -> Iterator[str]:
+    yield "["
+    separator = ""
+    for row in rows:
+        yield separator + json.dumps(row)
+        separator = ", "
+    yield "]"
+
+
+def _ndjson_lines(rows: Iterable[dict[str, str]]) -> Iterator[str]:
     for row in rows:
-        writer.writerow(row)
+        yield json.dumps(row) + "\n"
+
+
+EXPORT_FORMATS: dict[str, tuple[Callable[[Iterable[dict[str, str]]], Iterator[str]], str, bool]] = {
+    # format: (encoder, content type, download as attachment)
+    "csv": (_csv_lines, "text/csv", True),
+    "json": (_json_array_lines, "application/json", False),
+    "ndjson": (_ndjson_lines, "application/x-ndjson", True),
+}
+
+
+def export_project(request: HttpRequest, slug: str, fmt: str) -> HttpResponse:
+    project = get_object_or_404(Project, slug=slug)
+    if fmt not in EXPORT_FORMATS:
+        messages.error(request, "Unsupported export format.")
+        return redirect("project-detail", slug=project.slug)
 
-    response = HttpResponse(buffer.getvalue(), content_type="text/csv")
-    response["Content-Disposition"] = f'attachment; filename="{project.slug}-tasks.csv"'
+    # Rows are read in chunks and encoded as the response is sent, so memory stays flat for large projects.
+    encode, content_type, attachment = EXPORT_FORMATS[fmt]
+    response = StreamingHttpResponse(_chunked(encode(_export_rows(project))), content_type=content_type)
+    if attachment:
+        response["Content-Disposition"] = f'attachment; filename="{project.slug}-tasks.{fmt}"'
     return response
 
 